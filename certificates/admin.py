@@ -1,3 +1,21 @@
 from django.contrib import admin
-from .models import Certificate
-admin.site.register(Certificate)
\ No newline at end of file
+from .models import Certificate, CertificateTemplate
+from .rendering import regenerate
+
+
+@admin.register(Certificate)
+class CertificateAdmin(admin.ModelAdmin):
+    list_display = ('certificate_number', 'status', 'issue_date', 'rendered_at')
+    list_filter = ('status',)
+    readonly_fields = ('file_url', 'pdf', 'image', 'rendered_at', 'error')
+    actions = ['rerender']
+
+    @admin.action(description='Re-render selected certificates')
+    def rerender(self, request, queryset):
+        count = regenerate(queryset)
+        self.message_user(request, f'{count} certificates queued for rendering.')
+
+
+@admin.register(CertificateTemplate)
+class CertificateTemplateAdmin(admin.ModelAdmin):
+    list_display = ('name', 'course', 'updated_at')
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from certificates.models import Certificate
+from certificates.rendering import backfill_missing, reclaim_stale, regenerate
+
+
+class Command(BaseCommand):
+    help = (
+        'Pending / failed certificates render karta hai, mare hue workers ke `rendering` '
+        'claims wapas leta hai (--all: sab dobara, --missing: completed progress ke gayab certificates)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Ready certificates bhi dobara render karo')
+        parser.add_argument('--template', type=int, help='Sirf is CertificateTemplate ke certificates')
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument(
+            '--stale-minutes', type=int, default=15,
+            help='Itne minute se `rendering` claim mara hua samjha jaye (default 15)',
+        )
+        parser.add_argument(
+            '--missing', action='store_true', help='Completed progress jin ka certificate nahi, unke bana kar render'
+        )
+
+    def handle(self, *args, **options):
+        reclaimed = reclaim_stale(timezone.now() - timedelta(minutes=options['stale_minutes']))
+        if reclaimed:
+            self.stdout.write(f'Reclaimed {reclaimed} stale rendering certificates')
+        if options['missing']:
+            created = backfill_missing(batch_size=options['batch_size'])
+            self.stdout.write(f'Created {created} missing certificates')
+        queryset = Certificate.objects.all()
+        if not options['all']:
+            queryset = queryset.filter(status__in=['pending', 'failed'])
+        if options['template']:
+            queryset = queryset.filter(template_id=options['template'])
+        count = regenerate(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Queued {count} certificates'))
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0015_lesson_bit_index'),
+        ('certificates', '0003_certificate_cert_issue_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='image',
+            field=models.FileField(blank=True, max_length=255, upload_to='certificates/'),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='pdf',
+            field=models.FileField(blank=True, max_length=255, upload_to='certificates/'),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='rendered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('rendering', 'Rendering'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='CertificateTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('background', models.ImageField(blank=True, null=True, upload_to='certificate_templates/')),
+                ('heading', models.CharField(default='Certificate of Completion', max_length=200)),
+                ('body', models.TextField(default='This is to certify that {student} has successfully completed {course}.')),
+                ('text_color', models.CharField(default='#1F2937', help_text='Hex color, e.g. #1F2937', max_length=7)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='certificate_template', to='courses.course')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='certificates', to='certificates.certificatetemplate'),
+        ),
+    ]
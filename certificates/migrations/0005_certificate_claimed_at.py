@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0004_certificate_rendering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:23
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_student(apps, schema_editor):
+    Certificate = apps.get_model('certificates', 'Certificate')
+    TrackProgress = apps.get_model('enrollments', 'TrackProgress')
+    Certificate.objects.filter(student__isnull=True).update(student_id=Subquery(
+        TrackProgress.objects.filter(pk=OuterRef('progress_id')).values('enrollment__student_id')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0008_profile_picture_variants'),
+        ('certificates', '0005_certificate_claimed_at'),
+        ('enrollments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='certificate',
+            name='cert_issue_date_id_idx',
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='student',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='certificates', to='profiles.studentprofile'),
+        ),
+        migrations.RunPython(fill_student, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['student', '-issue_date', '-id'], name='cert_student_issue_idx'),
+        ),
+    ]
@@ -1,18 +1,69 @@
 import uuid
 from django.db import models
+from courses.models import Course
 from enrollments.models import TrackProgress
+from profiles.models import StudentProfile
+
+class CertificateTemplate(models.Model):
+    """
+    Certificate ka design. Course ka apna template na ho to default (course khali) wala.
+    Heading / body mein {student}, {course}, {date}, {number} placeholders chalte hain.
+    Template badle to us ke saare certificates background mein dobara render hote hain.
+    """
+    name = models.CharField(max_length=100)
+    course = models.OneToOneField(Course, null=True, blank=True, on_delete=models.CASCADE, related_name='certificate_template')
+    background = models.ImageField(upload_to='certificate_templates/', null=True, blank=True)
+    heading = models.CharField(max_length=200, default='Certificate of Completion')
+    body = models.TextField(default='This is to certify that {student} has successfully completed {course}.')
+    text_color = models.CharField(max_length=7, default='#1F2937', help_text="Hex color, e.g. #1F2937")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+def new_certificate_number():
+    return f"CERT-{uuid.uuid4().hex[:8].upper()}"
+
 
 class Certificate(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('rendering', 'Rendering'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
     # Schema: progress_id (1:1)
     progress = models.OneToOneField(TrackProgress, on_delete=models.CASCADE, related_name='certificate')
+    # progress.enrollment.student ki copy: "my certificates" list (student, -issue_date, -id) index se, bina joins
+    student = models.ForeignKey(
+        StudentProfile, null=True, blank=True, editable=False, on_delete=models.CASCADE, related_name='certificates'
+    )
     certificate_number = models.CharField(max_length=50, unique=True, blank=True)
     issue_date = models.DateTimeField(auto_now_add=True)
     file_url = models.URLField(max_length=500, blank=True) # PDF ya Image link
+    # Render job (certificates/rendering.py): pending -> rendering -> ready / failed
+    template = models.ForeignKey(CertificateTemplate, null=True, blank=True, on_delete=models.SET_NULL, related_name='certificates')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    pdf = models.FileField(upload_to='certificates/', max_length=255, blank=True)
+    image = models.FileField(upload_to='certificates/', max_length=255, blank=True)
+    rendered_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    # Worker ne kab `rendering` claim kiya; worker mar jaye to purana claim dobara pending hota hai
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Student ki list student par filter karke (issue_date, id) keyset par chalti hai
+        indexes = [models.Index(fields=['student', '-issue_date', '-id'], name='cert_student_issue_idx')]
 
     def save(self, *args, **kwargs):
         if not self.certificate_number:
             # Unique certificate number generate karna (e.g., CERT-12345)
-            self.certificate_number = f"CERT-{uuid.uuid4().hex[:8].upper()}"
+            self.certificate_number = new_certificate_number()
+        if self.student_id is None:
+            self.student_id = TrackProgress.objects.filter(pk=self.progress_id).values_list(
+                'enrollment__student_id', flat=True
+            ).first()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -0,0 +1,202 @@
+"""
+Certificate rendering pipeline.
+
+Course complete hone par Certificate row `pending` status mein banti hai aur
+render job background worker pool (core.tasks) mein chalta hai: Pillow se PNG
+aur PDF banti hain, configured storage par save hoti hain aur `file_url` bhar
+jata hai. Request thread sirf row insert karta hai, is liye poori cohort ek saath
+complete kare to bhi requests nahi rukti.
+
+Certificate table hi job queue hai: job `pending -> rendering` conditional
+update se claim hota hai, is liye ek certificate do workers render nahi karte.
+Template badle to `regenerate()` us ke certificates ko dobara pending karke
+batches mein queue karta hai. Worker beech mein mar jaye (in-process pool restart)
+to `rendering` row `reclaim_stale()` se dobara pending hoti hai; `backfill_missing()`
+un completed progress rows ke certificates banata hai jin ka certificate kabhi bana
+hi nahi.
+"""
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from core.tasks import run_in_background
+from enrollments.models import TrackProgress
+from notifications.outbox import notify
+
+from .models import Certificate, CertificateTemplate, new_certificate_number
+
+logger = logging.getLogger(__name__)
+
+CANVAS_SIZE = (1754, 1240)  # A4 landscape @ 150 dpi
+PDF_RESOLUTION = 150
+RENDER_BATCH_SIZE = 50
+
+
+def template_for(course_id):
+    """Course ka apna template, warna default (course khali), warna None (built-in design)."""
+    return (
+        CertificateTemplate.objects.filter(Q(course_id=course_id) | Q(course__isnull=True))
+        .order_by(F('course_id').desc(nulls_last=True), '-updated_at')
+        .first()
+    )
+
+
+def fill(text, context):
+    try:
+        return text.format_map(context)
+    except (KeyError, ValueError, IndexError):
+        return text  # ghalat placeholder ho to text waisa hi
+
+
+def wrap(draw, text, font, width):
+    lines, line = [], ''
+    for word in text.split():
+        candidate = f'{line} {word}'.strip()
+        if line and draw.textlength(candidate, font=font) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+def render_images(context, template=None):
+    """Certificate ka (png bytes, pdf bytes)."""
+    width, height = CANVAS_SIZE
+    color = template.text_color if template else '#1F2937'
+    if template and template.background:
+        with template.background.open('rb') as source:
+            canvas = ImageOps.fit(Image.open(source).convert('RGB'), CANVAS_SIZE)
+    else:
+        canvas = Image.new('RGB', CANVAS_SIZE, '#FFFFFF')
+        border = ImageDraw.Draw(canvas)
+        border.rectangle([40, 40, width - 41, height - 41], outline='#B8860B', width=12)
+    draw = ImageDraw.Draw(canvas)
+
+    def centered(text, y, size):
+        font = ImageFont.load_default(size=size)
+        for line in wrap(draw, text, font, width - 300):
+            draw.text((width / 2, y), line, fill=color, font=font, anchor='mt')
+            y += int(size * 1.35)
+        return y
+
+    heading = template.heading if template else 'Certificate of Completion'
+    body = template.body if template else 'This is to certify that {student} has successfully completed {course}.'
+    y = centered(fill(heading, context), 220, 84)
+    y = centered(context['student'], y + 110, 96)
+    centered(fill(body, context), y + 80, 44)
+    centered(f"{context['date']}  ·  {context['number']}", height - 220, 32)
+
+    png, pdf = io.BytesIO(), io.BytesIO()
+    canvas.save(png, 'PNG', optimize=True)
+    canvas.save(pdf, 'PDF', resolution=PDF_RESOLUTION)
+    return png.getvalue(), pdf.getvalue()
+
+
+def certificate_context(certificate):
+    enrollment = certificate.progress.enrollment
+    student = enrollment.student
+    name = f'{student.first_name} {student.last_name}'.strip()
+    return {
+        'student': name or student.user.get_full_name() or student.user.username,
+        'course': enrollment.course.title,
+        'date': certificate.issue_date.strftime('%B %d, %Y'),
+        'number': certificate.certificate_number,
+    }
+
+
+def render_certificate(certificate_id):
+    """Job: pending certificate claim karke render aur store karna."""
+    claimed = Certificate.objects.filter(pk=certificate_id, status='pending').update(
+        status='rendering', claimed_at=timezone.now()
+    )
+    if not claimed:
+        return  # kisi aur worker ne le liya ya pehle se ready
+    certificate = Certificate.objects.select_related(
+        'template', 'progress__enrollment__course', 'progress__enrollment__student__user'
+    ).get(pk=certificate_id)
+    first_render = not certificate.pdf
+    old_files = [f.name for f in (certificate.pdf, certificate.image) if f]
+    try:
+        template = certificate.template
+        if template is None:
+            template = template_for(certificate.progress.enrollment.course_id)
+        png, pdf = render_images(certificate_context(certificate), template)
+        number = certificate.certificate_number
+        certificate.image.save(f'{number}.png', ContentFile(png), save=False)
+        certificate.pdf.save(f'{number}.pdf', ContentFile(pdf), save=False)
+        certificate.template = template
+        certificate.file_url = certificate.pdf.url
+        certificate.status, certificate.error, certificate.rendered_at = 'ready', '', timezone.now()
+    except Exception as exc:
+        logger.exception('Certificate %s could not be rendered', certificate_id)
+        certificate.status, certificate.error = 'failed', str(exc)
+        old_files = []
+    certificate.save(update_fields=['image', 'pdf', 'template', 'file_url', 'status', 'error', 'rendered_at'])
+
+    for name in old_files:
+        default_storage.delete(name)
+    if certificate.status == 'ready' and first_render:
+        enrollment = certificate.progress.enrollment
+        notify(
+            enrollment.student.user_id,
+            title="Course Completed! 🎓",
+            message=f"Congratulations! You have successfully completed {enrollment.course.title}. Your certificate is ready.",
+            notification_type="Alert"
+        )
+
+
+def render_batch(certificate_ids):
+    for certificate_id in certificate_ids:
+        render_certificate(certificate_id)
+
+
+def enqueue(certificate_ids, batch_size=RENDER_BATCH_SIZE):
+    """Certificates ko batches mein worker pool par bhejna (har batch ek task)."""
+    certificate_ids = list(certificate_ids)
+    for start in range(0, len(certificate_ids), batch_size):
+        run_in_background(render_batch, certificate_ids[start:start + batch_size])
+    return len(certificate_ids)
+
+
+def regenerate(queryset, batch_size=RENDER_BATCH_SIZE):
+    """Queryset ke certificates dobara pending karke queue karna (rendering wale chhor kar)."""
+    queryset = queryset.exclude(status='rendering')
+    ids = list(queryset.values_list('pk', flat=True))
+    Certificate.objects.filter(pk__in=ids).update(status='pending')
+    return enqueue(ids, batch_size)
+
+
+def reclaim_stale(stale_after):
+    """Jin `rendering` claims ka worker mar gaya (claimed_at purana) unhe dobara pending karna."""
+    return Certificate.objects.filter(status='rendering').filter(
+        Q(claimed_at__lt=stale_after) | Q(claimed_at__isnull=True)
+    ).update(status='pending')
+
+
+def backfill_missing(batch_size=RENDER_BATCH_SIZE):
+    """Completed progress jin ka certificate nahi (e.g. signal se pehle complete hue) unke certificates."""
+    created = 0
+    while True:
+        rows = list(
+            TrackProgress.objects.filter(status='completed', certificate__isnull=True)
+            .order_by('pk').values_list('pk', 'enrollment__student_id')[:batch_size]
+        )
+        if not rows:
+            return created
+        progress_ids = [pk for pk, _ in rows]
+        Certificate.objects.bulk_create(
+            [Certificate(progress_id=pk, student_id=student_id, certificate_number=new_certificate_number())
+             for pk, student_id in rows],
+            ignore_conflicts=True,
+        )
+        ids = list(Certificate.objects.filter(progress_id__in=progress_ids, status='pending').values_list('pk', flat=True))
+        enqueue(ids, batch_size)
+        created += len(ids)
@@ -6,7 +6,12 @@ from .models import Certificate
 class CertificateSerializer(serializers.ModelSerializer):
     student_name = serializers.ReadOnlyField(source='progress.enrollment.student.user.username')
     course_title = serializers.ReadOnlyField(source='progress.enrollment.course.title')
+    image_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Certificate
-        fields = ['id', 'certificate_number', 'issue_date', 'file_url', 'student_name', 'course_title']
\ No newline at end of file
+        fields = ['id', 'certificate_number', 'issue_date', 'status', 'file_url', 'image_url', 'student_name', 'course_title']
+
+    def get_image_url(self, obj):
+        # PNG preview (share / thumbnail); render hone tak None
+        return obj.image.url if obj.image else None
\ No newline at end of file
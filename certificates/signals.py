@@ -1,20 +1,22 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from enrollments.models import TrackProgress
-from .models import Certificate
-from notifications.models import Notification
+from .models import Certificate, CertificateTemplate
+from . import rendering
 
 @receiver(post_save, sender=TrackProgress)
-def check_for_completion(sender, instance, **kwargs):
-    # Agar progress 100% hai aur pehle se certificate nahi bana
-    if instance.percentage >= 100 and not hasattr(instance, 'certificate'):
-        # 1. Certificate Create Karein
-        Certificate.objects.create(progress=instance)
-        
-        # 2. Student ko Notification Bhejein
-        Notification.objects.create(
-            user=instance.enrollment.student.user,
-            title="Course Completed! 🎓",
-            message=f"Congratulations! You have successfully completed {instance.enrollment.course.title}. Your certificate is ready.",
-            notification_type="Alert"
-        )
\ No newline at end of file
+def check_for_completion(sender, instance, raw=False, **kwargs):
+    # Sirf asal transition (status abhi 'completed' hua) par; har progress save par query nahi
+    if raw or instance.status != 'completed' or 'status' not in instance.changed_fields():
+        return
+    # Certificate row foran (number / issue date), PDF/PNG render background mein
+    certificate, created = Certificate.objects.get_or_create(progress=instance)
+    if created:
+        rendering.enqueue([certificate.pk])
+
+
+@receiver(post_save, sender=CertificateTemplate)
+def regenerate_template_certificates(sender, instance, created, raw=False, **kwargs):
+    # Design badla: is template se bane saare certificates dobara render
+    if not raw and not created:
+        rendering.regenerate(instance.certificates.all())
@@ -1,3 +1,122 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from courses.tests import make_user, build_course
+from enrollments.models import EnrollmentCourse, TrackProgress
+from notifications.models import Notification
+from .models import Certificate, CertificateTemplate
+
+
+class CertificateRenderingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = make_user('instructor')
+        cls.student = make_user('student', role='Student')
+        cls.course = build_course(cls.instructor.instructor_profile, 'Drone Basics', lessons=1)
+        cls.enrollment = EnrollmentCourse.objects.create(student=cls.student.student_profile, course=cls.course)
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        settings = override_settings(
+            DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+            MEDIA_ROOT=root, BACKGROUND_TASKS_EAGER=True,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.progress = TrackProgress.objects.get(enrollment=self.enrollment)
+
+    def complete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.progress.update_progress(100)
+        return Certificate.objects.get(progress=self.progress)
+
+    def test_completion_renders_pdf_and_png_in_background(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.progress.update_progress(50)
+        self.assertFalse(Certificate.objects.exists())
+
+        certificate = self.complete()
+        self.assertEqual(certificate.status, 'ready')
+        self.assertEqual(certificate.file_url, certificate.pdf.url)
+        with default_storage.open(certificate.pdf.name) as f:
+            self.assertTrue(f.read(5).startswith(b'%PDF'))
+        with default_storage.open(certificate.image.name) as f:
+            self.assertEqual(f.read(8), b'\x89PNG\r\n\x1a\n')
+        self.assertEqual(Notification.objects.filter(user=self.student, notification_type='Alert').count(), 1)
+
+        # Dobara 100% save koi naya certificate / notification nahi banata
+        with self.captureOnCommitCallbacks(execute=True):
+            self.progress.update_progress(100)
+            self.progress.save()
+        self.assertEqual(Certificate.objects.count(), 1)
+        self.assertEqual(Notification.objects.filter(user=self.student, notification_type='Alert').count(), 1)
+
+    def test_template_change_regenerates_its_certificates(self):
+        template = CertificateTemplate.objects.create(name='Default')
+        certificate = self.complete()
+        self.assertEqual(certificate.template, template)
+        old_pdf = certificate.pdf.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            template.heading = 'Certificate of Excellence in {course}'
+            template.save()
+        certificate.refresh_from_db()
+        self.assertEqual(certificate.status, 'ready')
+        self.assertNotEqual(certificate.pdf.name, old_pdf)
+        self.assertFalse(default_storage.exists(old_pdf))
+        # Re-render par dobara notification nahi
+        self.assertEqual(Notification.objects.filter(user=self.student, notification_type='Alert').count(), 1)
+
+    def test_course_template_preferred_over_default(self):
+        CertificateTemplate.objects.create(name='Default')
+        course_template = CertificateTemplate.objects.create(name='Drone', course=self.course)
+        self.assertEqual(self.complete().template, course_template)
+
+    def test_command_reclaims_stale_renders_and_backfills_missing(self):
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+
+        # Worker claim ke baad mar gaya
+        certificate = Certificate.objects.create(progress=self.progress, status='rendering')
+        Certificate.objects.filter(pk=certificate.pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+        # Receiver se pehle complete hua progress: certificate hi nahi
+        other = make_user('early', role='Student')
+        enrollment = EnrollmentCourse.objects.create(student=other.student_profile, course=self.course)
+        TrackProgress.objects.filter(enrollment=enrollment).update(status='completed', percentage=100)
+
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('render_certificates', '--missing', stdout=out)
+        self.assertIn('Reclaimed 1 stale', out.getvalue())
+        self.assertIn('Created 1 missing', out.getvalue())
+        statuses = dict(Certificate.objects.values_list('student__user', 'status'))
+        self.assertEqual(statuses, {self.student.pk: 'ready', other.pk: 'ready'})
+
+        # Taza claim (zinda worker) ko haath nahi lagta
+        Certificate.objects.filter(pk=certificate.pk).update(status='rendering', claimed_at=timezone.now())
+        call_command('render_certificates', stdout=StringIO())
+        self.assertEqual(Certificate.objects.get(pk=certificate.pk).status, 'rendering')
+
+    def test_my_certificates_filters_on_denormalized_student(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIClient
+
+        certificate = self.complete()
+        self.assertEqual(certificate.student_id, self.student.student_profile.pk)
+        client = APIClient()
+        client.force_authenticate(self.student)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/certificates/my-certificates/', {'page_size': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [certificate.pk])
+        listing = next(q['sql'] for q in ctx.captured_queries if 'FROM "certificates_certificate"' in q['sql'])
+        self.assertIn('"certificates_certificate"."student_id" =', listing)
+        self.assertNotIn('JOIN', listing)
@@ -8,12 +8,11 @@ from .serializers import CertificateSerializer
 class StudentCertificateListView(generics.ListAPIView):
     serializer_class = CertificateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ('-issue_date', '-id')
 
     def get_queryset(self):
         # Sirf logged-in student ke apne certificates filter karein
-        return Certificate.objects.filter(
-            progress__enrollment__student=self.request.user.student_profile
-        )
+        return Certificate.objects.filter(student=self.request.user.student_profile)
 
 # 2. Kisi aik certificate ki detail dekhne ke liye
 class CertificateDetailView(generics.RetrieveAPIView):
@@ -3,6 +3,14 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The notification stream (``/api/notifications/stream/``) is an async
+long-lived response and needs this entry point, e.g.::
+
+    gunicorn core.asgi:application -k uvicorn.workers.UvicornWorker
+
+The default notification broker is in-process, so with several workers set
+``NOTIFICATION_BROKER`` to a shared broker.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,171 @@
+"""
+Responsive image derivatives (course thumbnails, profile pictures).
+
+Upload ke baad original se chand fixed widths par resized, re-encoded copies
+(WebP + JPEG) background worker (core.tasks) mein banti hain aur original ke
+saath hi storage mein save hoti hain. Names model ki `*_variants` JSON field mein
+rehte hain: {"source": <original name>, "webp": {"320": name, ...}, "jpeg": {...}}.
+Serializers `srcset()` se `{"webp": "url 160w, url 320w", ...}` dete hain.
+
+Derivatives sirf tab banti hain jab image field ka naam DB se load hue naam se
+badle (TrackedFieldsMixin), aur nayi set save hone ke baad purani files storage
+se delete hoti hain.
+"""
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+from core.tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS = (160, 320, 640, 1280)
+JPEG_QUALITY = 80
+WEBP_QUALITY = 78
+
+
+def output_formats():
+    # (format key, Pillow format, extension)
+    formats = [('jpeg', 'JPEG', 'jpg')]
+    if features.check('webp'):
+        formats.insert(0, ('webp', 'WEBP', 'webp'))
+    return formats
+
+
+def derivative_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}_w{width}.{extension}'
+
+
+def encode(image, pil_format):
+    if pil_format == 'JPEG' and image.mode != 'RGB':
+        # JPEG mein transparency nahi, safed background par rakh do
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    buffer = io.BytesIO()
+    options = {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True} if pil_format == 'JPEG' \
+        else {'quality': WEBP_QUALITY, 'method': 4}
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def build_derivatives(name, storage=None):
+    """Original `name` se saari derivatives bana kar storage mein save karna; variants dict return."""
+    storage = storage or default_storage
+    with storage.open(name, 'rb') as source:
+        original = ImageOps.exif_transpose(Image.open(source))
+        original.load()
+    if original.mode not in ('RGB', 'RGBA'):
+        # Palette / grayscale wagera: transparency ho to RGBA, warna RGB
+        transparent = 'A' in original.getbands() or 'transparency' in original.info
+        original = original.convert('RGBA' if transparent else 'RGB')
+
+    # Original se bari width nahi banate; bohat chhoti image ki kam az kam ek copy
+    widths = [w for w in DERIVATIVE_WIDTHS if w <= original.width] or [original.width]
+    variants = {'source': name}
+    for key, pil_format, extension in output_formats():
+        variants[key] = {}
+        for width in widths:
+            height = max(1, round(original.height * width / original.width))
+            resized = original.resize((width, height), Image.LANCZOS) if width != original.width else original
+            saved = storage.save(derivative_name(name, width, extension), ContentFile(encode(resized, pil_format)))
+            variants[key][str(width)] = saved
+    return variants
+
+
+def variant_names(variants):
+    return {name for key, sizes in (variants or {}).items() if key != 'source' for name in sizes.values()}
+
+
+def delete_variants(variants, keep=None, storage=None):
+    """`variants` ki derivative files delete (jo `keep` mein bhi hain woh nahi). Original kabhi nahi."""
+    storage = storage or default_storage
+    for name in variant_names(variants) - variant_names(keep):
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.exception('Could not delete image derivative %s', name)
+
+
+def replace_variants(model, pk, field_name, variants_field, name, variants):
+    """
+    Field abhi bhi `name` ho to variants likhna aur purani set return; beech mein nayi
+    image aa gayi ho to None. Row lock ke saath, taake do workers ek doosre ki set na mitayen.
+    """
+    with transaction.atomic():
+        old = model.objects.select_for_update().filter(pk=pk, **{field_name: name}).values_list(
+            variants_field, flat=True
+        ).first()
+        if old is None:
+            return None
+        model.objects.filter(pk=pk).update(**{variants_field: variants})
+    return old
+
+
+def refresh_derivatives(model, pk, field_name, variants_field, on_update=None):
+    """
+    Background task: image field ki derivatives banana. Variants queryset update se
+    likhe jate hain (post_save dobara nahi chalta); `on_update(pk)` caches waghera ke liye.
+    """
+    instance = model.objects.filter(pk=pk).only(field_name).first()
+    if instance is None:
+        return
+    name = getattr(instance, field_name).name
+    if not name:
+        return
+    try:
+        variants = build_derivatives(name)
+    except Exception:
+        logger.exception('Could not build image derivatives for %s %s', model.__name__, pk)
+        return
+    old = replace_variants(model, pk, field_name, variants_field, name, variants)
+    if old is None:
+        # Beech mein nayi image aa gayi: yeh set kisi kaam ki nahi
+        delete_variants(variants)
+        return
+    delete_variants(old, keep=variants)
+    if on_update is not None:
+        on_update(pk)
+
+
+def clear_derivatives(model, pk, variants_field):
+    """Image hat gayi: variants saaf; un ki files commit ke baad delete."""
+    with transaction.atomic():
+        old = model.objects.select_for_update().filter(pk=pk).values_list(variants_field, flat=True).first()
+        if not old:
+            return
+        model.objects.filter(pk=pk).update(**{variants_field: {}})
+    transaction.on_commit(lambda: delete_variants(old))
+
+
+def schedule_derivatives(instance, field_name, variants_field, on_update=None):
+    """
+    post_save se: image ka naam load hue naam se badla ho to derivatives background mein
+    (hat gayi ho to variants saaf). Stale instance ka save, jis mein image wahi hai, kuch nahi karta.
+    """
+    if field_name not in instance.changed_fields():
+        return
+    if getattr(instance, field_name).name:
+        run_in_background(refresh_derivatives, type(instance), instance.pk, field_name, variants_field, on_update)
+    else:
+        clear_derivatives(type(instance), instance.pk, variants_field)
+
+
+def srcset(variants, storage=None):
+    """Variants dict se `{"webp": "url 160w, url 320w", "jpeg": ...}` (na hon to None)."""
+    if not variants or 'source' not in variants:
+        return None
+    storage = storage or default_storage
+    return {
+        key: ', '.join(f'{storage.url(name)} {width}w' for width, name in sorted(
+            sizes.items(), key=lambda item: int(item[0])
+        ))
+        for key, sizes in variants.items() if key != 'source'
+    }
@@ -0,0 +1,133 @@
+"""
+Range-capable media serving (filesystem storage).
+
+`django.views.static.serve` poori file bhejta hai, is liye video seek ya PDF
+resume par sab kuch dobara transfer hota tha. Yeh view `Range` / `If-Range`
+samajhta hai (206 Partial Content, 416 unsatisfiable), ETag / Last-Modified se
+304 deta hai, aur FileResponse ke through stream karta hai - gunicorn jaise
+servers `wsgi.file_wrapper` se sendfile (zero-copy) use karte hain.
+
+Cloudinary jaisi remote storage par files CDN se serve hoti hain; yeh view sirf
+MEDIA_ROOT wali filesystem storage (tests, self-hosted) ke liye hai.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    File ka `[start, start + length)` hissa. `fileno()` asal file ka hai, is liye
+    sendfile wala server Content-Length tak seedha fd se bhejta hai; baqi servers
+    `read()` se utna hi parhte hain.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    `Range: bytes=a-b` se (start, end) inclusive. Header na ho / multi-range / samajh
+    na aaye to None (poori file). Unsatisfiable ho to ValueError.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-500: aakhri 500 bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('empty suffix range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('range not satisfiable')
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    """If-Range na ho ya current representation se match kare to True (Range lagao)."""
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        # Weak ETag se range nahi (RFC 9110 13.1.5)
+        return not value.startswith('W/') and value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:  # MEDIA_ROOT se bahar (../)
+        raise Http404('Not found')
+    if not os.path.isfile(full_path):
+        raise Http404('Not found')
+
+    stat = os.stat(full_path)
+    size, last_modified = stat.st_size, int(stat.st_mtime)
+    etag = quote_etag(f'{int(stat.st_mtime_ns):x}-{size:x}')
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is not None and not if_range_matches(request, etag, last_modified):
+        byte_range = None
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+        response['Content-Length'] = str(size)
+    else:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
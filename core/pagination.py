@@ -0,0 +1,171 @@
+"""
+Keyset (cursor) pagination.
+
+Offset pagination ke baraks yeh `WHERE (created_at, id) < (last_created_at, last_id)`
+wala filter lagata hai, is liye page 500 bhi page 1 jitna hi sasta hai.
+Cursor opaque hota hai (base64 JSON), client sirf `next`/`previous` link follow kare.
+
+Transition: purane clients poori list expect karte hain, is liye jab tak
+`KEYSET_PAGINATION_OPT_IN = True` hai, pagination sirf tab lagti hai jab client
+`?page_size=` ya `?cursor=` bheje.
+
+Ordering mein model fields, related paths ('stats__enrollment_count') ya queryset
+annotations ho sakti hain. Jo related row kuch objects ke liye na ho, us par seedha
+order na karein: view Coalesce annotation de, warna NULL wali rows cursor se bahar
+reh jati hain.
+"""
+import base64
+import datetime
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class KeysetPagination(BasePagination):
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    # Views `keyset_ordering` set karke isay override kar sakte hain
+    ordering = ('-created_at', '-id')
+
+    def is_requested(self, request):
+        if not getattr(settings, 'KEYSET_PAGINATION_OPT_IN', True):
+            return True
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        self.paths = [name.lstrip('-') for name in self.ordering]
+        self.fields = [self.resolve_field(queryset, path) for path in self.paths]
+        page_size = self.get_page_size(request)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self.flip(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        # Reverse (previous) page par aage hamesha kuch hota hai
+        self.has_next = has_more if not reverse else True
+        self.has_previous = (position is not None) if not reverse else has_more
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_link(self.page[0], reverse=True)
+
+    # --- Cursor helpers ---
+
+    @staticmethod
+    def resolve_field(queryset, path):
+        if path in queryset.query.annotations:
+            return queryset.query.annotations[path].output_field
+        # 'stats__enrollment_count' jaise related paths bhi chalte hain
+        model = queryset.model
+        *relations, name = path.split(LOOKUP_SEP)
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    @staticmethod
+    def flip(ordering):
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+    def after(self, ordering, position):
+        """(a, b) ke liye: a > x OR (a = x AND b > y), direction ordering ke mutabiq."""
+        clauses = []
+        for i, name in enumerate(ordering):
+            field = name.lstrip('-')
+            op = 'lt' if name.startswith('-') else 'gt'
+            equal = dict(zip(self.paths[:i], position[:i]))
+            clauses.append(Q(**equal, **{f'{field}__{op}': position[i]}))
+        return reduce(or_, clauses)
+
+    @staticmethod
+    def cursor_value(value):
+        # field.value_to_string jaisa; annotation ki field model par bound nahi hoti
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        return str(value)
+
+    def encode_link(self, obj, reverse):
+        values = []
+        for path in self.paths:
+            value = obj
+            for name in path.split(LOOKUP_SEP):
+                value = getattr(value, name)
+            values.append(self.cursor_value(value))
+        raw = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(raw.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            values = data['v']
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [field.to_python(value) for field, value in zip(self.fields, values)]
+            return position, bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
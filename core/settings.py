@@ -105,8 +105,14 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Keyset pagination: (created_at, id) cursor, deep pages bhi first page jitne saste
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '20')),
 }
 
+# Transition: True par pagination sirf ?page_size= / ?cursor= bhejne wale clients ko milegi
+KEYSET_PAGINATION_OPT_IN = os.getenv('KEYSET_PAGINATION_OPT_IN', 'True') == 'True'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -128,9 +134,16 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# MEDIA_ROOT ki files core/media.py serve karta hai (Range / 206 support); Cloudinary par CDN
+SERVE_MEDIA = DEBUG or os.getenv('USE_LOCAL_MEDIA', 'False') == 'True'
+MEDIA_CACHE_MAX_AGE = int(os.getenv('MEDIA_CACHE_MAX_AGE', str(60 * 60 * 24)))
 
 # 2. Media storage ko Cloudinary par set karein
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+# (USE_LOCAL_MEDIA=True: self-hosted / local dev ke liye MEDIA_ROOT filesystem storage)
+DEFAULT_FILE_STORAGE = (
+    'django.core.files.storage.FileSystemStorage' if os.getenv('USE_LOCAL_MEDIA', 'False') == 'True'
+    else 'cloudinary_storage.storage.MediaCloudinaryStorage'
+)
 
 # 3. Cloudinary Credentials (Environment Variables se uthayein)
 CLOUDINARY_STORAGE = {
@@ -157,3 +170,27 @@ ACCOUNT_LOGIN_METHODS = {'email'}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+# Background tasks (core/tasks.py) - in-process worker pool
+BACKGROUND_TASK_WORKERS = int(os.getenv('BACKGROUND_TASK_WORKERS', '4'))
+BACKGROUND_TASKS_EAGER = os.getenv('BACKGROUND_TASKS_EAGER', 'False') == 'True'
+
+# Resumable uploads (courses/uploads.py): chunks yahan jurte hain, commit ke baad storage par
+UPLOAD_SESSION_DIR = os.getenv('UPLOAD_SESSION_DIR', os.path.join(BASE_DIR, 'upload_sessions'))
+UPLOAD_CHUNK_MAX_SIZE = int(os.getenv('UPLOAD_CHUNK_MAX_SIZE', str(16 * 1024 * 1024)))
+UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', str(5 * 1024 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv('UPLOAD_SESSION_TTL_HOURS', '24'))
+
+# Player heartbeats (enrollments/heartbeats.py): buffer itne seconds baad ek bulk_update mein flush
+HEARTBEAT_FLUSH_INTERVAL = float(os.getenv('HEARTBEAT_FLUSH_INTERVAL', '5'))
+HEARTBEAT_MAX_EVENTS = int(os.getenv('HEARTBEAT_MAX_EVENTS', '100'))
+
+# Notification push (notifications/pubsub.py, stream.py): broker class, SSE keepalive aur
+# connection ki max umar (seconds; us ke baad client reconnect karta hai)
+NOTIFICATION_BROKER = os.getenv('NOTIFICATION_BROKER', 'notifications.pubsub.InProcessBroker')
+NOTIFICATION_STREAM_KEEPALIVE = float(os.getenv('NOTIFICATION_STREAM_KEEPALIVE', '15'))
+NOTIFICATION_STREAM_MAX_AGE = float(os.getenv('NOTIFICATION_STREAM_MAX_AGE', '300'))
+NOTIFICATION_STREAM_TICKET_TTL = int(os.getenv('NOTIFICATION_STREAM_TICKET_TTL', '30'))
+
+# Retention (notifications/retention.py): itne din se purani read notifications archive mein
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '90'))
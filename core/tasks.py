@@ -0,0 +1,65 @@
+"""
+Halka background task runner.
+
+Celery/broker abhi deployment mein nahi hai, is liye kaam ek in-process
+ThreadPoolExecutor par chalta hai. Task hamesha transaction commit hone ke
+baad submit hota hai taake worker ko committed data hi mile.
+`BACKGROUND_TASKS_EAGER = True` (tests) par task usi thread mein chal jata hai.
+`run_after` delay ke baad (transaction ke baghair) wahi pool use karta hai,
+write-behind buffers ke periodic flush ke liye.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 4),
+                thread_name_prefix='skillsphere-task',
+            )
+    return _executor
+
+
+def _run(fn, args, kwargs):
+    # Worker thread ka apna DB connection hota hai, usay saaf rakhna zaroori hai
+    close_old_connections()
+    try:
+        fn(*args, **kwargs)
+    except Exception:
+        logger.exception('Background task %s failed', getattr(fn, '__name__', fn))
+    finally:
+        close_old_connections()
+
+
+def run_in_background(fn, *args, **kwargs):
+    """`fn(*args, **kwargs)` ko current transaction commit hone ke baad worker pool mein chalana."""
+    def submit():
+        if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+            fn(*args, **kwargs)
+        else:
+            get_executor().submit(_run, fn, args, kwargs)
+
+    transaction.on_commit(submit)
+
+
+def run_after(delay, fn, *args, **kwargs):
+    """`delay` seconds baad `fn` worker pool mein. Timer return hota hai (cancel ke liye)."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        fn(*args, **kwargs)
+        return None
+    timer = threading.Timer(delay, lambda: get_executor().submit(_run, fn, args, kwargs))
+    timer.daemon = True
+    timer.start()
+    return timer
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+
+from core.media import serve_media
+
+urlpatterns = [path('media/<path:path>', serve_media)]
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+@override_settings(ROOT_URLCONF='core.tests')
+class RangeMediaTests(SimpleTestCase):
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        os.makedirs(os.path.join(root, 'lesson_content'))
+        with open(os.path.join(root, 'lesson_content', 'day1.mp4'), 'wb') as f:
+            f.write(CONTENT)
+        settings = override_settings(MEDIA_ROOT=root, MEDIA_CACHE_MAX_AGE=600)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.url = '/media/lesson_content/day1.mp4'
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertIn('max-age=600', response['Cache-Control'])
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_partial_ranges(self):
+        for header, start, end in (('bytes=100-199', 100, 199), ('bytes=10000-', 10000, 10239),
+                                   ('bytes=-40', 10200, 10239), ('bytes=10200-99999', 10200, 10239)):
+            response = self.client.get(self.url, HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 206, header)
+            self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/10240')
+            self.assertEqual(response['Content-Length'], str(end - start + 1))
+            self.assertEqual(self.body(response), CONTENT[start:end + 1])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=20000-')
+        self.assertEqual((response.status_code, response['Content-Range']), (416, 'bytes */10240'))
+
+    def test_if_range_and_conditional(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.body(response)), 10240)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_path_traversal(self):
+        self.assertEqual(self.client.get('/media/../settings.py').status_code, 404)
+        self.assertEqual(self.client.get('/media/missing.pdf').status_code, 404)
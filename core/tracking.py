@@ -0,0 +1,65 @@
+"""
+Halka dirty-field tracking.
+
+Model `tracked_fields` (attnames, e.g. 'status', 'week_id') declare kare; DB se
+load hote waqt unki values yaad rehti hain, taake signals bina extra query ke
+purani value dekh saken aur sirf asal tabdeeli par kaam karein. File fields ka
+sirf naam yaad rehta hai.
+
+`managed_fields` woh columns hain jo sirf queryset updates (F() counters,
+background workers) likhte hain; existing row ka poora `save()` unhe skip karta
+hai, taake purana (stale) instance unhe peeche na le jaye.
+"""
+from django.db.models.fields.files import FieldFile
+
+
+class TrackedFieldsMixin:
+    tracked_fields = ()
+    managed_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.tracked_fields
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        if (self.managed_fields and not args and not self._state.adding
+                and not kwargs.get('force_insert') and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.managed_fields
+            ]
+        super().save(*args, **kwargs)
+        # Save ke baad (post_save receivers chal chuke) current values hi "loaded" hain
+        self._loaded_values = {name: self.tracked_value(name) for name in self.tracked_fields}
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        # DB se taaza values hi ab "loaded" hain (sirf refresh hui fields)
+        refreshed = None if fields is None else set(fields)
+        loaded = dict(getattr(self, '_loaded_values', {}))
+        for name in self.tracked_fields:
+            if refreshed is None or name in refreshed or name.removesuffix('_id') in refreshed:
+                loaded[name] = self.tracked_value(name)
+        self._loaded_values = loaded
+
+    def tracked_value(self, name):
+        value = getattr(self, name)
+        # FieldFile jagah par badalta hai (`field.save()`), is liye naam
+        return value.name if isinstance(value, FieldFile) else value
+
+    def loaded_value(self, name, default=None):
+        return getattr(self, '_loaded_values', {}).get(name, default)
+
+    def changed_fields(self):
+        """DB se load ki hui values ke muqable mein badli hui tracked fields (naya object: sab)."""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return set(self.tracked_fields)
+        return {
+            name for name in self.tracked_fields
+            if name not in loaded or loaded[name] != self.tracked_value(name)
+        }
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Course, CourseModule, CourseSubModule, 
-    Lesson, Quiz, Question, Review, CourseInstructor
+    Lesson, Quiz, Question, QuizAttempt, Review, CourseInstructor, CourseSnapshot
 )
 
 # ==========================================
@@ -71,9 +71,21 @@ class QuizAdmin(admin.ModelAdmin):
     list_display = ('lesson', 'total_marks', 'passing_marks')
     inlines = [QuestionInline]
 
+@admin.register(QuizAttempt)
+class QuizAttemptAdmin(admin.ModelAdmin):
+    list_display = ('user', 'quiz', 'score_percentage', 'passed', 'created_at')
+    list_filter = ('passed',)
+    readonly_fields = ('answers',)
+
 # ==========================================
 # 3. OTHER REGISTRATIONS
 # ==========================================
 
 admin.site.register(Review)
-admin.site.register(CourseInstructor)
\ No newline at end of file
+admin.site.register(CourseInstructor)
+
+@admin.register(CourseSnapshot)
+class CourseSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('course', 'version', 'is_stale', 'built_at')
+    list_filter = ('is_stale',)
+    readonly_fields = ('payload',)
@@ -0,0 +1,65 @@
+"""
+Conditional GET (ETag / Last-Modified) for course content.
+
+Course.content_version har us write par bump hota hai jo course ya uske curriculum
+ko chhuta hai (courses/signals.py). Retrieve endpoints pehle sirf yeh chhoti row
+(version, updated_at) parhte hain; client ka If-None-Match / If-Modified-Since
+match kare to 304 wahin se, koi curriculum query ya serialization nahi.
+"""
+from calendar import timegm
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import Course
+
+
+def bump_content_version(course_id):
+    if course_id is None:
+        return
+    Course.objects.filter(pk=course_id).update(
+        content_version=F('content_version') + 1, updated_at=timezone.now()
+    )
+
+
+def course_validators(**lookup):
+    """(etag, last_modified timestamp) ya None agar course na mile."""
+    row = Course.objects.filter(**lookup).values_list('pk', 'content_version', 'updated_at').first()
+    if row is None:
+        return None
+    pk, version, updated_at = row
+    return quote_etag(f'{pk}-{version}'), timegm(updated_at.utctimetuple())
+
+
+class ConditionalRetrieveMixin:
+    """
+    `retrieve` ko ETag / Last-Modified dena. View `conditional_lookup` set kare:
+    (Course lookup, URL kwarg), e.g. ('slug', 'slug') ya ('modules__weeks__lessons', 'pk').
+    Apna retrieve logic ho to view `retrieve` ki jagah `retrieve_content` override kare,
+    taake 304 check us se pehle chale. `retrieve_content` mein `self.content_etag`
+    current version ka ETag hai (course na mile to None), cache keys ke liye.
+    """
+    conditional_lookup = ('slug', 'slug')
+    content_etag = None
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup, kwarg = self.conditional_lookup
+        validators = course_validators(**{lookup: kwargs[kwarg]})
+        self.content_etag = validators[0] if validators else None
+        if validators is None:
+            return self.retrieve_content(request, *args, **kwargs)  # normal 404
+        etag, last_modified = validators
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = self.retrieve_content(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def retrieve_content(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
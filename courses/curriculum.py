@@ -0,0 +1,273 @@
+"""
+Curriculum loader: poora course tree (modules -> weeks -> lessons -> quiz /
+assets / topics -> subtopics) fixed number of queries mein load karta hai.
+
+Serializers jo ordering use karte hain wahi yahan Prefetch querysets mein hai,
+is liye 5 lessons wala course aur 500 lessons wala course dono barabar
+queries lete hain.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Prefetch, Q, prefetch_related_objects
+from rest_framework.exceptions import ValidationError
+
+from .models import (
+    Course, CourseModule, CourseSubModule, Lesson, Quiz, Question,
+    ModuleAsset, SubModuleAsset, LessonAsset, Topic, SubTopic
+)
+from .grading import cache_key as answer_key_cache_key
+from .uploads import attach_lesson_uploads
+
+# Har curriculum model se uske Course tak ka ORM rasta
+COURSE_LOOKUPS = {
+    CourseModule: 'course',
+    CourseSubModule: 'module__course',
+    ModuleAsset: 'module__course',
+    SubModuleAsset: 'submodule__module__course',
+    Lesson: 'week__module__course',
+    Quiz: 'lesson__week__module__course',
+    Question: 'quiz__lesson__week__module__course',
+    LessonAsset: 'lesson__week__module__course',
+    Topic: 'lesson__week__module__course',
+    SubTopic: 'topic__lesson__week__module__course',
+}
+
+
+_sync_state = threading.local()
+
+
+@contextmanager
+def curriculum_sync():
+    """
+    Is block mein curriculum rows ke per-row post_delete receivers (stats, snapshot,
+    content version, facets, answer key) kuch nahi karte; caller aakhir mein ek
+    dafa recompute / invalidate karta hai. Thread-local, dusri requests par asar nahi.
+    """
+    previous = getattr(_sync_state, 'active', False)
+    _sync_state.active = True
+    try:
+        yield
+    finally:
+        _sync_state.active = previous
+
+
+def syncing():
+    return getattr(_sync_state, 'active', False)
+
+
+def lesson_prefetches(prefix=''):
+    """Ek lesson ke neeche ka content (quiz questions, assets, topics, subtopics)."""
+    return [
+        Prefetch(f'{prefix}quiz__questions', queryset=Question.objects.order_by('id')),
+        Prefetch(f'{prefix}assets', queryset=LessonAsset.objects.order_by('id')),
+        Prefetch(f'{prefix}topics', queryset=Topic.objects.order_by('order', 'id')),
+        Prefetch(f'{prefix}topics__subtopics', queryset=SubTopic.objects.order_by('order', 'id')),
+    ]
+
+
+def curriculum_prefetches(prefix=''):
+    """
+    Course se shuru hone wale tamam Prefetch objects.
+    `prefix` dusre models (e.g. 'course__' from EnrollmentCourse) ke liye hai.
+    """
+    lessons = f'{prefix}modules__weeks__lessons'
+    return [
+        Prefetch(f'{prefix}modules', queryset=CourseModule.objects.order_by('order', 'id')),
+        Prefetch(f'{prefix}modules__assets', queryset=ModuleAsset.objects.order_by('id')),
+        Prefetch(f'{prefix}modules__weeks', queryset=CourseSubModule.objects.order_by('order', 'id')),
+        Prefetch(f'{prefix}modules__weeks__assets', queryset=SubModuleAsset.objects.order_by('id')),
+        # Quiz OneToOne hai, JOIN se lesson ke saath hi aa jata hai
+        Prefetch(lessons, queryset=Lesson.objects.select_related('quiz').order_by('order', 'id')),
+    ] + lesson_prefetches(f'{lessons}__')
+
+
+def with_curriculum(queryset, prefix=''):
+    """Queryset par poore curriculum ka prefetch laga deta hai."""
+    return queryset.prefetch_related(*curriculum_prefetches(prefix))
+
+
+def load_curriculum(courses, prefix=''):
+    """Pehle se fetched course instances (ek ya zyada) par curriculum load karna."""
+    if not isinstance(courses, (list, tuple)):
+        courses = [courses]
+    prefetch_related_objects(courses, *curriculum_prefetches(prefix))
+    return courses
+
+
+def course_id_for(instance):
+    """
+    Kisi bhi curriculum object ka course_id, parent ki FK se ek query mein.
+    Parent se shuru karte hain taake post_delete (row ja chuki) par bhi kaam kare.
+    """
+    if isinstance(instance, Course):
+        return instance.pk
+    # Parent chain pehle se loaded ho (ownership.owned_by select_related) to query ki zaroorat nahi
+    target, (*relations, last) = instance, COURSE_LOOKUPS[type(instance)].split('__')
+    for name in relations:
+        if not target._meta.get_field(name).is_cached(target):
+            break
+        target = getattr(target, name)
+    else:
+        return getattr(target, f'{last}_id')
+    parent, _, rest = COURSE_LOOKUPS[type(instance)].partition('__')
+    parent_id = getattr(instance, f'{parent}_id')
+    if not rest or parent_id is None:
+        return parent_id
+    # Ek hi save ke kai receivers (snapshot, stats) dobara query na karein
+    cached = getattr(instance, '_course_id_cache', None)
+    if cached and cached[0] == parent_id:
+        return cached[1]
+    parent_model = instance._meta.get_field(parent).related_model
+    course_id = parent_model.objects.filter(pk=parent_id).values_list(rest, flat=True).first()
+    instance._course_id_cache = (parent_id, course_id)
+    return course_id
+
+
+def allocate_lesson_bits(course_id, lessons):
+    """
+    Naye (ya dusre course se aaye) lessons ko course ke counter se agle `bit_index`
+    dena, write ke waqt hi: progress layout (enrollments/progress.py) sirf parhta hai.
+    Bits kabhi wapis nahi bantte, is liye deleted lesson ka bit kisi ko nahi milta.
+    """
+    if not lessons:
+        return
+    with transaction.atomic():
+        Course.objects.filter(pk=course_id).update(lesson_bits_allocated=F('lesson_bits_allocated') + len(lessons))
+        end = Course.objects.filter(pk=course_id).values_list('lesson_bits_allocated', flat=True).first()
+    for bit, lesson in enumerate(lessons, start=end - len(lessons)):
+        lesson.bit_index = bit
+
+
+def create_curriculum(course, modules_data, batch_size=500, request=None):
+    """
+    Validated nested data (modules -> weeks -> lessons) ko level-by-level
+    bulk_create se likhna: har level ke liye ek INSERT (batch_size ke hisaab se).
+    Caller transaction.atomic ke andar call kare. Created IDs return hoti hain.
+    """
+    modules, weeks_data = [], []
+    for data in modules_data:
+        data = dict(data)
+        data.pop('id', None)
+        weeks_data.append(data.pop('weeks', []))
+        modules.append(CourseModule(course=course, **data))
+    CourseModule.objects.bulk_create(modules, batch_size=batch_size)
+
+    weeks, lessons_data = [], []
+    for module, module_weeks in zip(modules, weeks_data):
+        for data in module_weeks:
+            data = dict(data)
+            data.pop('id', None)
+            lessons_data.append(data.pop('lessons', []))
+            weeks.append(CourseSubModule(module=module, **data))
+    CourseSubModule.objects.bulk_create(weeks, batch_size=batch_size)
+
+    lessons_data = [[dict(data) for data in week_lessons] for week_lessons in lessons_data]
+    # Staged uploads (temp_video_key / temp_doc_key) sab lessons ke liye ek query mein
+    attach_lesson_uploads([data for week_lessons in lessons_data for data in week_lessons], course, request)
+    lessons = []
+    for week, week_lessons in zip(weeks, lessons_data):
+        for data in week_lessons:
+            data.pop('id', None)
+            lessons.append(Lesson(week=week, **data))
+    allocate_lesson_bits(course.pk, lessons)
+    Lesson.objects.bulk_create(lessons, batch_size=batch_size)
+
+    return {
+        'modules': [m.pk for m in modules],
+        'weeks': [w.pk for w in weeks],
+        'lessons': [l.pk for l in lessons],
+    }, lessons
+
+
+# Tree ke levels: (naam, model, parent FK attname, children key, naye node ke zaroori fields)
+CURRICULUM_LEVELS = [
+    ('modules', CourseModule, 'course_id', 'weeks', ('title', 'order')),
+    ('weeks', CourseSubModule, 'module_id', 'lessons', ('title', 'order')),
+    ('lessons', Lesson, 'week_id', None, ('title', 'order', 'content_type')),
+]
+
+
+def sync_curriculum(course, modules_data, batch_size=500, request=None):
+    """
+    Desired tree ko stored tree ke against diff karke kam se kam writes mein apply karna.
+
+    `id` wala node update/move hota hai (sirf badle hue fields likhe jate hain), bina
+    `id` wala insert, aur jo stored node tree mein nahi wo delete. Kisi node mein
+    children key (`weeks` / `lessons`) na ho to uske children ko haath nahi lagate.
+    Har level par ek SELECT, ek bulk_create, ek bulk_update aur ek DELETE. Deletes
+    aakhir mein neeche se upar hote hain, taake kisi deleted parent se move hua
+    child cascade mein na urr jaye. Deletes `curriculum_sync()` ke andar chalte hain
+    (per-row receivers band); stats / snapshot / version caller ek dafa update karta hai.
+    Caller transaction.atomic ke andar call kare. Har level ki counts return hoti hain.
+    """
+    changes, deletes = {}, []
+    nodes = [(course, modules_data)]
+    for level, model, parent_attr, children_key, required in CURRICULUM_LEVELS:
+        stored = {obj.pk: obj for obj in model.objects.filter(**{COURSE_LOOKUPS[model]: course})}
+        created, updated, fields, kept, synced_parents, next_nodes = [], [], set(), set(), set(), []
+        if model is Lesson:
+            nodes = [(parent, [dict(data) for data in items]) for parent, items in nodes]
+            attach_lesson_uploads([data for _, items in nodes for data in items], course, request)
+
+        for parent, items in nodes:
+            synced_parents.add(parent.pk)
+            for data in items:
+                data = dict(data)
+                children = data.pop(children_key, None) if children_key else None
+                pk = data.pop('id', None)
+                data[parent_attr] = parent.pk
+
+                if pk is None:
+                    missing = [name for name in required if name not in data]
+                    if missing:
+                        raise ValidationError({name: ['This field is required.'] for name in missing})
+                    obj = model(**data)
+                    created.append(obj)
+                else:
+                    obj = stored.get(pk)
+                    if obj is None or pk in kept:
+                        raise ValidationError({'id': [f'Invalid {model._meta.model_name} id "{pk}".']})
+                    kept.add(pk)
+                    changed = [name for name, value in data.items() if getattr(obj, name) != value]
+                    for name in changed:
+                        setattr(obj, name, data[name])
+                    if changed:
+                        updated.append(obj)
+                        fields.update(changed)
+
+                if children is not None:
+                    next_nodes.append((obj, children))
+
+        if model is Lesson:
+            allocate_lesson_bits(course.pk, created)
+        # Parents pehle likhe jate hain taake naye children ko unki pk mil jaye
+        model.objects.bulk_create(created, batch_size=batch_size)
+        if updated:
+            model.objects.bulk_update(updated, sorted(fields), batch_size=batch_size)
+        # Sirf un parents ke purane children delete jin ki children list aayi thi
+        deleted = [
+            pk for pk, obj in stored.items()
+            if pk not in kept and getattr(obj, parent_attr) in synced_parents
+        ]
+        deletes.append((model, deleted))
+
+        changes[level] = {'created': len(created), 'updated': len(updated), 'deleted': len(deleted)}
+        nodes = next_nodes
+
+    deleted_ids = {model: ids for model, ids in deletes}
+    if any(deleted_ids.values()):
+        # Cascade se jane wale lessons bhi: unki cached answer keys ek saath saaf
+        lesson_ids = Lesson.objects.filter(
+            Q(pk__in=deleted_ids[Lesson])
+            | Q(week_id__in=deleted_ids[CourseSubModule])
+            | Q(week__module_id__in=deleted_ids[CourseModule])
+        ).values_list('id', flat=True)
+        cache.delete_many([answer_key_cache_key(lesson_id) for lesson_id in lesson_ids])
+        with curriculum_sync():
+            for model, deleted in reversed(deletes):
+                if deleted:
+                    model.objects.filter(pk__in=deleted).delete()
+    return changes
@@ -0,0 +1,139 @@
+"""
+Catalog filters aur facet counts ("NLP (42)").
+
+Fixed dimensions (category, status, price bucket, difficulty) ke saare counts ek
+hi conditional aggregate query mein aate hain; instructor facet ek GROUP BY se.
+Har dimension ka count baaki dimensions ke selected filters ke saath hota hai
+(standard faceted search), aur poora result catalog version ke saath cache hota
+hai jo Course/Lesson change par bump hota hai.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import Course, Lesson
+
+VERSION_CACHE_KEY = 'courses:facets:version'
+FACET_TIMEOUT = 60 * 15
+
+# (key, label, min, max) - max None matlab open ended
+PRICE_BUCKETS = [
+    ('free', 'Free', 0, 0),
+    ('under_50', 'Under $50', 0.01, 49.99),
+    ('50_to_100', '$50 - $100', 50, 100),
+    ('over_100', 'Over $100', 100.01, None),
+]
+
+DIMENSIONS = ('category', 'status', 'price', 'difficulty', 'instructor')
+
+
+def parse_filters(params):
+    """Query params se {dimension: [values]}; ek dimension mein comma se multiple values (OR)."""
+    filters = {}
+    for dim in DIMENSIONS:
+        raw = params.get(dim)
+        if raw:
+            values = [v.strip() for v in raw.split(',') if v.strip()]
+            if values:
+                filters[dim] = values
+    return filters
+
+
+def value_q(dim, value):
+    if dim == 'category':
+        return Q(category=value)
+    if dim == 'status':
+        return Q(status=value)
+    if dim == 'instructor':
+        return Q(instructor_id=value) if str(value).isdigit() else Q(pk__in=[])
+    if dim == 'difficulty':
+        return Q(Exists(Lesson.objects.filter(week__module__course=OuterRef('pk'), difficulty=value)))
+    if dim == 'price':
+        for key, _, low, high in PRICE_BUCKETS:
+            if key == value:
+                q = Q(price__gte=low)
+                return q & Q(price__lte=high) if high is not None else q
+        return Q(pk__in=[])
+    raise ValueError(dim)
+
+
+def dimension_q(dim, values):
+    q = Q()
+    for value in values:
+        q |= value_q(dim, value)
+    return q
+
+
+def filters_q(filters, exclude=None):
+    q = Q()
+    for dim, values in filters.items():
+        if dim != exclude:
+            q &= dimension_q(dim, values)
+    return q
+
+
+def filter_courses(queryset, params):
+    filters = parse_filters(params)
+    return queryset.filter(filters_q(filters)) if filters else queryset
+
+
+def dimension_values():
+    return {
+        'category': Course.CATEGORY_CHOICES,
+        'status': Course.STATUS_CHOICES,
+        'price': [(key, label) for key, label, _, _ in PRICE_BUCKETS],
+        'difficulty': Lesson.DIFFICULTY_CHOICES,
+    }
+
+
+def compute_facets(filters):
+    values = dimension_values()
+    aggregates = {}
+    for dim, choices in values.items():
+        others = filters_q(filters, exclude=dim)
+        for i, (value, _) in enumerate(choices):
+            aggregates[f'{dim}_{i}'] = Count('id', filter=others & value_q(dim, value))
+    counts = Course.objects.aggregate(**aggregates)
+
+    facets = {
+        dim: [
+            {'value': value, 'label': label, 'count': counts[f'{dim}_{i}']}
+            for i, (value, label) in enumerate(choices)
+        ]
+        for dim, choices in values.items()
+    }
+    instructors = (
+        Course.objects.filter(filters_q(filters, exclude='instructor'))
+        .values('instructor_id', 'instructor__full_name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'instructor_id')
+    )
+    facets['instructor'] = [
+        {'value': row['instructor_id'], 'label': row['instructor__full_name'], 'count': row['count']}
+        for row in instructors
+    ]
+    return facets
+
+
+def catalog_version():
+    return cache.get_or_set(VERSION_CACHE_KEY, 1, None)
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, None)
+
+
+def get_facets(params):
+    filters = parse_filters(params)
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    key = f'courses:facets:{catalog_version()}:{digest}'
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(filters)
+        cache.set(key, facets, FACET_TIMEOUT)
+    return facets
@@ -0,0 +1,75 @@
+"""
+Quiz grading engine.
+
+Har quiz ki answer key ek chhota dict ban kar cache mein rehti hai:
+{"quiz_id": 7, "passing_marks": 50, "answers": {"12": "A", "13": "C"}}.
+Timed exam mein sab students ek hi quiz submit karte hain, is liye submission
+Question rows ko haath nahi lagati: cache hit par grading sirf dict lookups hai
+aur DB par bas attempt ka ek INSERT. Question / Quiz save ya delete par key
+cache se hat jati hai (signals.py).
+"""
+from django.core.cache import cache
+
+from .models import Quiz, QuizAttempt
+
+KEY_TIMEOUT = 60 * 60 * 6
+
+
+def cache_key(lesson_id):
+    return f'courses:quiz:answer-key:{lesson_id}'
+
+
+def build_answer_key(lesson_id):
+    """Lesson ki quiz se answer key banana (quiz na ho to None). Ek JOIN + questions ki ek query."""
+    quiz = Quiz.objects.filter(lesson_id=lesson_id).only('id', 'passing_marks').first()
+    if quiz is None:
+        return None
+    answers = quiz.questions.order_by('id').values_list('id', 'correct_option')
+    return {
+        'quiz_id': quiz.pk,
+        'passing_marks': quiz.passing_marks,
+        'answers': {str(pk): (option or '').strip().upper() for pk, option in answers},
+    }
+
+
+def answer_key(lesson_id):
+    key = cache.get(cache_key(lesson_id))
+    if key is None:
+        key = build_answer_key(lesson_id)
+        if key is not None:
+            cache.set(cache_key(lesson_id), key, KEY_TIMEOUT)
+    return key
+
+
+def invalidate_answer_key(lesson_id):
+    if lesson_id is not None:
+        cache.delete(cache_key(lesson_id))
+
+
+def grade(key, submitted):
+    """
+    Submitted `{question_id: option}` ko answer key se check karna. Sirf quiz ke
+    apne questions ke answers rakhe jate hain (normalized, e.g. " b" -> "B").
+    """
+    answers = {}
+    for question_id, option in submitted.items():
+        question_id = str(question_id)
+        if question_id in key['answers'] and isinstance(option, str) and option.strip():
+            answers[question_id] = option.strip().upper()
+
+    total = len(key['answers'])
+    correct = sum(1 for question_id, option in answers.items() if key['answers'][question_id] == option)
+    score = correct / total * 100 if total else 0
+    return {
+        'answers': answers,
+        'total_questions': total,
+        'correct_answers': correct,
+        'score_percentage': round(score, 2),
+        'passed': score >= key['passing_marks'],
+    }
+
+
+def submit_attempt(user, key, submitted):
+    """Grade karke attempt save karna (ek INSERT)."""
+    result = grade(key, submitted)
+    return QuizAttempt.objects.create(user=user, quiz_id=key['quiz_id'], **result)
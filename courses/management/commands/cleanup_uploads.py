@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from courses.uploads import expire_sessions
+
+
+class Command(BaseCommand):
+    help = 'Adhoori chhori gayi upload sessions aur unki .part files saaf karta hai (cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.UPLOAD_SESSION_TTL_HOURS,
+                            help='Itne ghante se na chhui gayi sessions expire')
+
+    def handle(self, *args, **options):
+        expired, requeued = expire_sessions(timezone.now() - timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} upload sessions, re-queued {requeued}'))
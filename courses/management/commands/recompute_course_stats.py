@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from courses.stats import recompute
+
+
+class Command(BaseCommand):
+    help = 'CourseStats (enrollments, reviews, lessons) ko bulk aggregates se dobara ginta hai'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help='Sirf yeh courses (default: sab)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = recompute(options['course_ids'] or None, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Recomputed stats for {count} courses'))
@@ -0,0 +1,82 @@
+from django.db import migrations
+
+# SQL yahin rakha hai (courses.search import nahi): migration ko live code ke
+# baad ke badlav se farq nahi parna chahiye
+POSTGRES_INSTALL = [
+    "CREATE TABLE IF NOT EXISTS courses_course_search ("
+    " course_id bigint PRIMARY KEY REFERENCES courses_course(id) ON DELETE CASCADE,"
+    " document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS courses_course_search_gin ON courses_course_search USING GIN (document)",
+]
+POSTGRES_INDEX = (
+    "INSERT INTO courses_course_search (course_id, document) VALUES (%s,"
+    " setweight(to_tsvector('english', %s), 'A') ||"
+    " setweight(to_tsvector('english', %s), 'B') ||"
+    " setweight(to_tsvector('english', %s), 'B') ||"
+    " setweight(to_tsvector('english', %s), 'C'))"
+    " ON CONFLICT (course_id) DO UPDATE SET document = EXCLUDED.document"
+)
+POSTGRES_UNINSTALL = ["DROP TABLE IF EXISTS courses_course_search"]
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS courses_course_fts USING fts5("
+    "title, category, instructor, description,"
+    " tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS courses_course_fts_vocab USING fts5vocab(courses_course_fts, 'row')",
+]
+SQLITE_INDEX = (
+    "INSERT INTO courses_course_fts (rowid, title, category, instructor, description) VALUES (%s, %s, %s, %s, %s)"
+)
+SQLITE_UNINSTALL = [
+    "DROP TABLE IF EXISTS courses_course_fts_vocab",
+    "DROP TABLE IF EXISTS courses_course_fts",
+]
+
+SQL = {
+    'postgresql': (POSTGRES_INSTALL, POSTGRES_INDEX, POSTGRES_UNINSTALL),
+    'sqlite': (SQLITE_INSTALL, SQLITE_INDEX, SQLITE_UNINSTALL),
+}
+
+
+def document_rows(Course):
+    """courses.search.index_rows jaisa document: category ke saath uska label bhi."""
+    labels = dict(Course._meta.get_field('category').choices)
+    return [
+        (pk, title, f"{category} {labels.get(category, '')}", instructor or '', description)
+        for pk, title, category, instructor, description in Course.objects.values_list(
+            'id', 'title', 'category', 'instructor__full_name', 'description'
+        )
+    ]
+
+
+def install_search_index(apps, schema_editor):
+    sql = SQL.get(schema_editor.connection.vendor)
+    if sql is None:
+        return
+    install, index, _ = sql
+    rows = document_rows(apps.get_model('courses', 'Course'))
+    with schema_editor.connection.cursor() as cursor:
+        for statement in install:
+            cursor.execute(statement)
+        if rows:
+            cursor.executemany(index, rows)
+
+
+def uninstall_search_index(apps, schema_editor):
+    sql = SQL.get(schema_editor.connection.vendor)
+    if sql is None:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in sql[2]:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_course_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_course_stats(apps, schema_editor):
+    # Purane courses ke stats ek dafa grouped aggregates se gin lena
+    from decimal import Decimal
+    from django.db.models import Count, F, Q, Sum
+
+    Course = apps.get_model('courses', 'Course')
+    CourseStats = apps.get_model('courses', 'CourseStats')
+    Lesson = apps.get_model('courses', 'Lesson')
+    Review = apps.get_model('courses', 'Review')
+    EnrollmentCourse = apps.get_model('enrollments', 'EnrollmentCourse')
+
+    enrollments = {
+        row['course']: row for row in EnrollmentCourse.objects.values('course').annotate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='active')),
+            completed=Count('id', filter=Q(status='completed')),
+        )
+    }
+    reviews = {
+        row['course']: row for row in Review.objects.values('course').annotate(total=Count('id'), rating=Sum('rating'))
+    }
+    lessons = {
+        row['course']: row for row in Lesson.objects.values(course=F('week__module__course')).annotate(
+            total=Count('id'), duration=Sum('duration')
+        )
+    }
+    rows = []
+    for course_id in Course.objects.values_list('id', flat=True):
+        e, r, l = enrollments.get(course_id, {}), reviews.get(course_id, {}), lessons.get(course_id, {})
+        review_count, rating_sum = r.get('total', 0), r.get('rating') or 0
+        rows.append(CourseStats(
+            course_id=course_id,
+            enrollment_count=e.get('total', 0),
+            active_count=e.get('active', 0),
+            completed_count=e.get('completed', 0),
+            review_count=review_count,
+            rating_sum=rating_sum,
+            average_rating=round(Decimal(rating_sum) / review_count, 2) if review_count else Decimal('0'),
+            lesson_count=l.get('total', 0),
+            total_duration=l.get('duration') or 0,
+        ))
+    CourseStats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_course_search_index'),
+        ('enrollments', '0003_enrollmentcourse_enroll_student_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enrollment_count', models.PositiveIntegerField(default=0)),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('average_rating', models.DecimalField(decimal_places=2, default=0, max_digits=4)),
+                ('lesson_count', models.PositiveIntegerField(default=0)),
+                ('total_duration', models.PositiveIntegerField(default=0, help_text='Sum of lesson durations in minutes')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='courses.course')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-enrollment_count', '-course'], name='stats_popular_idx'), models.Index(fields=['-average_rating', '-course'], name='stats_rating_idx')],
+            },
+        ),
+        migrations.RunPython(populate_course_stats, migrations.RunPython.noop),
+    ]
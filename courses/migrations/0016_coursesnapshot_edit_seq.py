@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0015_lesson_bit_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursesnapshot',
+            name='edit_seq',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,41 @@
+
+from django.db import migrations
+
+
+def backfill_lesson_bits(apps, schema_editor):
+    # Pehle bits layout build par lazily milte the; ab lesson likhte waqt, is liye
+    # jin lessons ka bit nahi (ya kisi aur se takrata hai) unhe yahin dena
+    Course = apps.get_model('courses', 'Course')
+    Lesson = apps.get_model('courses', 'Lesson')
+    course_ids = set(
+        Lesson.objects.filter(bit_index__isnull=True).values_list('week__module__course_id', flat=True)
+    )
+    for course_id in sorted(course_ids):
+        allocated = Course.objects.filter(pk=course_id).values_list('lesson_bits_allocated', flat=True).first()
+        lessons = Lesson.objects.filter(week__module__course_id=course_id).order_by(
+            'week__module__order', 'week__module_id', 'week__order', 'week_id', 'order', 'id'
+        ).only('id', 'bit_index')
+        seen, pending = set(), []
+        for lesson in lessons:
+            if lesson.bit_index is None or lesson.bit_index in seen:
+                pending.append(lesson)
+            else:
+                seen.add(lesson.bit_index)
+        if not pending:
+            continue
+        start = max(allocated, max(seen, default=-1) + 1)
+        for offset, lesson in enumerate(pending):
+            lesson.bit_index = start + offset
+        Lesson.objects.bulk_update(pending, ['bit_index'], batch_size=500)
+        Course.objects.filter(pk=course_id).update(lesson_bits_allocated=start + len(pending))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0016_coursesnapshot_edit_seq'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_lesson_bits, migrations.RunPython.noop),
+    ]
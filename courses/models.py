@@ -1,9 +1,20 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from django.utils.text import slugify
+from core.tracking import TrackedFieldsMixin
 from profiles.models import InstructorProfile
 
-class Course(models.Model):
+class Course(TrackedFieldsMixin, models.Model):
+    # Thumbnail badle to hi derivatives (core/images.py); indexed text badle to hi search reindex
+    tracked_fields = ('thumbnail', 'title', 'category', 'description', 'instructor_id')
+    # Sirf queryset updates (F() counters, image worker) se badalte hain; stale instance
+    # ka full save inhe peeche na le jaye
+    managed_fields = ('content_version', 'updated_at', 'lesson_bits_allocated', 'thumbnail_variants')
+
     CATEGORY_CHOICES = [
         ('Military Tech', 'Military Technology'), #
         ('AI & Robotics', 'AI & Robotics'), #
@@ -21,6 +32,8 @@ class Course(models.Model):
     null=True,   # Purane courses ke liye null allow karega
     blank=True   # Form mein isey optional rakhega
 )
+    # Resized WebP/JPEG copies (core/images.py), upload ke baad background mein bharti hai
+    thumbnail_variants = models.JSONField(default=dict, blank=True, editable=False)
     category = models.CharField(
         max_length=50, 
         choices=CATEGORY_CHOICES, 
@@ -40,10 +53,28 @@ class Course(models.Model):
     published_at = models.DateTimeField(null=True, blank=True)
     approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='approved_courses')
     approval_notes = models.TextField(blank=True)
+    # Course ya uske curriculum ki kisi bhi table mein write par bump (courses/conditional.py);
+    # detail/player/lesson endpoints ke ETag / Last-Modified isi se bante hain
+    content_version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Lesson.bit_index ka counter: har naye lesson ko agla bit, purane bits dobara nahi bantte
+    lesson_bits_allocated = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        # Keyset pagination (created_at, id) ke liye
+        indexes = [models.Index(fields=['-created_at', '-id'], name='course_created_id_idx')]
+
+    # courses/urls.py ke fixed paths (router ke `<slug>/` se pehle match hote hain);
+    # in naamon wala slug kabhi detail page tak na pohanchta
+    RESERVED_SLUGS = frozenset({
+        'player', 'search', 'facets', 'uploads', 'create-full-course', 'my-workspace',
+    })
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title) # Auto-generate slug from title
+            if self.slug in self.RESERVED_SLUGS:
+                self.slug = f'{self.slug}-course'
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -70,7 +101,10 @@ class CourseSubModule(models.Model):
     class Meta:
         ordering = ['order']
 
-class Lesson(models.Model):
+class Lesson(TrackedFieldsMixin, models.Model):
+    # CourseStats (lesson count / duration) ke incremental update ke liye
+    tracked_fields = ('duration', 'week_id')
+
     CONTENT_TYPES = [
         ('Video', 'Video Lesson'),
         ('Image', 'Infographic/Image'),
@@ -115,6 +149,8 @@ class Lesson(models.Model):
     description = models.TextField(blank=True)
     content_file = models.FileField(upload_to='lesson_content/', blank=True, null=True)
     # additional rich content handled by Topic/SubTopic and LessonAsset models
+    # Course ke andar stable position: TrackProgress completion bitset ka bit (enrollments/progress.py)
+    bit_index = models.PositiveIntegerField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ['order']
@@ -132,9 +168,55 @@ class Question(models.Model):
     option_b = models.CharField(max_length=255)
     option_c = models.CharField(max_length=255)
     option_d = models.CharField(max_length=255)
-    correct_option = models.CharField(max_length=1) 
+    correct_option = models.CharField(max_length=1)
+
+class QuizAttempt(models.Model):
+    """Har submission ka record; grading courses/grading.py ki cached answer key se hoti hai."""
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='attempts')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='quiz_attempts')
+    answers = models.JSONField(default=dict, help_text="{question_id: selected option}")
+    total_questions = models.PositiveIntegerField()
+    correct_answers = models.PositiveIntegerField()
+    score_percentage = models.FloatField()
+    passed = models.BooleanField(default=False)
+    # QuestionStats mein jama ho chuka (courses/quiz_analytics.py)
+    counted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'quiz', '-created_at']),
+            models.Index(fields=['quiz', 'id'], condition=models.Q(counted=False), name='attempt_uncounted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.quiz} ({self.score_percentage}%)"
+
+class QuestionStats(models.Model):
+    """
+    Per-question running counters; attempts batches mein jorte hain. Score sums se
+    discrimination (point-biserial) bina purane answers scan kiye nikalta hai.
+    """
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name='stats')
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    chose_a = models.PositiveIntegerField(default=0)
+    chose_b = models.PositiveIntegerField(default=0)
+    chose_c = models.PositiveIntegerField(default=0)
+    chose_d = models.PositiveIntegerField(default=0)
+    # Attempt scores (0-1) ke sums: sab attempts, unka square, aur sirf sahi jawab walon ka
+    score_sum = models.FloatField(default=0)
+    score_sq_sum = models.FloatField(default=0)
+    correct_score_sum = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats: question {self.question_id}"
+
+class Review(TrackedFieldsMixin, models.Model):
+    tracked_fields = ('rating',)
 
-class Review(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='reviews')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     rating = models.IntegerField(default=5) 
@@ -197,4 +279,68 @@ class SubTopic(models.Model):
     order = models.PositiveIntegerField(default=0)
 
     class Meta:
-        ordering = ['order']
\ No newline at end of file
+        ordering = ['order']
+
+
+# Published course ka pehle se render kiya hua player payload (versioned JSON)
+class CourseSnapshot(models.Model):
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, related_name='snapshot')
+    version = models.PositiveIntegerField(default=0)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    is_stale = models.BooleanField(default=True)
+    built_at = models.DateTimeField(null=True, blank=True)
+    # Har edit par +1; rebuild sirf tab fresh mark karta hai jab render ke dauran koi edit na aaya ho
+    edit_seq = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Snapshot v{self.version}: {self.course.title}"
+
+
+# Denormalized per-course numbers (catalog cards, dashboards, popularity/rating sort)
+# Enrollment/Review/Lesson writes par incrementally update hote hain (courses/stats.py)
+class CourseStats(models.Model):
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, related_name='stats')
+    enrollment_count = models.PositiveIntegerField(default=0)
+    active_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    average_rating = models.DecimalField(max_digits=4, decimal_places=2, default=0)
+    lesson_count = models.PositiveIntegerField(default=0)
+    total_duration = models.PositiveIntegerField(default=0, help_text="Sum of lesson durations in minutes")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-enrollment_count', '-course'], name='stats_popular_idx'),
+            models.Index(fields=['-average_rating', '-course'], name='stats_rating_idx'),
+        ]
+
+    def __str__(self):
+        return f"Stats: {self.course.title}"
+
+
+# Resumable (chunked) upload: client chunks bhejta hai, file disk par jurti hai aur
+# commit ke baad background mein storage (Cloudinary / filesystem) par jati hai (courses/uploads.py)
+class UploadSession(models.Model):
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField(help_text="Total size in bytes")
+    offset = models.BigIntegerField(default=0, help_text="Bytes received so far")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    file = models.FileField(upload_to='uploads/', max_length=255, null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.status})"
@@ -0,0 +1,33 @@
+"""
+Instructor ownership checks.
+
+Pehle har view `topic.lesson.week.module.course.instructor.user` Python mein
+chalata tha (har hop ek lazy query). Yahan ownership WHERE clause mein JOIN se
+check hoti hai aur object apni parent chain (course tak) ke saath ek hi query
+mein aata hai. Na mile ya kisi aur ka ho, dono surat mein 404.
+"""
+from rest_framework.exceptions import NotFound
+
+from .curriculum import COURSE_LOOKUPS
+from .models import Course
+
+
+def course_path(model):
+    """Model se Course tak ka ORM rasta ('' agar model khud Course hai)."""
+    return '' if model is Course else COURSE_LOOKUPS[model]
+
+
+def owned_by(model, user):
+    """`model` ki sirf woh rows jo `user` ke courses ki hain, parent chain select_related ke saath."""
+    path = course_path(model)
+    prefix = f'{path}__' if path else ''
+    queryset = model.objects.filter(**{f'{prefix}instructor__user_id': user.pk})
+    return queryset.select_related(path) if path else queryset
+
+
+def get_owned_or_404(model, user, **lookup):
+    # Pehle wala response hi: {"detail": "Not found."}, taake ownership leak na ho
+    try:
+        return owned_by(model, user).get(**lookup)
+    except model.DoesNotExist:
+        raise NotFound()
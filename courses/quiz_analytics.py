@@ -0,0 +1,182 @@
+"""
+Per-question quiz analytics (incremental).
+
+Grade hui attempts `counted=False` ke saath save hoti hain. Background fold unhe
+batches mein uthata hai, Python mein har question ke deltas jorta hai aur har
+question ke QuestionStats row par ek F() UPDATE karta hai. Is tarah 500 attempts
+ka batch quiz ke har question par sirf ek write banta hai. Analytics endpoint
+counters hi parhta hai, purane answers kabhi scan nahi hote; pending attempts hon
+to woh fold sirf queue karta hai, khud nahi chalata.
+
+Fold (sahi / ghalat) us waqt ki answer key se hota hai, attempt ke waqt wali se nahi:
+agar instructor ne kisi question ka correct option badla to pehle ki uncounted
+attempts ka `correct` unke stored `score_percentage` se mukhtalif ho sakta hai, aur
+pehle se counted attempts dobara nahi ginti. Key badalne ke baad bilkul durust
+numbers chahiye hon to us question ki QuestionStats row reset karke attempts
+`counted=False` kar dein.
+
+Difficulty index = sahi jawab ka hissa (p). Discrimination = point-biserial
+correlation (question sahi / ghalat vs attempt ka score), jo score ke sums se
+nikalta hai.
+"""
+import math
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from core.tasks import run_in_background
+
+from .grading import answer_key
+from .models import Question, QuestionStats, Quiz, QuizAttempt
+
+FOLD_BATCH_SIZE = 500
+LOCK_TIMEOUT = 60 * 5
+OPTIONS = ('A', 'B', 'C', 'D')
+COUNTER_FIELDS = ['attempts', 'correct', 'chose_a', 'chose_b', 'chose_c', 'chose_d',
+                  'score_sum', 'score_sq_sum', 'correct_score_sum']
+
+
+def lock_key(quiz_id):
+    return f'courses:quiz:{quiz_id}:fold-lock'
+
+
+def scheduled_key(quiz_id):
+    return f'courses:quiz:{quiz_id}:fold-scheduled'
+
+
+def schedule_fold(key):
+    """Submit ke baad: quiz ka fold pehle se queued na ho to background mein daalna."""
+    queue_fold(key['quiz_id'])
+
+
+def queue_fold(quiz_id):
+    if cache.add(scheduled_key(quiz_id), 1, LOCK_TIMEOUT):
+        run_in_background(fold_pending, quiz_id)
+
+
+def batch_deltas(attempts, correct_options):
+    """Attempts ke batch se {question_id: {counter: delta}}; na diya gaya answer ghalat ginta hai."""
+    deltas = {}
+    for answers, score_percentage in attempts:
+        score = score_percentage / 100
+        for question_id, correct_option in correct_options.items():
+            row = deltas.setdefault(int(question_id), dict.fromkeys(COUNTER_FIELDS, 0))
+            selected = answers.get(question_id)
+            row['attempts'] += 1
+            row['score_sum'] += score
+            row['score_sq_sum'] += score * score
+            if selected in OPTIONS:
+                row[f'chose_{selected.lower()}'] += 1
+            if selected == correct_option:
+                row['correct'] += 1
+                row['correct_score_sum'] += score
+    return deltas
+
+
+class BatchRaced(Exception):
+    """Select ke baad kuch attempts kisi aur worker ne counted kar di."""
+
+
+def fold_batch(quiz_id, correct_options, batch_size=FOLD_BATCH_SIZE):
+    """
+    Ek batch uncounted attempts ko counters mein jorna. Jitni attempts jori gayi unki tadaad return.
+
+    Rows `select_for_update(skip_locked=True)` se claim hoti hain (doosra worker unhe chhor
+    kar agli rows leta hai); jis DB par row locks nahi, wahan `counted` flip ki ginti
+    select se na mile to batch rollback karke dobara. Is liye cache lock expire ho
+    jaye ya per-process ho, counters phir bhi double nahi hote.
+    """
+    while True:
+        try:
+            with transaction.atomic():
+                rows = list(
+                    QuizAttempt.objects.select_for_update(skip_locked=True)
+                    .filter(quiz_id=quiz_id, counted=False)
+                    .order_by('id').values_list('id', 'answers', 'score_percentage')[:batch_size]
+                )
+                if not rows:
+                    return 0
+                flipped = QuizAttempt.objects.filter(
+                    pk__in=[pk for pk, _, _ in rows], counted=False
+                ).update(counted=True)
+                if flipped != len(rows):
+                    raise BatchRaced
+
+                deltas = batch_deltas([(answers, score) for _, answers, score in rows], correct_options)
+                QuestionStats.objects.bulk_create(
+                    [QuestionStats(question_id=pk) for pk in deltas], ignore_conflicts=True
+                )
+                for question_id, row in deltas.items():
+                    QuestionStats.objects.filter(question_id=question_id).update(
+                        **{name: F(name) + value for name, value in row.items() if value}
+                    )
+            return len(rows)
+        except BatchRaced:
+            continue
+
+
+def fold_pending(quiz_id, batch_size=FOLD_BATCH_SIZE):
+    """
+    Quiz ki saari uncounted attempts fold karna. Ek waqt mein ek hi worker (cache lock);
+    lock chhorne ke baad beech mein aayi attempts ke liye dobara check hota hai.
+    """
+    cache.delete(scheduled_key(quiz_id))
+    lesson_id = None
+    total = 0
+    while QuizAttempt.objects.filter(quiz_id=quiz_id, counted=False).exists():
+        if not cache.add(lock_key(quiz_id), 1, LOCK_TIMEOUT):
+            return total  # doosra worker yahi kaam kar raha hai
+        try:
+            if lesson_id is None:
+                lesson_id = Quiz.objects.filter(pk=quiz_id).values_list('lesson_id', flat=True).first()
+            key = answer_key(lesson_id)
+            if key is None:
+                return total
+            folded_this_pass = 0
+            while True:
+                folded = fold_batch(quiz_id, key['answers'], batch_size)
+                folded_this_pass += folded
+                if folded < batch_size:
+                    break
+        finally:
+            cache.delete(lock_key(quiz_id))
+        total += folded_this_pass
+        if not folded_this_pass:
+            return total  # baqi rows doosre worker ke lock mein hain
+    return total
+
+
+def question_metrics(stats):
+    """Counters se difficulty (p) aur discrimination (point-biserial r); data kam ho to None."""
+    n, correct = stats.attempts, stats.correct
+    if not n:
+        return None, None
+    p = correct / n
+    variance = stats.score_sq_sum / n - (stats.score_sum / n) ** 2
+    if correct in (0, n) or variance <= 1e-12:
+        return round(p, 4), None
+    mean_correct = stats.correct_score_sum / correct
+    mean_wrong = (stats.score_sum - stats.correct_score_sum) / (n - correct)
+    r = (mean_correct - mean_wrong) / math.sqrt(variance) * math.sqrt(p * (1 - p))
+    return round(p, 4), round(r, 4)
+
+
+def quiz_analytics(quiz):
+    """Quiz ke har question ki analytics (order: question id)."""
+    questions = Question.objects.filter(quiz=quiz).select_related('stats').order_by('id')
+    results = []
+    for question in questions:
+        stats = getattr(question, 'stats', None) or QuestionStats(question=question)
+        difficulty, discrimination = question_metrics(stats)
+        results.append({
+            'id': question.pk,
+            'text': question.text,
+            'correct_option': (question.correct_option or '').strip().upper(),
+            'attempts': stats.attempts,
+            'correct': stats.correct,
+            'options': {option: getattr(stats, f'chose_{option.lower()}') for option in OPTIONS},
+            'difficulty': difficulty,
+            'discrimination': discrimination,
+        })
+    return results
@@ -0,0 +1,203 @@
+"""
+Course full-text search index.
+
+Production (PostgreSQL): `courses_course_search` side table, weighted tsvector + GIN index.
+Local (SQLite): `courses_course_fts` FTS5 virtual table (porter stemming, prefix index).
+
+Index Course ke save/delete par incrementally update hota hai (courses/signals.py),
+sirf jab indexed text (INDEXED_FIELDS, instructor ka naam) badle; vocabulary cache
+bhi sirf tabhi girta hai.
+Typo tolerance ke liye har query term index ki vocabulary ke qareebi terms
+(difflib) ke saath OR ho jata hai, aur har term prefix match hota hai.
+"""
+import difflib
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+
+from .models import Course
+
+VOCABULARY_CACHE_KEY = 'courses:search:vocabulary'
+VOCABULARY_TIMEOUT = 60 * 10
+MAX_TERMS = 8
+# Course ki woh fields jo index mein jati hain (tracked_fields mein bhi)
+INDEXED_FIELDS = {'title', 'category', 'description', 'instructor_id'}
+# Index har course ka hai, lekin search sirf catalog (published) courses lautati hai
+SEARCHABLE_STATUS = 'published'
+
+
+class PostgresSearchBackend:
+    table = 'courses_course_search'
+
+    def install(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            " course_id bigint PRIMARY KEY REFERENCES courses_course(id) ON DELETE CASCADE,"
+            " document tsvector NOT NULL)"
+        )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_gin ON {self.table} USING GIN (document)")
+
+    def uninstall(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def index(self, cursor, rows):
+        for pk, title, category, instructor, description in rows:
+            cursor.execute(
+                f"INSERT INTO {self.table} (course_id, document) VALUES (%s,"
+                " setweight(to_tsvector('english', %s), 'A') ||"
+                " setweight(to_tsvector('english', %s), 'B') ||"
+                " setweight(to_tsvector('english', %s), 'B') ||"
+                " setweight(to_tsvector('english', %s), 'C'))"
+                " ON CONFLICT (course_id) DO UPDATE SET document = EXCLUDED.document",
+                [pk, title, category, instructor, description],
+            )
+
+    def remove(self, cursor, ids):
+        cursor.execute(f"DELETE FROM {self.table} WHERE course_id = ANY(%s)", [list(ids)])
+
+    def search(self, cursor, groups, limit):
+        query = ' & '.join('(' + ' | '.join(f'{t}:*' for t in group) + ')' for group in groups)
+        cursor.execute(
+            f"SELECT course_id, ts_rank_cd(document, q) AS rank"
+            f" FROM {self.table} JOIN courses_course ON courses_course.id = course_id,"
+            " to_tsquery('english', %s) q"
+            " WHERE document @@ q AND courses_course.status = %s"
+            " ORDER BY rank DESC, course_id DESC LIMIT %s",
+            [query, SEARCHABLE_STATUS, limit],
+        )
+        return cursor.fetchall()
+
+    def vocabulary(self, cursor):
+        cursor.execute(f"SELECT word FROM ts_stat('SELECT document FROM {self.table}')")
+        return [row[0] for row in cursor.fetchall()]
+
+
+class SqliteSearchBackend:
+    table = 'courses_course_fts'
+    vocab_table = 'courses_course_fts_vocab'
+
+    def install(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            "title, category, instructor, description,"
+            " tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.vocab_table} USING fts5vocab({self.table}, 'row')"
+        )
+
+    def uninstall(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.vocab_table}")
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def index(self, cursor, rows):
+        rows = list(rows)
+        self.remove(cursor, [row[0] for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {self.table} (rowid, title, category, instructor, description) VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+    def remove(self, cursor, ids):
+        cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [[pk] for pk in ids])
+
+    def search(self, cursor, groups, limit):
+        query = ' AND '.join('(' + ' OR '.join(f'"{t}"*' for t in group) + ')' for group in groups)
+        # bm25 chhota = behtar; column weights: title, category, instructor, description
+        cursor.execute(
+            f"SELECT {self.table}.rowid, -bm25({self.table}, 10.0, 4.0, 4.0, 1.0) AS rank FROM {self.table}"
+            f" JOIN courses_course ON courses_course.id = {self.table}.rowid"
+            f" WHERE {self.table} MATCH %s AND courses_course.status = %s"
+            f" ORDER BY rank DESC, {self.table}.rowid DESC LIMIT %s",
+            [query, SEARCHABLE_STATUS, limit],
+        )
+        return cursor.fetchall()
+
+    def vocabulary(self, cursor):
+        cursor.execute(f"SELECT term FROM {self.vocab_table}")
+        return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend(),
+    'sqlite': SqliteSearchBackend(),
+}
+
+
+def get_backend(conn=None):
+    return BACKENDS.get((conn or connection).vendor)
+
+
+def index_rows(queryset):
+    """Index ke liye rows: (id, title, category, instructor name, description)."""
+    labels = dict(Course.CATEGORY_CHOICES)
+    for pk, title, category, instructor, description in queryset.values_list(
+        'id', 'title', 'category', 'instructor__full_name', 'description'
+    ):
+        # Category ka label bhi ("Web Development (MERN)") searchable ho
+        yield pk, title, f"{category} {labels.get(category, '')}", instructor or '', description
+
+
+def index_courses(ids):
+    backend = get_backend()
+    if backend is None or not ids:
+        return
+    with connection.cursor() as cursor:
+        backend.index(cursor, list(index_rows(Course.objects.filter(pk__in=ids))))
+    cache.delete(VOCABULARY_CACHE_KEY)
+
+
+def remove_courses(ids):
+    backend = get_backend()
+    if backend is None or not ids:
+        return
+    with connection.cursor() as cursor:
+        backend.remove(cursor, ids)
+    cache.delete(VOCABULARY_CACHE_KEY)
+
+
+def rebuild_index(batch_size=500):
+    """Poora index dobara banana (management command)."""
+    ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), batch_size):
+        index_courses(ids[start:start + batch_size])
+    return len(ids)
+
+
+def vocabulary():
+    terms = cache.get(VOCABULARY_CACHE_KEY)
+    if terms is None:
+        with connection.cursor() as cursor:
+            terms = get_backend().vocabulary(cursor)
+        cache.set(VOCABULARY_CACHE_KEY, terms, VOCABULARY_TIMEOUT)
+    return terms
+
+
+def expand_terms(terms):
+    """Har term ke saath index ke qareebi (typo) terms, taake 'machne' bhi 'machine' dhoond le."""
+    vocab = vocabulary()
+    groups = []
+    for term in terms:
+        group = [term]
+        if len(term) >= 4:
+            candidates = [v for v in vocab if v[:1] == term[:1]]
+            group += [v for v in difflib.get_close_matches(term, candidates, n=3, cutoff=0.75) if v != term]
+        groups.append(group)
+    return groups
+
+
+def search_courses(query, limit=20):
+    """Published courses ki ranked `(course_id, rank)` list. Backend na ho to title/description LIKE fallback."""
+    terms = re.findall(r'\w+', query.lower())[:MAX_TERMS]
+    if not terms:
+        return []
+    backend = get_backend()
+    if backend is None:
+        qs = Course.objects.filter(status=SEARCHABLE_STATUS)
+        for term in terms:
+            qs = qs.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return [(pk, 0.0) for pk in qs.order_by('-created_at').values_list('id', flat=True)[:limit]]
+    with connection.cursor() as cursor:
+        return backend.search(cursor, expand_terms(terms), limit)
@@ -1,9 +1,17 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
+from core.images import srcset
 from .models import (
     Course, CourseModule, CourseSubModule, 
     Lesson, Quiz, Question, Review, CourseInstructor,
-    ModuleAsset, SubModuleAsset, LessonAsset, Topic, SubTopic
+    ModuleAsset, SubModuleAsset, LessonAsset, Topic, SubTopic, CourseStats, UploadSession
 )
+from .curriculum import create_curriculum, load_curriculum, sync_curriculum
+from .conditional import bump_content_version
+from .facets import bump_catalog_version
+from .stats import adjust as adjust_stats, recompute as recompute_stats
+from .uploads import StagedUploadMixin
 
 # ==========================================
 # 1. BOTTOM LAYER (Assets, Topics, Quizzes)
@@ -42,24 +50,31 @@ class QuizDetailSerializer(serializers.ModelSerializer):
 
 # 3. Result Dikhane ke liye
 class QuizResultSerializer(serializers.Serializer):
+    attempt_id = serializers.IntegerField()
     total_questions = serializers.IntegerField()
     correct_answers = serializers.IntegerField()
     score_percentage = serializers.FloatField()
     passed = serializers.BooleanField()
     message = serializers.CharField()
 
-class LessonAssetSerializer(serializers.ModelSerializer):
-    file = serializers.FileField(required=True)
+class LessonAssetSerializer(StagedUploadMixin, serializers.ModelSerializer):
+    # `file` ya resumable upload ki `upload_key` (courses/uploads.py), dono mein se ek
+    file = serializers.FileField(required=False)
+    upload_key = serializers.UUIDField(write_only=True, required=False)
     class Meta:
         model = LessonAsset
-        fields = ['id', 'lesson', 'file', 'file_type', 'caption', 'uploaded_at']
+        fields = ['id', 'lesson', 'file', 'upload_key', 'file_type', 'caption', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
-class SubTopicSerializer(serializers.ModelSerializer):
+class SubTopicSerializer(StagedUploadMixin, serializers.ModelSerializer):
+    upload_target = 'resource_file'
+    upload_required = False
+
     resource_file = serializers.FileField(required=False, allow_null=True)
+    upload_key = serializers.UUIDField(write_only=True, required=False)
     class Meta:
         model = SubTopic
-        fields = ['id', 'topic', 'title', 'description', 'video_url', 'resource_file', 'order']
+        fields = ['id', 'topic', 'title', 'description', 'video_url', 'resource_file', 'upload_key', 'order']
         read_only_fields = ['id']
 
 class TopicSerializer(serializers.ModelSerializer):
@@ -69,18 +84,20 @@ class TopicSerializer(serializers.ModelSerializer):
         fields = ['id', 'lesson', 'title', 'description', 'order', 'subtopics']
         read_only_fields = ['id']
 
-class ModuleAssetSerializer(serializers.ModelSerializer):
-    file = serializers.FileField(required=True)
+class ModuleAssetSerializer(StagedUploadMixin, serializers.ModelSerializer):
+    file = serializers.FileField(required=False)
+    upload_key = serializers.UUIDField(write_only=True, required=False)
     class Meta:
         model = ModuleAsset
-        fields = ['id', 'module', 'file', 'caption', 'uploaded_at']
+        fields = ['id', 'module', 'file', 'upload_key', 'caption', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
-class SubModuleAssetSerializer(serializers.ModelSerializer):
-    file = serializers.FileField(required=True)
+class SubModuleAssetSerializer(StagedUploadMixin, serializers.ModelSerializer):
+    file = serializers.FileField(required=False)
+    upload_key = serializers.UUIDField(write_only=True, required=False)
     class Meta:
         model = SubModuleAsset
-        fields = ['id', 'submodule', 'file', 'caption', 'uploaded_at']
+        fields = ['id', 'submodule', 'file', 'upload_key', 'caption', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -97,11 +114,27 @@ class CourseInstructorSerializer(serializers.ModelSerializer):
         fields = ['instructor_name', 'instructor_photo', 'role']
 
 
+class CurriculumNodeMixin:
+    """
+    Nested (course tree ke andar) hone par client ki bheji `id` validated data mein
+    rakhna, taake sync_curriculum existing row pehchan sake. Standalone use mein
+    `id` pehle ki tarah read-only rehti hai.
+    """
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        if self.parent is not None and data.get('id') not in (None, ''):
+            try:
+                value['id'] = int(data['id'])
+            except (TypeError, ValueError):
+                raise serializers.ValidationError({'id': ['A valid integer is required.']})
+        return value
+
+
 # ==========================================
 # 2. CONTENT LAYER (Lesson)
 # ==========================================
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(CurriculumNodeMixin, serializers.ModelSerializer):
     quiz = QuizSerializer(read_only=True)
     assets = LessonAssetSerializer(many=True, read_only=True) # Ab yeh upar define hai, error nahi dega
     topics = TopicSerializer(many=True, read_only=True)       # Yeh bhi upar define hai
@@ -125,8 +158,9 @@ class LessonSerializer(serializers.ModelSerializer):
 # 3. SUB-MODULE LAYER (Weeks)
 # ==========================================
 
-class WeekSerializer(serializers.ModelSerializer):
-    lessons = LessonSerializer(many=True, read_only=True) # Uses LessonSerializer defined above
+class WeekSerializer(CurriculumNodeMixin, serializers.ModelSerializer):
+    # Writable sirf nested course create/update ke liye (curriculum.py bulk mein likhta hai)
+    lessons = LessonSerializer(many=True, required=False) # Uses LessonSerializer defined above
     assets = SubModuleAssetSerializer(many=True, read_only=True)
 
     class Meta:
@@ -139,8 +173,8 @@ class WeekSerializer(serializers.ModelSerializer):
 
 # Maine iska naam 'MonthSerializer' se change karke 'ModuleSerializer' kar diya hai
 # taake CourseSerializer isay pehchan sake.
-class ModuleSerializer(serializers.ModelSerializer):
-    weeks = WeekSerializer(many=True, read_only=True) # Uses WeekSerializer defined above
+class ModuleSerializer(CurriculumNodeMixin, serializers.ModelSerializer):
+    weeks = WeekSerializer(many=True, required=False) # Uses WeekSerializer defined above
     assets = ModuleAssetSerializer(many=True, read_only=True)
 
     class Meta:
@@ -148,19 +182,64 @@ class ModuleSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'order', 'description', 'weeks', 'assets']
 
 # ==========================================
-# 5. MAIN COURSE LAYER
+# 5. CATALOG CARD (List view ke liye halka payload)
+# ==========================================
+
+class CourseStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CourseStats
+        fields = [
+            'enrollment_count', 'active_count', 'completed_count', 'review_count',
+            'average_rating', 'lesson_count', 'total_duration'
+        ]
+
+
+class CourseListSerializer(serializers.ModelSerializer):
+    # Catalog tile ko poora curriculum nahi chahiye, sirf card ki fields
+    instructor_name = serializers.ReadOnlyField(source='instructor.full_name')
+    # Denormalized CourseStats se (select_related('stats')), koi COUNT nahi
+    lesson_count = serializers.ReadOnlyField(source='stats.lesson_count')
+    enrollment_count = serializers.ReadOnlyField(source='stats.enrollment_count')
+    review_count = serializers.ReadOnlyField(source='stats.review_count')
+    average_rating = serializers.DecimalField(
+        source='stats.average_rating', max_digits=4, decimal_places=2, read_only=True
+    )
+    total_duration = serializers.ReadOnlyField(source='stats.total_duration')
+    # 300px tiles ke liye resized WebP/JPEG (core/images.py)
+    thumbnail_srcset = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Course
+        fields = [
+            'id', 'title', 'slug', 'thumbnail', 'thumbnail_srcset', 'category', 'price',
+            'status', 'created_at', 'instructor_name', 'lesson_count',
+            'enrollment_count', 'review_count', 'average_rating', 'total_duration'
+        ]
+        read_only_fields = fields
+
+    def get_thumbnail_srcset(self, obj):
+        return srcset(obj.thumbnail_variants)
+
+# ==========================================
+# 6. MAIN COURSE LAYER
 # ==========================================
 
 class CourseSerializer(serializers.ModelSerializer):
     # Ab 'ModuleSerializer' define ho chuka hai, error nahi aayega
     modules = ModuleSerializer(many=True, required=False)
+    thumbnail_srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Course
-        fields = '__all__'
+        # Raw variant names ki jagah `thumbnail_srcset`
+        exclude = ['thumbnail_variants', 'lesson_bits_allocated']
         read_only_fields = ['slug', 'created_at', 'instructor']
 
+    def get_thumbnail_srcset(self, obj):
+        return srcset(obj.thumbnail_variants)
+
     # --- CREATE LOGIC ---
+    @transaction.atomic
     def create(self, validated_data):
         modules_data = validated_data.pop('modules', [])
         
@@ -170,23 +249,21 @@ class CourseSerializer(serializers.ModelSerializer):
 
         course = Course.objects.create(**validated_data)
 
-        # Nested Creation Logic
-        for module_data in modules_data:
-            weeks_data = module_data.pop('weeks', [])
-            module = CourseModule.objects.create(course=course, **module_data)
-
-            for week_data in weeks_data:
-                lessons_data = week_data.pop('lessons', [])
-                week = CourseSubModule.objects.create(module=module, **week_data)
-
-                for lesson_data in lessons_data:
-                    lesson_data.pop('temp_video_key', None)
-                    lesson_data.pop('temp_doc_key', None)
-                    Lesson.objects.create(sub_module=week, **lesson_data)
-        
+        # Nested Creation Logic: har level ek bulk INSERT, sab ek transaction mein
+        self.created_ids, lessons = create_curriculum(course, modules_data, request=request)
+        if lessons:
+            # bulk_create signals nahi chalata, is liye stats/facets khud update
+            adjust_stats(
+                course.pk, lesson_count=len(lessons),
+                total_duration=sum(l.duration or 0 for l in lessons)
+            )
+            bump_catalog_version()
+        # Response ke liye tree fixed queries mein wapis load
+        load_curriculum(course)
         return course
 
     # --- UPDATE LOGIC ---
+    @transaction.atomic
     def update(self, instance, validated_data):
         instance.title = validated_data.get('title', instance.title)
         instance.description = validated_data.get('description', instance.description)
@@ -195,4 +272,43 @@ class CourseSerializer(serializers.ModelSerializer):
         if validated_data.get('thumbnail'):
             instance.thumbnail = validated_data.get('thumbnail')
         instance.save()
+
+        # `modules` aaye to poora curriculum desired tree ke mutabiq diff karke sync
+        if 'modules' in validated_data:
+            self.curriculum_changes = sync_curriculum(
+                instance, validated_data['modules'], request=self.context.get('request')
+            )
+            if any(any(counts.values()) for counts in self.curriculum_changes.values()):
+                from .snapshots import mark_stale  # snapshots khud serializers import karta hai
+                # bulk writes / sync ke deletes per-row signals nahi chalate, is liye stats/snapshot/facets/version khud
+                recompute_stats([instance.pk])
+                mark_stale(instance.pk)
+                bump_catalog_version()
+                bump_content_version(instance.pk)
+            instance._prefetched_objects_cache = {}
+            load_curriculum(instance)
         return instance
+
+
+class WorkspaceCourseSerializer(CourseSerializer):
+    # Instructor dashboard ke liye poore course ke saath stats bhi
+    stats = CourseStatsSerializer(read_only=True)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'content_type', 'size', 'offset', 'status', 'file', 'error',
+                  'chunk_size', 'created_at']
+        read_only_fields = ['id', 'offset', 'status', 'file', 'error', 'created_at']
+
+    def get_chunk_size(self, obj):
+        # Client ko batana ke ek PATCH mein zyada se zyada kitne bytes bhejein
+        return settings.UPLOAD_CHUNK_MAX_SIZE
+
+    def validate_size(self, value):
+        if value <= 0 or value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f'Size must be between 1 and {settings.UPLOAD_MAX_SIZE} bytes.')
+        return value
@@ -1,14 +1,190 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
-from notifications.models import Notification
-from .models import Course
+from core.images import schedule_derivatives
+from core.tasks import run_in_background
+from notifications.outbox import notify
+from profiles.models import InstructorProfile
+from .models import Course, CourseStats, CourseSubModule, Lesson, Quiz, Question, Review
+from .curriculum import COURSE_LOOKUPS, allocate_lesson_bits, course_id_for, syncing
+from .snapshots import mark_stale
+from .conditional import bump_content_version
+from . import search
+from .facets import bump_catalog_version
+from . import stats
+from .grading import invalidate_answer_key
 
 @receiver(post_save, sender=Course)
 def create_course_creation_notification(sender, instance, created, **kwargs):
     if created:
-        Notification.objects.create(
-            user=instance.instructor.user,  # ✅ FIX HERE
+        notify(
+            instance.instructor.user_id,
             title='New Course Created',
             message=f'You have successfully created a new course: "{instance.title}".',
             notification_type='Course_Creation'
         )
+
+
+# --- Denormalized CourseStats (incremental counters) ---
+@receiver(post_save, sender=Course)
+def create_course_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        CourseStats.objects.create(course=instance)
+
+
+@receiver(pre_delete, sender=Course)
+def mark_course_deleting(sender, instance, **kwargs):
+    # Collector saare pre_delete pehle bhejta hai aur Course (parent) aakhir mein delete
+    # hota hai, is liye cascade ke lesson / review / enrollment receivers adjust skip karte hain
+    stats.mark_deleting(instance.pk)
+
+
+@receiver(post_delete, sender=Course)
+def unmark_course_deleting(sender, instance, **kwargs):
+    stats.unmark_deleting(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+def count_review(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.adjust(instance.course_id, review_count=1, rating_sum=instance.rating)
+    elif 'rating' in instance.changed_fields():
+        stats.adjust(instance.course_id, rating_sum=instance.rating - (instance.loaded_value('rating') or 0))
+
+
+@receiver(post_delete, sender=Review)
+def uncount_review(sender, instance, **kwargs):
+    stats.adjust(instance.course_id, review_count=-1, rating_sum=-instance.rating)
+
+
+@receiver(pre_save, sender=Lesson)
+def assign_lesson_bit(sender, instance, raw=False, **kwargs):
+    # Akele bane lesson ka bit insert ke saath (bulk paths curriculum.py mein khud dete hain)
+    if not raw and instance.bit_index is None:
+        allocate_lesson_bits(course_id_for(instance), [instance])
+
+
+@receiver(post_save, sender=Lesson)
+def count_lesson(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    duration = instance.duration or 0
+    if created:
+        stats.adjust(course_id_for(instance), lesson_count=1, total_duration=duration)
+        return
+    changed = instance.changed_fields()
+    if 'week_id' in changed:
+        # Lesson dusre week (shayad dusre course) mein move hua
+        old_course = CourseSubModule.objects.filter(
+            pk=instance.loaded_value('week_id')
+        ).values_list('module__course', flat=True).first()
+        new_course = course_id_for(instance)
+        if old_course != new_course:
+            stats.adjust(old_course, lesson_count=-1, total_duration=-(instance.loaded_value('duration') or 0))
+            stats.adjust(new_course, lesson_count=1, total_duration=duration)
+            # Purana bit dusre course ka tha: naye course mein woh kisi deleted lesson ka ho
+            # sakta hai jo students complete kar chuke, is liye naye course ka naya bit
+            allocate_lesson_bits(new_course, [instance])
+            Lesson.objects.filter(pk=instance.pk).update(bit_index=instance.bit_index)
+            return
+    if 'duration' in changed:
+        stats.adjust(course_id_for(instance), total_duration=duration - (instance.loaded_value('duration') or 0))
+
+
+@receiver(post_delete, sender=Lesson)
+def uncount_lesson(sender, instance, **kwargs):
+    if syncing():
+        return  # sync_curriculum ke baad ek recompute
+    stats.adjust(course_id_for(instance), lesson_count=-1, total_duration=-(instance.duration or 0))
+
+
+# --- Full-text search index (incremental) ---
+@receiver(post_save, sender=Course)
+def index_course_for_search(sender, instance, created=False, raw=False, **kwargs):
+    # Status / price / counters jaisi saves index aur vocabulary cache ko haath nahi lagati
+    if not raw and (created or instance.changed_fields() & search.INDEXED_FIELDS):
+        search.index_courses([instance.pk])
+
+
+@receiver(post_delete, sender=Course)
+def remove_course_from_search(sender, instance, **kwargs):
+    search.remove_courses([instance.pk])
+
+
+@receiver(post_save, sender=InstructorProfile)
+def reindex_instructor_courses(sender, instance, created, raw=False, **kwargs):
+    # Instructor ka naam bhi index mein hai, uske courses background mein reindex
+    if created or raw or 'full_name' not in instance.changed_fields():
+        return
+    ids = list(Course.objects.filter(instructor=instance).values_list('id', flat=True))
+    if ids:
+        run_in_background(search.index_courses, ids)
+
+
+# --- Catalog facet cache ---
+# Course (category/status/price/instructor) ya Lesson (difficulty) badle to facets purane
+def invalidate_catalog_facets(sender, raw=False, **kwargs):
+    if not raw and not syncing():
+        bump_catalog_version()
+
+
+for _model in (Course, Lesson):
+    post_save.connect(invalidate_catalog_facets, sender=_model, dispatch_uid=f'facets_save_{_model.__name__}')
+    post_delete.connect(invalidate_catalog_facets, sender=_model, dispatch_uid=f'facets_delete_{_model.__name__}')
+
+
+# --- Published snapshot invalidation ---
+# Course ya uske curriculum ki kisi bhi table mein edit -> snapshot stale
+def invalidate_course_snapshot(sender, instance, raw=False, **kwargs):
+    if raw or syncing():
+        return  # loaddata fixtures
+    mark_stale(course_id_for(instance))
+
+
+for _model in (Course, *COURSE_LOOKUPS):
+    post_save.connect(invalidate_course_snapshot, sender=_model, dispatch_uid=f'snapshot_save_{_model.__name__}')
+    post_delete.connect(invalidate_course_snapshot, sender=_model, dispatch_uid=f'snapshot_delete_{_model.__name__}')
+
+
+# --- Content version (ETag / Last-Modified) ---
+def bump_course_version(sender, instance, raw=False, **kwargs):
+    if raw or syncing() or (sender is Course and kwargs.get('created')):
+        return  # naya course version 1 se shuru hota hai
+    bump_content_version(course_id_for(instance))
+
+
+for _model in (Course, *COURSE_LOOKUPS):
+    post_save.connect(bump_course_version, sender=_model, dispatch_uid=f'version_save_{_model.__name__}')
+for _model in COURSE_LOOKUPS:
+    post_delete.connect(bump_course_version, sender=_model, dispatch_uid=f'version_delete_{_model.__name__}')
+
+
+# --- Thumbnail derivatives (core/images.py) ---
+def course_images_ready(course_id):
+    # srcset course payload ka hissa hai: ETag aur snapshot dono refresh
+    bump_content_version(course_id)
+    mark_stale(course_id)
+
+
+@receiver(post_save, sender=Course)
+def build_course_thumbnail_derivatives(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_derivatives(instance, 'thumbnail', 'thumbnail_variants', on_update=course_images_ready)
+
+
+# --- Quiz answer key cache (courses/grading.py) ---
+def invalidate_quiz_answer_key(sender, instance, raw=False, **kwargs):
+    if raw or syncing():
+        return
+    if isinstance(instance, Quiz):
+        lesson_id = instance.lesson_id
+    else:
+        lesson_id = Quiz.objects.filter(pk=instance.quiz_id).values_list('lesson_id', flat=True).first()
+    invalidate_answer_key(lesson_id)
+
+
+for _model in (Quiz, Question):
+    post_save.connect(invalidate_quiz_answer_key, sender=_model, dispatch_uid=f'answer_key_save_{_model.__name__}')
+    post_delete.connect(invalidate_quiz_answer_key, sender=_model, dispatch_uid=f'answer_key_delete_{_model.__name__}')
@@ -0,0 +1,117 @@
+"""
+Published course snapshots.
+
+Approval ke waqt player ka poora payload ek dafa render karke CourseSnapshot
+mein save hota hai. CoursePlayerViewSet.retrieve wahi document serve karta hai.
+Curriculum mein koi bhi edit snapshot ko stale mark karta hai aur rebuild
+background worker (core.tasks) mein hota hai.
+"""
+import logging
+
+from django.db.models import F
+from django.utils import timezone
+
+from core.tasks import run_after, run_in_background
+from .curriculum import with_curriculum
+from .models import Course, CourseSnapshot
+from .serializers import CourseSerializer
+
+logger = logging.getLogger(__name__)
+
+REBUILD_ATTEMPTS = 3
+REBUILD_RETRY_DELAY = 60
+
+# Payload ki woh keys jin mein storage (media) URL hota hai
+MEDIA_KEYS = ('thumbnail', 'file', 'resource_file')
+SRCSET_KEYS = ('thumbnail_srcset',)
+
+
+def render_course(course_id):
+    course = with_curriculum(Course.objects.filter(pk=course_id)).first()
+    if course is None:
+        return None
+    return CourseSerializer(course).data
+
+
+def absolute_media_urls(data, request):
+    """
+    Payload ke relative media URLs ko is request ke host par absolute karna. Snapshot
+    request ke baghair render hota hai (relative URLs) aur live tree ke srcset bhi
+    relative hote hain; player dono raston par yahi chala kar ek jaisa shape deta hai.
+    """
+    if isinstance(data, list):
+        return [absolute_media_urls(item, request) for item in data]
+    if not isinstance(data, dict):
+        return data
+    result = {}
+    for key, value in data.items():
+        if key in MEDIA_KEYS and isinstance(value, str) and value.startswith('/'):
+            value = request.build_absolute_uri(value)
+        elif key in SRCSET_KEYS and isinstance(value, dict):
+            value = {fmt: _absolute_srcset(entries, request) for fmt, entries in value.items()}
+        else:
+            value = absolute_media_urls(value, request)
+        result[key] = value
+    return result
+
+
+def _absolute_srcset(entries, request):
+    candidates = []
+    for candidate in entries.split(', '):
+        url, _, width = candidate.rpartition(' ')
+        if url.startswith('/'):
+            url = request.build_absolute_uri(url)
+        candidates.append(f'{url} {width}')
+    return ', '.join(candidates)
+
+
+def publish_snapshot(course):
+    """Approval par snapshot foran (synchronously) banana."""
+    CourseSnapshot.objects.get_or_create(course=course)
+    _store(course.pk, render_course(course.pk))
+    return CourseSnapshot.objects.get(course=course)
+
+
+def rebuild_snapshot(course_id, attempt=1):
+    """
+    Stale snapshot dobara render karna. Flag sirf kamyab store par clear hota hai, aur
+    woh bhi tab jab render ke dauran koi naya edit (edit_seq) na aaya ho; rebuild ke
+    dauran snapshot stale rehta hai, is liye player live tree serve karta hai.
+    """
+    seq = CourseSnapshot.objects.filter(course_id=course_id, is_stale=True).values_list('edit_seq', flat=True).first()
+    if seq is None:
+        return
+    try:
+        payload = render_course(course_id)
+    except Exception:
+        logger.exception('Snapshot for course %s could not be rebuilt (attempt %s)', course_id, attempt)
+        if attempt < REBUILD_ATTEMPTS:
+            run_after(REBUILD_RETRY_DELAY * attempt, rebuild_snapshot, course_id, attempt + 1)
+        return
+    if not _store(course_id, payload, seq):
+        # Render ke dauran naya edit aaya: us ke mutabiq dobara
+        run_in_background(rebuild_snapshot, course_id)
+
+
+def mark_stale(course_id):
+    """Snapshot ko stale karna aur rebuild schedule karna (pehle se stale ho to dobara nahi)."""
+    if course_id is None:
+        return
+    # Chalta hua rebuild is edit se pehle ka render store na kare
+    if not CourseSnapshot.objects.filter(course_id=course_id).update(edit_seq=F('edit_seq') + 1):
+        return  # snapshot nahi (draft course)
+    updated = CourseSnapshot.objects.filter(course_id=course_id, is_stale=False).update(is_stale=True)
+    if updated:
+        run_in_background(rebuild_snapshot, course_id)
+
+
+def _store(course_id, payload, seq=None):
+    """Payload likh kar fresh mark karna; `seq` ho to sirf agar edit_seq ab bhi wahi hai."""
+    if payload is None:
+        return False
+    snapshots = CourseSnapshot.objects.filter(course_id=course_id)
+    if seq is not None:
+        snapshots = snapshots.filter(edit_seq=seq)
+    return bool(snapshots.update(
+        payload=payload, version=F('version') + 1, built_at=timezone.now(), is_stale=False
+    ))
@@ -0,0 +1,124 @@
+"""
+CourseStats maintenance.
+
+Writes par `adjust()` sirf F() increments karta hai (koi COUNT/AVG nahi).
+`recompute()` bulk mein sab kuch dobara ginta hai (repair command / bulk imports).
+
+Course khud delete ho raha ho to cascade mein urrte lessons / reviews / enrollments
+ke receivers us ke counters ko haath nahi lagate (`deleting`): stats row
+bhi saath ja rahi hai, aur beech mein `adjust` use 0 par dobara bana kar manfi kar deta.
+"""
+import threading
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast, Round
+
+from .models import Course, CourseStats, Lesson, Review
+
+COUNTER_FIELDS = [
+    'enrollment_count', 'active_count', 'completed_count', 'review_count',
+    'rating_sum', 'lesson_count', 'total_duration',
+]
+
+# EnrollmentCourse.status -> counter
+STATUS_COUNTERS = {'active': 'active_count', 'completed': 'completed_count'}
+
+
+def average_expression():
+    return Case(
+        When(review_count=0, then=Value(Decimal('0'))),
+        default=Round(Cast('rating_sum', FloatField()) / F('review_count'), 2),
+        output_field=DecimalField(max_digits=4, decimal_places=2),
+    )
+
+
+_deleting = threading.local()
+
+
+def deleting(course_id):
+    return course_id in getattr(_deleting, 'ids', ())
+
+
+def mark_deleting(course_id):
+    if not hasattr(_deleting, 'ids'):
+        _deleting.ids = set()
+    _deleting.ids.add(course_id)
+
+
+def unmark_deleting(course_id):
+    getattr(_deleting, 'ids', set()).discard(course_id)
+
+
+def adjust(course_id, **deltas):
+    """Counters mein deltas jorna; stats row na ho to us course ka poora recompute."""
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not course_id or not deltas or deleting(course_id):
+        return
+    updated = CourseStats.objects.filter(course_id=course_id).update(
+        **{name: F(name) + value for name, value in deltas.items()}
+    )
+    if not updated:
+        recompute([course_id])
+    elif 'review_count' in deltas or 'rating_sum' in deltas:
+        CourseStats.objects.filter(course_id=course_id).update(average_rating=average_expression())
+
+
+def status_deltas(old_status, new_status, sign=1):
+    deltas = {}
+    if old_status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[old_status]] = -sign
+    if new_status in STATUS_COUNTERS:
+        key = STATUS_COUNTERS[new_status]
+        deltas[key] = deltas.get(key, 0) + sign
+    return deltas
+
+
+def recompute(course_ids=None, batch_size=500):
+    """Grouped aggregates (teen queries per batch) se stats dobara likhna."""
+    from enrollments.models import EnrollmentCourse
+
+    ids = course_ids if course_ids is not None else list(
+        Course.objects.order_by('id').values_list('id', flat=True)
+    )
+    total = 0
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        enrollments = {
+            row['course']: row for row in EnrollmentCourse.objects.filter(course__in=batch)
+            .values('course')
+            .annotate(
+                total=Count('id'),
+                active=Count('id', filter=Q(status='active')),
+                completed=Count('id', filter=Q(status='completed')),
+            )
+        }
+        reviews = {
+            row['course']: row for row in Review.objects.filter(course__in=batch)
+            .values('course').annotate(total=Count('id'), rating=Sum('rating'))
+        }
+        lessons = {
+            row['course']: row for row in Lesson.objects.filter(week__module__course__in=batch)
+            .values(course=F('week__module__course')).annotate(total=Count('id'), duration=Sum('duration'))
+        }
+        rows = []
+        for course_id in Course.objects.filter(pk__in=batch).values_list('id', flat=True):
+            e, r, l = enrollments.get(course_id, {}), reviews.get(course_id, {}), lessons.get(course_id, {})
+            review_count, rating_sum = r.get('total', 0), r.get('rating') or 0
+            rows.append(CourseStats(
+                course_id=course_id,
+                enrollment_count=e.get('total', 0),
+                active_count=e.get('active', 0),
+                completed_count=e.get('completed', 0),
+                review_count=review_count,
+                rating_sum=rating_sum,
+                average_rating=round(Decimal(rating_sum) / review_count, 2) if review_count else Decimal('0'),
+                lesson_count=l.get('total', 0),
+                total_duration=l.get('duration') or 0,
+            ))
+        CourseStats.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['course'],
+            update_fields=COUNTER_FIELDS + ['average_rating', 'updated_at'],
+        )
+        total += len(rows)
+    return total
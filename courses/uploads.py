@@ -0,0 +1,204 @@
+"""
+Resumable chunked uploads.
+
+Flow: init (filename + size) -> chunks `Upload-Offset` header ke saath PATCH ->
+commit. Chunks UPLOAD_SESSION_DIR mein ek `.part` file mein jurte hain; connection
+toote to client session GET karke `offset` se aage bhejta hai. Commit par poori
+file background worker (core.tasks) configured storage par save karta hai, web
+worker bari file ke saath blocked nahi rehta.
+
+Adhoori chhori gayi sessions (aur `processing` mein atki) `cleanup_uploads`
+command se saaf / dobara queue hoti hain (`expire_sessions`).
+
+Completed session ki id phir `upload_key` (assets/subtopics) ya lesson ke
+`temp_video_key` / `temp_doc_key` mein bheji jati hai.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.tasks import run_in_background
+
+from .models import UploadSession
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER = 64 * 1024
+
+
+class OffsetMismatch(Exception):
+    """Chunk ka offset session ke offset se match nahi karta (client resume kare)."""
+
+
+def part_path(session):
+    return os.path.join(settings.UPLOAD_SESSION_DIR, f'{session.pk}.part')
+
+
+def append_chunk(session, offset, stream, length):
+    """
+    `stream` se `length` bytes `.part` file mein `offset` par likhna. Jitne bytes
+    aaye (connection beech mein toote to kam) utna hi offset aage barhta hai.
+
+    Client se bytes pehle (baghair lock ke) UPLOAD_SESSION_DIR ki ek temp file mein
+    parhe jate hain; 16 MB ka dheema chunk session row ko lock mein nahi rakhta.
+    Phir sirf offset check aur local temp file ka `.part` mein copy lock ke andar:
+    ek hi offset par do PATCH aayen to doosra pehle ke khatam hone ka intezar karta
+    hai, phir naya offset dekh kar OffsetMismatch (client resume karta hai).
+    """
+    current = UploadSession.objects.filter(pk=session.pk, status='uploading').values_list('offset', flat=True).first()
+    if current is None or offset != current:
+        raise OffsetMismatch()
+    os.makedirs(settings.UPLOAD_SESSION_DIR, exist_ok=True)
+    with tempfile.TemporaryFile(dir=settings.UPLOAD_SESSION_DIR) as chunk:
+        written = 0
+        while written < length:
+            data = stream.read(min(COPY_BUFFER, length - written))
+            if not data:
+                break
+            chunk.write(data)
+            written += len(data)
+        chunk.seek(0)
+
+        with transaction.atomic():
+            locked = UploadSession.objects.select_for_update().filter(
+                pk=session.pk, status='uploading'
+            ).values_list('offset', flat=True).first()
+            if locked is None or offset != locked:
+                raise OffsetMismatch()
+            path = part_path(session)
+            with open(path, 'r+b' if os.path.exists(path) else 'wb') as part:
+                part.seek(offset)
+                shutil.copyfileobj(chunk, part, COPY_BUFFER)
+                part.truncate()
+            UploadSession.objects.filter(pk=session.pk).update(offset=offset + written, updated_at=timezone.now())
+    session.offset = offset + written
+    return written
+
+
+def commit(session):
+    """Saare bytes aa gaye hon to session ko processing mein daal kar storage par bhejna."""
+    updated = UploadSession.objects.filter(
+        pk=session.pk, status='uploading', offset=session.size
+    ).update(status='processing')
+    if updated:
+        session.status = 'processing'
+        run_in_background(store_upload, session.pk)
+    return bool(updated)
+
+
+def store_upload(session_id):
+    """Background: `.part` file ko configured storage par save karna."""
+    session = UploadSession.objects.filter(pk=session_id, status='processing').first()
+    if session is None:
+        return
+    path = part_path(session)
+    try:
+        with open(path, 'rb') as part:
+            session.file.save(session.filename, File(part), save=False)
+        session.status = 'completed'
+    except Exception as exc:
+        logger.exception('Upload %s could not be stored', session_id)
+        session.status, session.error = 'failed', str(exc)
+    session.save(update_fields=['file', 'status', 'error', 'updated_at'])
+    if session.status == 'completed':
+        os.remove(path)
+
+
+def resolve_uploads(owner_id, keys):
+    """
+    Completed sessions ki stored file names, ek query mein: {key: file name}.
+    Koi key ghalat, kisi aur ki, ya abhi complete nahi to ValidationError.
+    """
+    keys = {str(key) for key in keys if key}
+    if not keys:
+        return {}
+    valid = []
+    for key in keys:
+        try:
+            valid.append(uuid.UUID(key))
+        except ValueError:
+            pass
+    sessions = UploadSession.objects.filter(pk__in=valid, owner_id=owner_id, status='completed')
+    found = {str(pk): name for pk, name in sessions.values_list('pk', 'file')}
+    missing = sorted(keys - set(found))
+    if missing:
+        raise ValidationError({'upload_key': [f'Upload "{key}" is not a completed upload.' for key in missing]})
+    return found
+
+
+def attach_lesson_uploads(lessons_data, course, request=None):
+    """
+    Lesson dicts ke `temp_video_key` / `temp_doc_key` ko stored file se badalna
+    (video -> video_url, document -> content_file). Sab lessons ke liye ek query.
+    `video_url` URLField hai, is liye storage ka relative URL (FileSystemStorage)
+    request ke host se absolute banta hai.
+    """
+    pending = [(data, data.pop('temp_video_key', None), data.pop('temp_doc_key', None)) for data in lessons_data]
+    keys = [key for _, video, doc in pending for key in (video, doc) if key]
+    if not keys:
+        return
+    files = resolve_uploads(course.instructor.user_id, keys)
+    for data, video, doc in pending:
+        if video:
+            url = default_storage.url(files[str(video)])
+            data['video_url'] = request.build_absolute_uri(url) if request is not None else url
+        if doc:
+            data['content_file'] = files[str(doc)]
+
+
+class StagedUploadMixin:
+    """
+    Serializer mixin: file field ki jagah completed upload session ki `upload_key`.
+    Serializer `upload_key = serializers.UUIDField(write_only=True, required=False)`
+    declare kare; `upload_target` file field ka naam, `upload_required` create par zaroori.
+    """
+    upload_target = 'file'
+    upload_required = True
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        key = attrs.pop('upload_key', None)
+        if key:
+            request = self.context['request']
+            attrs[self.upload_target] = resolve_uploads(request.user.pk, [key])[str(key)]
+        elif self.upload_required and self.instance is None and not attrs.get(self.upload_target):
+            raise ValidationError({self.upload_target: ['No file was submitted.']})
+        return attrs
+
+
+def expire_sessions(older_than):
+    """
+    `older_than` se pehle aakhri dafa chhui gayi sessions: adhoori (uploading) aur failed
+    ki `.part` file aur row delete; `processing` mein atki (worker mar gaya) dobara
+    store ke liye queue, `.part` na ho to failed. (expired, requeued) return.
+    """
+    expired = 0
+    stale = UploadSession.objects.filter(updated_at__lt=older_than)
+    for session in stale.filter(status__in=['uploading', 'failed']).iterator():
+        try:
+            os.remove(part_path(session))
+        except FileNotFoundError:
+            pass
+        session.delete()
+        expired += 1
+
+    requeued = 0
+    for session in stale.filter(status='processing').iterator():
+        if os.path.exists(part_path(session)):
+            UploadSession.objects.filter(pk=session.pk).update(updated_at=timezone.now())
+            run_in_background(store_upload, session.pk)
+            requeued += 1
+        else:
+            UploadSession.objects.filter(pk=session.pk, status='processing').update(
+                status='failed', error='Upload data was lost before it could be stored.'
+            )
+    return expired, requeued
@@ -6,12 +6,17 @@ from .views import (
     ModuleAssetListCreateView, ModuleAssetDetailView, SubModuleAssetListCreateView,
     LessonAssetListCreateView, TopicListCreateView, TopicDetailView,
     SubTopicListCreateView, SubTopicDetailView
-    , InstructorSubmitCourseView, AdminPendingCoursesView, AdminApproveCourseView, QuizAttemptView
+    , InstructorSubmitCourseView, CourseAnnouncementView, AdminPendingCoursesView, AdminApproveCourseView, QuizAttemptView, QuizAnalyticsView,
+    CourseSearchView, CourseFacetsView,
+    UploadSessionCreateView, UploadSessionDetailView, UploadSessionCommitView
       )
 
 # Router automatic endpoints (GET, POST, etc.) generate karta hai
 router = DefaultRouter()
 
+# Player endpoint: /api/courses/player/<slug>/ (published snapshot serve karta hai)
+router.register(r'player', CoursePlayerViewSet, basename='course-player')
+
 # Catalog endpoint: /api/courses/
 # Detail endpoint: /api/courses/<slug>/
 router.register(r'', CourseViewSet, basename='course')
@@ -23,9 +28,20 @@ urlpatterns = [
     # 2. Instructor Workspace: Sirf apne banaye huye courses dekhne ke liye
     path('my-workspace/', InstructorWorkspaceView.as_view(), name='instructor-workspace'),
     
+    # Catalog search (ranked full-text): /api/courses/search/?q=drone
+    path('search/', CourseSearchView.as_view(), name='course-search'),
+    # Catalog sidebar facet counts: /api/courses/facets/?category=NLP
+    path('facets/', CourseFacetsView.as_view(), name='course-facets'),
+
+    # Resumable uploads: init -> PATCH chunks (Upload-Offset header) -> commit
+    path('uploads/', UploadSessionCreateView.as_view(), name='upload-session-create'),
+    path('uploads/<uuid:pk>/', UploadSessionDetailView.as_view(), name='upload-session-detail'),
+    path('uploads/<uuid:pk>/commit/', UploadSessionCommitView.as_view(), name='upload-session-commit'),
+
     # 3. Lesson Detail: Video ya Quiz content fetch karne ke liye
     path('lessons/<int:pk>/', LessonDetailView.as_view(), name='lesson-detail'),
     path('lesson/<int:lesson_id>/quiz/', QuizAttemptView.as_view(), name='attempt-quiz'),
+    path('lesson/<int:lesson_id>/quiz/analytics/', QuizAnalyticsView.as_view(), name='quiz-analytics'),
     # Assets and content management
     path('modules/<int:module_id>/assets/', ModuleAssetListCreateView.as_view(), name='module-assets-create'),
     path('modules/assets/<int:pk>/', ModuleAssetDetailView.as_view(), name='module-asset-detail'),
@@ -37,6 +53,7 @@ urlpatterns = [
     path('subtopics/<int:pk>/', SubTopicDetailView.as_view(), name='subtopic-detail'),
     # Submission / Approval
     path('my-workspace/submit/<str:slug>/', InstructorSubmitCourseView.as_view(), name='instructor-submit-course'),
+    path('my-workspace/announce/<str:slug>/', CourseAnnouncementView.as_view(), name='course-announcement'),
     path('admin/pending-courses/', AdminPendingCoursesView.as_view(), name='admin-pending-courses'),
     path('admin/courses/<str:slug>/review/', AdminApproveCourseView.as_view(), name='admin-approve-course'),
     # 4. Router logic (Catalog aur Slug-based detail handle karega) - MUST BE LAST
@@ -2,12 +2,27 @@ from rest_framework import viewsets, generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
 from .models import Course, Lesson, CourseInstructor
-from .serializers import CourseSerializer, LessonSerializer
+from .serializers import CourseSerializer, CourseListSerializer, LessonSerializer, WorkspaceCourseSerializer
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .permissions import IsInstructor # Sirf instructors ke liye custom permission
+from .curriculum import lesson_prefetches, with_curriculum
+from .ownership import get_owned_or_404, owned_by
+from .conditional import ConditionalRetrieveMixin
+from .models import UploadSession
+from .uploads import OffsetMismatch, append_chunk, commit
+from .models import CourseSnapshot
+from .snapshots import absolute_media_urls, publish_snapshot
+from .search import search_courses
+from .facets import filter_courses, get_facets
+from django.core.cache import cache
+from django.db.models import DecimalField, Value
+from django.db.models.functions import Coalesce
+from decimal import Decimal
+
+LESSON_CACHE_TIMEOUT = 60 * 60
 
 # 1. PUBLIC CATALOG: Identifying courses via SLUG
-class CourseViewSet(viewsets.ModelViewSet): 
+class CourseViewSet(ConditionalRetrieveMixin, viewsets.ModelViewSet): 
     """
     Ab yeh Create, Update, Delete sab handle karega.
     """
@@ -17,16 +32,54 @@ class CourseViewSet(viewsets.ModelViewSet):
     # FormData handle karne ke liye parsers add karein
     parser_classes = (MultiPartParser, FormParser, JSONParser) 
 
+    # ?sort=popular / ?sort=rating -> denormalized CourseStats columns par order. CourseStats
+    # row na ho (purana course) to 0: Coalesce, taake cursor us course par na toote
+    SORT_ORDERINGS = {
+        'newest': ('-created_at', '-id'),
+        'popular': ('-sort_enrollments', '-id'),
+        'rating': ('-sort_rating', '-id'),
+    }
+    SORT_ANNOTATIONS = {
+        'popular': {'sort_enrollments': Coalesce('stats__enrollment_count', 0)},
+        'rating': {'sort_rating': Coalesce(
+            'stats__average_rating', Value(Decimal('0')), output_field=DecimalField(max_digits=4, decimal_places=2)
+        )},
+    }
+
+    @property
+    def keyset_ordering(self):
+        sort = self.request.query_params.get('sort') if self.request else None
+        return self.SORT_ORDERINGS.get(sort, self.SORT_ORDERINGS['newest'])
+
+    def get_serializer_class(self):
+        # Catalog list par sirf card data, poora tree sirf detail route par
+        if self.action == 'list':
+            return CourseListSerializer
+        return CourseSerializer
+
     def get_queryset(self):
-        qs = Course.objects.all().prefetch_related('modules__weeks__lessons')
-        return qs
+        if self.action == 'list':
+            # Ek hi query: instructor + stats JOIN
+            sort = self.request.query_params.get('sort')
+            qs = (
+                Course.objects.select_related('instructor', 'stats')
+                .annotate(**self.SORT_ANNOTATIONS.get(sort, {}))
+                .order_by(*self.keyset_ordering)
+            )
+            # Sidebar filters: ?category=NLP,Finance&price=free&difficulty=Beginner
+            return filter_courses(qs, self.request.query_params)
+        if self.action in ('update', 'partial_update', 'destroy'):
+            # Edit / delete sirf course ka apna instructor; baqi ko 404 (ownership leak na ho)
+            return with_curriculum(owned_by(Course, self.request.user))
+        # Detail: poora curriculum tree fixed queries mein
+        return with_curriculum(Course.objects.all())
 
     # 2. UPDATE Method Override (Crucial Fix for 500 Error)
     def update(self, request, *args, **kwargs):
         course = self.get_object()
         
-        # Data ki copy banayein taake edit kar sakein
-        data = request.data.copy()
+        # Plain dict banayein (QueryDict mein nested `modules` list parse nahi hoti)
+        data = request.data.dict() if hasattr(request.data, 'dict') else dict(request.data)
 
         # Agar 'modules' string format mein aaya hai (FormData se), toh JSON banao
         if 'modules' in data and isinstance(data['modules'], str):
@@ -39,7 +92,10 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(course, data=data, partial=True)
         if serializer.is_valid():
             self.perform_update(serializer)
-            return Response(serializer.data)
+            response_data = serializer.data
+            if hasattr(serializer, 'curriculum_changes'):
+                response_data = dict(response_data, curriculum_changes=serializer.curriculum_changes)
+            return Response(response_data)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -51,8 +107,10 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from .models import Lesson, Quiz, Question
+from .models import Lesson, Quiz, Question, QuizAttempt
 from .serializers import QuizDetailSerializer, QuizResultSerializer
+from .grading import answer_key, submit_attempt
+from .quiz_analytics import queue_fold, quiz_analytics, schedule_fold
 
 class QuizAttemptView(APIView):
     permission_classes = [IsAuthenticated]
@@ -72,11 +130,10 @@ class QuizAttemptView(APIView):
         return Response(serializer.data)
 
     # 2. Quiz Submit karna & Result Calculation (POST)
+    # Grading cached answer key se (courses/grading.py), Question rows query nahi hoti
     def post(self, request, lesson_id):
-        lesson = get_object_or_404(Lesson, id=lesson_id)
-        try:
-            quiz = lesson.quiz
-        except Quiz.DoesNotExist:
+        key = answer_key(lesson_id)
+        if key is None:
             return Response({"error": "No quiz found"}, status=404)
 
         # User ke answers (Format: { "question_id": "A", "question_id": "B" })
@@ -84,33 +141,43 @@ class QuizAttemptView(APIView):
 
         if not user_answers:
             return Response({"error": "No answers provided"}, status=400)
+        if not isinstance(user_answers, dict):
+            return Response({"error": "answers must be an object of question_id: option"}, status=400)
 
-        total_questions = quiz.questions.count()
-        correct_count = 0
-
-        # Loop through actual questions to check answers
-        for question in quiz.questions.all():
-            # User ne kya select kiya (question ID ko string mein convert karke check karo)
-            selected_option = user_answers.get(str(question.id))
-            
-            # Match karo DB ke correct option se
-            if selected_option and selected_option.upper() == question.correct_option.upper():
-                correct_count += 1
-
-        # Calculate Score
-        score_percentage = (correct_count / total_questions) * 100 if total_questions > 0 else 0
-        is_passed = score_percentage >= quiz.passing_marks
+        attempt = submit_attempt(request.user, key, user_answers)
+        # Per-question analytics counters background mein batches se update hote hain
+        schedule_fold(key)
 
         # Response Data
         return Response({
-            "total_questions": total_questions,
-            "correct_answers": correct_count,
-            "score_percentage": round(score_percentage, 2),
-            "passed": is_passed,
-            "message": "Congratulations! You Passed." if is_passed else "You Failed. Try Again."
+            "attempt_id": attempt.id,
+            "total_questions": attempt.total_questions,
+            "correct_answers": attempt.correct_answers,
+            "score_percentage": attempt.score_percentage,
+            "passed": attempt.passed,
+            "message": "Congratulations! You Passed." if attempt.passed else "You Failed. Try Again."
         }, status=status.HTTP_200_OK)
 
 
+class QuizAnalyticsView(APIView):
+    """Instructor ke liye quiz ke har question ki difficulty / discrimination aur options ka distribution."""
+    permission_classes = [IsInstructor]
+
+    def get(self, request, lesson_id):
+        quiz = get_owned_or_404(Quiz, request.user, lesson_id=lesson_id)
+        # Counters jaise abhi hain; jo attempts abhi nahi jurin un ka fold background mein
+        pending = QuizAttempt.objects.filter(quiz=quiz, counted=False).exists()
+        if pending:
+            queue_fold(quiz.pk)
+        questions = quiz_analytics(quiz)
+        return Response({
+            "quiz_id": quiz.pk,
+            "attempts": max((q['attempts'] for q in questions), default=0),
+            "pending": pending,
+            "questions": questions,
+        })
+
+
 class CourseCreateView(generics.CreateAPIView):
     """
     Endpoint: /api/courses/create/
@@ -134,42 +201,86 @@ class InstructorWorkspaceView(generics.ListAPIView):
     """
     Danish Ali ke apne banaye huye courses ki list
     """
-    serializer_class = CourseSerializer
+    serializer_class = WorkspaceCourseSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         # Filter: Sirf current instructor ke courses dikhana
-        return Course.objects.filter(instructor__user=self.request.user)
+        qs = Course.objects.filter(instructor__user=self.request.user).select_related('stats')
+        return with_curriculum(qs)
 
 # 3. MANAGEMENT: Specific Course Retrieve, Update, Delete
 class CourseDetailManagerView(generics.RetrieveUpdateDestroyAPIView):
     """
     Specific course ko edit ya delete karne ke liye (via SLUG)
     """
-    queryset = Course.objects.all()
     serializer_class = CourseSerializer
     lookup_field = 'slug'
-    permission_classes = [IsInstructor] # Baad mein hum owner check lagayenge
+    permission_classes = [IsInstructor]
+
+    def get_queryset(self):
+        # Owner check: doosre instructor ka course 404
+        return with_curriculum(owned_by(Course, self.request.user))
 
 # 4. CONTENT PLAYER: Lesson Detail
-class LessonDetailView(generics.RetrieveAPIView):
+class LessonDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     Makhsoos Lesson (Day) ka video ya quiz data fetch karna
     """
-    queryset = Lesson.objects.all()
+    conditional_lookup = ('modules__weeks__lessons', 'pk')
+    # Quiz JOIN se, questions / assets / topics / subtopics ek ek prefetch query
+    queryset = Lesson.objects.select_related('quiz').prefetch_related(*lesson_prefetches())
     serializer_class = LessonSerializer
     permission_classes = [IsAuthenticated]
 
-class CoursePlayerViewSet(viewsets.ReadOnlyModelViewSet):
+    def retrieve_content(self, request, *args, **kwargs):
+        # Rendered lesson course ke content version (ETag) ke saath cache hota hai;
+        # curriculum mein koi edit version bump karta hai to purani entry khud bekaar
+        if self.content_etag is None:
+            return super().retrieve_content(request, *args, **kwargs)
+        # File URLs absolute hote hain (request host se), is liye host bhi key mein
+        version = self.content_etag.strip('"')
+        key = f'courses:lesson:{kwargs["pk"]}:{version}:{request.get_host()}'
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            cache.set(key, data, LESSON_CACHE_TIMEOUT)
+        return Response(data)
+
+class CoursePlayerViewSet(ConditionalRetrieveMixin, viewsets.ReadOnlyModelViewSet):
     """
     DragonTech Intelligence Engine:
     Slug ke zariye poora curriculum fetch karna.
     """
-    # prefetch_related use karne se speed barh jati hai
-    queryset = Course.objects.all().prefetch_related('modules__weeks__lessons')
+    # Shared curriculum loader: poora tree (assets, quiz, topics) fixed queries mein
+    queryset = with_curriculum(Course.objects.all())
     serializer_class = CourseSerializer
     lookup_field = 'slug' 
     permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def retrieve_content(self, request, *args, **kwargs):
+        # (304 check ConditionalRetrieveMixin.retrieve pehle hi kar chuka hai)
+        # Published course: approval par bana hua snapshot seedha serve karo,
+        # curriculum tables ko touch kiye baghair
+        snapshot = (
+            CourseSnapshot.objects.filter(
+                course__slug=kwargs.get(self.lookup_field), course__status='published', is_stale=False
+            )
+            .only('payload', 'version')
+            .first()
+        )
+        if snapshot is not None and snapshot.payload:
+            return Response(
+                absolute_media_urls(snapshot.payload, request),
+                headers={'X-Snapshot-Version': str(snapshot.version)},
+            )
+        # Snapshot nahi, rebuild pending hai ya course ab published nahi -> live tree.
+        # Dono raston par media URLs ek jaise (absolute)
+        response = super().retrieve_content(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.data = absolute_media_urls(response.data, request)
+        return response
 import json
 from django.db import transaction
 from rest_framework import views, status, permissions
@@ -179,21 +290,27 @@ from profiles.models import InstructorProfile
 from .models import ModuleAsset, SubModuleAsset, LessonAsset, Topic, SubTopic
 from .serializers import (
     ModuleAssetSerializer, SubModuleAssetSerializer, LessonAssetSerializer,
-    TopicSerializer, SubTopicSerializer
+    TopicSerializer, SubTopicSerializer, UploadSessionSerializer
 )
 from rest_framework.parsers import MultiPartParser, FormParser
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAdminUser
 from django.utils import timezone
+from notifications.outbox import notify_course
 
 class CreateFullCourseView(generics.CreateAPIView):
+    """
+    Poora course tree (modules -> weeks -> lessons) ek transaction mein,
+    har level bulk_create se. Response mein `created_ids` bhi aati hain.
+    """
     serializer_class = CourseSerializer
     permission_classes = [IsInstructor]
-    parser_classes = (MultiPartParser, FormParser) # File upload ke liye zaroori
+    parser_classes = (MultiPartParser, FormParser, JSONParser) # File upload ke liye zaroori
 
     def create(self, request, *args, **kwargs):
-        # 1. Request data copy karein
-        data = request.data.copy()
+        # 1. Request data ko plain dict banayein (QueryDict mein nested list parse nahi hoti)
+        data = request.data.dict() if hasattr(request.data, 'dict') else dict(request.data)
 
         # 2. 'modules' string ko wapis List/JSON mein convert karein
         if 'modules' in data and isinstance(data['modules'], str):
@@ -209,7 +326,9 @@ class CreateFullCourseView(generics.CreateAPIView):
         serializer = self.get_serializer(data=data)
         if serializer.is_valid():
             self.perform_create(serializer)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            response_data = dict(serializer.data)
+            response_data['created_ids'] = serializer.created_ids
+            return Response(response_data, status=status.HTTP_201_CREATED)
         
         # Agar error aaye to detail print karein debug ke liye
         print("Serializer Errors:", serializer.errors) 
@@ -219,14 +338,11 @@ class CreateFullCourseView(generics.CreateAPIView):
 # ----- Asset and Topic APIs -----
 class ModuleAssetListCreateView(views.APIView):
     permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]  # JSON: sirf `upload_key` bhejne ke liye
 
     def post(self, request, module_id=None):
-        module = get_object_or_404(CourseModule, pk=module_id)
-        # ownership check
-        if module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = ModuleAssetSerializer(data=request.data)
+        module = get_owned_or_404(CourseModule, request.user, pk=module_id)
+        serializer = ModuleAssetSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save(module=module)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -238,22 +354,18 @@ class ModuleAssetDetailView(views.APIView):
     parser_classes = [MultiPartParser, FormParser]
 
     def delete(self, request, pk):
-        asset = get_object_or_404(ModuleAsset, pk=pk)
-        if asset.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        asset = get_owned_or_404(ModuleAsset, request.user, pk=pk)
         asset.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class SubModuleAssetListCreateView(views.APIView):
     permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def post(self, request, submodule_id=None):
-        sub = get_object_or_404(CourseSubModule, pk=submodule_id)
-        if sub.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = SubModuleAssetSerializer(data=request.data)
+        sub = get_owned_or_404(CourseSubModule, request.user, pk=submodule_id)
+        serializer = SubModuleAssetSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save(submodule=sub)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -262,13 +374,11 @@ class SubModuleAssetListCreateView(views.APIView):
 
 class LessonAssetListCreateView(views.APIView):
     permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def post(self, request, lesson_id=None):
-        lesson = get_object_or_404(Lesson, pk=lesson_id)
-        if lesson.week.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = LessonAssetSerializer(data=request.data)
+        lesson = get_owned_or_404(Lesson, request.user, pk=lesson_id)
+        serializer = LessonAssetSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save(lesson=lesson)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -279,9 +389,7 @@ class TopicListCreateView(views.APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, lesson_id=None):
-        lesson = get_object_or_404(Lesson, pk=lesson_id)
-        if lesson.week.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        lesson = get_owned_or_404(Lesson, request.user, pk=lesson_id)
         serializer = TopicSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save(lesson=lesson)
@@ -293,9 +401,7 @@ class TopicDetailView(views.APIView):
     permission_classes = [IsAuthenticated]
 
     def patch(self, request, pk):
-        topic = get_object_or_404(Topic, pk=pk)
-        if topic.lesson.week.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        topic = get_owned_or_404(Topic, request.user, pk=pk)
         serializer = TopicSerializer(topic, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -303,22 +409,18 @@ class TopicDetailView(views.APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        topic = get_object_or_404(Topic, pk=pk)
-        if topic.lesson.week.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        topic = get_owned_or_404(Topic, request.user, pk=pk)
         topic.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class SubTopicListCreateView(views.APIView):
     permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def post(self, request, topic_id=None):
-        topic = get_object_or_404(Topic, pk=topic_id)
-        if topic.lesson.week.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = SubTopicSerializer(data=request.data)
+        topic = get_owned_or_404(Topic, request.user, pk=topic_id)
+        serializer = SubTopicSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save(topic=topic)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -327,46 +429,168 @@ class SubTopicListCreateView(views.APIView):
 
 class SubTopicDetailView(views.APIView):
     permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def patch(self, request, pk):
-        st = get_object_or_404(SubTopic, pk=pk)
-        if st.topic.lesson.week.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = SubTopicSerializer(st, data=request.data, partial=True)
+        st = get_owned_or_404(SubTopic, request.user, pk=pk)
+        serializer = SubTopicSerializer(st, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        st = get_object_or_404(SubTopic, pk=pk)
-        if st.topic.lesson.week.module.course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        st = get_owned_or_404(SubTopic, request.user, pk=pk)
         st.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+# ----- Resumable uploads -----
+class UploadSessionCreateView(views.APIView):
+    """Upload session shuru karna: filename + size, chunks phir PATCH se."""
+    permission_classes = [IsInstructor]
+
+    def post(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(owner=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class UploadSessionDetailView(views.APIView):
+    """
+    GET: session ka status / offset (toota upload yahin se resume hota hai).
+    PATCH: raw bytes body, `Upload-Offset` header mein chunk ka offset.
+    """
+    permission_classes = [IsInstructor]
+
+    def get(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, owner=request.user)
+        return Response(UploadSessionSerializer(session).data, headers={'Upload-Offset': str(session.offset)})
+
+    def patch(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, owner=request.user)
+        if session.status != 'uploading':
+            return Response({"error": "Upload is already committed."}, status=status.HTTP_409_CONFLICT)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers.get('Content-Length') or 0)
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset header is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response(
+                {"error": f"Chunk is larger than {settings.UPLOAD_CHUNK_MAX_SIZE} bytes."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        if offset + length > session.size:
+            return Response({"error": "Chunk goes past the declared size."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if length:
+            try:
+                append_chunk(session, offset, request.stream, length)
+            except OffsetMismatch:
+                session.refresh_from_db(fields=['offset'])
+                return Response(
+                    {"error": "Offset mismatch.", "offset": session.offset},
+                    status=status.HTTP_409_CONFLICT, headers={'Upload-Offset': str(session.offset)}
+                )
+        return Response(UploadSessionSerializer(session).data, headers={'Upload-Offset': str(session.offset)})
+
+
+class UploadSessionCommitView(views.APIView):
+    """Saare chunks aa gaye: file background mein storage par jati hai (status 'processing')."""
+    permission_classes = [IsInstructor]
+
+    def post(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, owner=request.user)
+        if not commit(session):
+            session.refresh_from_db()
+            if session.status != 'uploading':
+                return Response(UploadSessionSerializer(session).data)
+            return Response(
+                {"error": "Upload is incomplete.", "offset": session.offset, "size": session.size},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Client GET se status poll kare jab tak 'completed' na ho
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_202_ACCEPTED)
+
+
+# ----- Catalog search -----
+class CourseSearchView(views.APIView):
+    """
+    Endpoint: /api/courses/search/?q=drone&limit=20
+    Full-text index (Postgres tsvector / SQLite FTS5) se ranked course cards
+    """
+    permission_classes = [AllowAny]
+    max_limit = 100
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            limit = 20
+
+        ranked = search_courses(query, limit=limit)
+        ranks = dict(ranked)
+        courses = {
+            c.pk: c for c in Course.objects.filter(pk__in=ranks).select_related('instructor', 'stats')
+        }
+        results = []
+        for pk, rank in ranked:
+            if pk in courses:
+                card = CourseListSerializer(courses[pk]).data
+                card['rank'] = round(rank, 4)
+                results.append(card)
+        return Response({'query': query, 'count': len(results), 'results': results})
+
+
+class CourseFacetsView(views.APIView):
+    """
+    Endpoint: /api/courses/facets/?category=NLP
+    Catalog sidebar ke filters aur har value ka count (cached)
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(get_facets(request.query_params))
+
+
 # ----- Instructor submit / Admin approval endpoints -----
 class InstructorSubmitCourseView(views.APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, slug=None):
-        course = get_object_or_404(Course, slug=slug)
         # only owner can submit
-        if course.instructor.user != request.user:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        course = get_owned_or_404(Course, request.user, slug=slug)
         course.status = 'pending'
         course.approval_notes = request.data.get('notes', '')
         course.save()
         return Response({'message': 'Course submitted for review'}, status=status.HTTP_200_OK)
 
 
+class CourseAnnouncementView(views.APIView):
+    """Instructor ka apne course ke tamam students ke liye announcement (outbox se fan-out)."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, slug=None):
+        course = get_owned_or_404(Course, request.user, slug=slug)
+        title = (request.data.get('title') or '').strip()
+        message = (request.data.get('message') or '').strip()
+        if not title or not message:
+            return Response({'error': 'title and message are required'}, status=status.HTTP_400_BAD_REQUEST)
+        event = notify_course(course.pk, title=title[:255], message=message)
+        return Response({'message': 'Announcement queued', 'event_id': event.pk}, status=status.HTTP_202_ACCEPTED)
+
+
 class AdminPendingCoursesView(views.APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        qs = Course.objects.filter(status='pending').prefetch_related('modules__weeks__lessons')
+        qs = with_curriculum(Course.objects.filter(status='pending'))
         serializer = CourseSerializer(qs, many=True)
         return Response(serializer.data)
 
@@ -384,6 +608,8 @@ class AdminApproveCourseView(views.APIView):
             course.approved_by = request.user
             course.approval_notes = notes
             course.save()
+            # Player payload ek dafa render karke snapshot mein rakh dena
+            publish_snapshot(course)
             return Response({'message': 'Course published'}, status=status.HTTP_200_OK)
         elif action == 'reject':
             course.status = 'rejected'
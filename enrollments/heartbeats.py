@@ -0,0 +1,63 @@
+"""
+Player heartbeats (write-behind).
+
+Player har kuch seconds baad (lesson, video position) bhejta hai. Har heartbeat
+par TrackProgress save karne ke bajaye events process ke buffer mein jama hote
+hain: har enrollment ka sirf aakhri event rehta hai, aur HEARTBEAT_FLUSH_INTERVAL
+ke baad saare pending rows ek `bulk_update` mein likhe jate hain. bulk_update
+signals nahi chalata; certificate jaise side effects sirf asal transition
+(lesson complete) par `set_lesson_completed` se chalte hain.
+
+Buffer process-local hai (har worker apna flush karta hai). Worker band ho to
+aakhri chand seconds ki positions ja sakti hain; completion kabhi buffer nahi hoti.
+"""
+import threading
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.tasks import run_after
+
+from .models import TrackProgress
+
+
+class HeartbeatBuffer:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}  # progress_id -> (lesson_id, position, seen_at)
+        self.timer = None
+        self.flush_scheduled = False
+
+    def record(self, progress_id, lesson_id, position, seen_at=None):
+        with self.lock:
+            self.pending[progress_id] = (lesson_id, position, seen_at or timezone.now())
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        # Pehla pending event: interval ke baad ek flush
+        self.timer = run_after(settings.HEARTBEAT_FLUSH_INTERVAL, self.flush)
+
+    def get(self, progress_id):
+        with self.lock:
+            return self.pending.get(progress_id)
+
+    def flush(self):
+        """Saare pending events ek bulk_update mein likhna; likhe gaye rows ki tadaad return."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.flush_scheduled = False
+            timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+        if not pending:
+            return 0
+        rows = [
+            TrackProgress(pk=progress_id, last_lesson_id=lesson_id, last_position=position, last_accessed=seen_at)
+            for progress_id, (lesson_id, position, seen_at) in pending.items()
+        ]
+        TrackProgress.objects.bulk_update(rows, ['last_lesson', 'last_position', 'last_accessed'], batch_size=500)
+        return len(rows)
+
+
+buffer = HeartbeatBuffer()
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0002_payment_created_at_alter_enrollmentcourse_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollmentcourse',
+            index=models.Index(fields=['student', '-enrolled_at', '-id'], name='enroll_student_date_idx'),
+        ),
+    ]
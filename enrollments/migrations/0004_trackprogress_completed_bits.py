@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0003_enrollmentcourse_enroll_student_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trackprogress',
+            name='completed_bits',
+            field=models.BinaryField(default=bytes),
+        ),
+    ]
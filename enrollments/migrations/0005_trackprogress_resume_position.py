@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0015_lesson_bit_index'),
+        ('enrollments', '0004_trackprogress_completed_bits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trackprogress',
+            name='last_lesson',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='courses.lesson'),
+        ),
+        migrations.AddField(
+            model_name='trackprogress',
+            name='last_position',
+            field=models.PositiveIntegerField(default=0, help_text='Video position in seconds'),
+        ),
+    ]
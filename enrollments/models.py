@@ -2,8 +2,12 @@ from django.db import models
 from profiles.models import StudentProfile
 from courses.models import Course
 from django.utils import timezone
+from core.tracking import TrackedFieldsMixin
+
+class EnrollmentCourse(TrackedFieldsMixin, models.Model):
+    # CourseStats active/completed counters ke liye purana status yaad rakhna
+    tracked_fields = ('status',)
 
-class EnrollmentCourse(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending Payment'),
         ('active', 'Active'),
@@ -19,11 +23,16 @@ class EnrollmentCourse(models.Model):
     class Meta:
         # Aik student aik course mein do baar enroll nahi ho sakta
         unique_together = ('student', 'course')
+        # "My courses" keyset pagination ke liye
+        indexes = [models.Index(fields=['student', '-enrolled_at', '-id'], name='enroll_student_date_idx')]
 
     def __str__(self):
         return f"{self.student.user.username} -> {self.course.title}"
 
-class TrackProgress(models.Model):
+class TrackProgress(TrackedFieldsMixin, models.Model):
+    # update_progress sirf asal tabdeeli par save (post_save receivers) karta hai
+    tracked_fields = ('percentage', 'status', 'completed_bits')
+
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
         ('in_progress', 'In Progress'),
@@ -37,8 +46,13 @@ class TrackProgress(models.Model):
         related_name='progress'
     )
     percentage = models.IntegerField(default=0) # 0 to 100
+    # Completed lessons ka bitset (bit = Lesson.bit_index), little-endian bytes
+    completed_bits = models.BinaryField(default=bytes, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='not_started')
     last_accessed = models.DateTimeField(auto_now=True)
+    # Player heartbeats se (enrollments/heartbeats.py): resume ke liye aakhri lesson aur video position
+    last_lesson = models.ForeignKey('courses.Lesson', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    last_position = models.PositiveIntegerField(default=0, help_text="Video position in seconds")
 
     def __str__(self):
         return f"Progress: {self.enrollment.student.user.username} - {self.percentage}%"
@@ -49,6 +63,11 @@ class TrackProgress(models.Model):
             self.status = 'completed'
         elif self.percentage > 0:
             self.status = 'in_progress'
+        if self.pk and not self.changed_fields():
+            # Kuch nahi badla: sirf last_accessed, bina save / post_save (certificate waghera)
+            self.last_accessed = timezone.now()
+            TrackProgress.objects.filter(pk=self.pk).update(last_accessed=self.last_accessed)
+            return
         self.save()
 
 class Payment(models.Model):
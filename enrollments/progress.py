@@ -0,0 +1,116 @@
+"""
+Per-lesson completion (bitset).
+
+Har lesson ka course ke andar ek stable `bit_index` hai; TrackProgress
+`completed_bits` mein ek bit per lesson rakhta hai. Course ka layout (curriculum
+order mein lessons, unke bits aur modules ke masks) content version ke saath
+cache hota hai, is liye percentage aur module completion sirf bit operations hain,
+aur resume (next) lesson layout par ek in-memory pass: koi per-lesson row ya
+COUNT nahi.
+
+Bits lesson likhte waqt milte hain (courses.curriculum.allocate_lesson_bits:
+create / sync curriculum, akela lesson, dusre course mein move); layout build
+sirf parhta hai, GET progress / heartbeats par koi lock ya write nahi. Bits kabhi
+dobara istemal nahi hote (Course.lesson_bits_allocated), is liye lesson delete ho
+to uska purana bit kisi naye lesson ko complete nahi dikhata. Summary ka
+percentage hamesha bits aur taaza layout se nikalta hai, stored
+`TrackProgress.percentage` se nahi (layout badalne par woh agle completion tak
+purana rehta hai).
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from courses.models import Course, Lesson
+
+from .heartbeats import buffer as heartbeat_buffer
+from .models import TrackProgress
+
+LAYOUT_TIMEOUT = 60 * 60 * 6
+
+
+def to_int(bits):
+    return int.from_bytes(bytes(bits or b''), 'little')
+
+
+def to_bytes(value):
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+
+def build_layout(course_id):
+    """Sirf reads: bits lesson likhte waqt mil chuke hote hain (courses.curriculum.allocate_lesson_bits)."""
+    rows = Lesson.objects.filter(week__module__course_id=course_id, bit_index__isnull=False).order_by(
+        'week__module__order', 'week__module_id', 'week__order', 'week_id', 'order', 'id'
+    ).values_list('id', 'bit_index', 'week__module_id')
+    lessons, modules, mask = [], {}, 0
+    for lesson_id, bit, module_id in rows:
+        lessons.append((lesson_id, bit))
+        mask |= 1 << bit
+        modules.setdefault(module_id, 0)
+        modules[module_id] |= 1 << bit
+    return {
+        'lessons': lessons,
+        'bits': {lesson_id: bit for lesson_id, bit in lessons},
+        'mask': mask,
+        'modules': list(modules.items()),
+    }
+
+
+def course_layout(course_id):
+    """Course ka lesson layout; key mein content version hai, curriculum edit par khud naya banta hai."""
+    version = Course.objects.filter(pk=course_id).values_list('content_version', flat=True).first()
+    key = f'enrollments:layout:{course_id}:{version}'
+    layout = cache.get(key)
+    if layout is None:
+        layout = build_layout(course_id)
+        cache.set(key, layout, LAYOUT_TIMEOUT)
+    return layout
+
+
+def percentage(bits, layout):
+    total = len(layout['lessons'])
+    return (bits & layout['mask']).bit_count() * 100 // total if total else 0
+
+
+def summary(progress, layout):
+    bits = to_int(progress.completed_bits)
+    total = len(layout['lessons'])
+    next_lesson = next((lesson_id for lesson_id, bit in layout['lessons'] if not bits >> bit & 1), None)
+    # Abhi flush na hua heartbeat ho to wahi taaza position hai
+    last_lesson, last_position, _ = heartbeat_buffer.get(progress.pk) or (
+        progress.last_lesson_id, progress.last_position, None
+    )
+    return {
+        'enrollment_id': progress.enrollment_id,
+        'percentage': percentage(bits, layout),
+        'status': progress.status,
+        'completed_lessons': (bits & layout['mask']).bit_count(),
+        'total_lessons': total,
+        'next_lesson': next_lesson,
+        'last_lesson': last_lesson,
+        'last_position': last_position,
+        'modules': [
+            {
+                'module_id': module_id,
+                'completed_lessons': (bits & mask).bit_count(),
+                'total_lessons': mask.bit_count(),
+                'completed': (bits & mask) == mask,
+            }
+            for module_id, mask in layout['modules']
+        ],
+    }
+
+
+def set_lesson_completed(progress_id, layout, lesson_id, completed=True):
+    """
+    Lesson ka bit set / clear karke percentage `update_progress` se likhna (status aur
+    post_save receivers, jaise certificate, pehle ki tarah chalte hain). Row lock ke
+    saath taake do tabs se aane wale updates ek dusre ke bits na mitayein.
+    """
+    bit = layout['bits'][lesson_id]
+    with transaction.atomic():
+        progress = TrackProgress.objects.select_for_update().get(pk=progress_id)
+        bits = to_int(progress.completed_bits)
+        bits = bits | (1 << bit) if completed else bits & ~(1 << bit)
+        progress.completed_bits = to_bytes(bits)
+        progress.update_progress(percentage(bits, layout))
+    return progress
@@ -9,6 +9,17 @@ class TrackProgressSerializer(serializers.ModelSerializer):
         model = TrackProgress
         fields = ['percentage', 'status', 'last_accessed']
 
+class HeartbeatEventSerializer(serializers.Serializer):
+    # Player ka ek heartbeat: kis lesson par, video kahan tak; completed=True lesson khatam
+    enrollment = serializers.IntegerField()
+    lesson = serializers.IntegerField()
+    position = serializers.IntegerField(min_value=0, default=0)
+    completed = serializers.BooleanField(default=False)
+
+class HeartbeatBatchSerializer(serializers.Serializer):
+    # Request body ki shape: {"events": [...]}; list ya kuch aur aaye to 400, 500 nahi
+    events = serializers.ListField(child=HeartbeatEventSerializer(), required=False, default=list)
+
 class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payment
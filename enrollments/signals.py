@@ -1,9 +1,26 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from courses import stats
 from .models import EnrollmentCourse, TrackProgress
 
 @receiver(post_save, sender=EnrollmentCourse)
 def create_progress_record(sender, instance, created, **kwargs):
     if created:
         # Enrollment hote hi progress 0% par set kardo
-        TrackProgress.objects.create(enrollment=instance)
\ No newline at end of file
+        TrackProgress.objects.create(enrollment=instance)
+
+
+# --- CourseStats counters ---
+@receiver(post_save, sender=EnrollmentCourse)
+def count_enrollment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.adjust(instance.course_id, enrollment_count=1, **stats.status_deltas(None, instance.status))
+    elif 'status' in instance.changed_fields():
+        stats.adjust(instance.course_id, **stats.status_deltas(instance.loaded_value('status'), instance.status))
+
+
+@receiver(post_delete, sender=EnrollmentCourse)
+def uncount_enrollment(sender, instance, **kwargs):
+    stats.adjust(instance.course_id, enrollment_count=-1, **stats.status_deltas(instance.status, None))
@@ -1,3 +1,212 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from courses.tests import make_user, build_course
+from courses.models import Lesson
+from .models import EnrollmentCourse, TrackProgress
+
+
+@override_settings(DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage')
+class MyEnrolledCoursesQueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = make_user('instructor')
+        cls.student = make_user('student', role='Student')
+        course = build_course(cls.instructor.instructor_profile, 'First Course', lessons=5)
+        EnrollmentCourse.objects.create(student=cls.student.student_profile, course=course)
+
+    def count_queries(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/enrollments/my-courses/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_flat(self):
+        n = self.count_queries()
+        course = build_course(self.instructor.instructor_profile, 'Big Course', modules=3, weeks=4, lessons=20)
+        EnrollmentCourse.objects.create(student=self.student.student_profile, course=course)
+        self.assertEqual(self.count_queries(), n)
+        self.assertLessEqual(n, 12)
+
+
+class LessonCompletionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = make_user('instructor')
+        cls.student = make_user('student', role='Student')
+        cls.course = build_course(cls.instructor.instructor_profile, 'Bits Course', modules=2, weeks=1, lessons=2)
+        cls.enrollment = EnrollmentCourse.objects.create(student=cls.student.student_profile, course=cls.course)
+        cls.lessons = list(
+            Lesson.objects.filter(week__module__course=cls.course)
+            .order_by('week__module__order', 'order').values_list('id', flat=True)
+        )
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def url(self, lesson_id=None):
+        base = f'/api/enrollments/progress/{self.enrollment.pk}/'
+        return f'{base}lessons/{lesson_id}/' if lesson_id else base
+
+    def test_completion_bits_drive_progress(self):
+        first, second, third, fourth = self.lessons
+        data = self.client.post(self.url(first)).data
+        self.assertEqual((data['percentage'], data['status'], data['next_lesson']), (25, 'in_progress', second))
+
+        data = self.client.post(self.url(second)).data
+        self.assertEqual(data['completed_lessons'], 2)
+        self.assertEqual([m['completed'] for m in data['modules']], [True, False])
+        self.assertEqual(data['next_lesson'], third)
+
+        # Dobara mark karna idempotent hai; undo bit hata deta hai
+        self.assertEqual(self.client.post(self.url(second)).data['percentage'], 50)
+        self.assertEqual(self.client.delete(self.url(first)).data['next_lesson'], first)
+
+        for lesson_id in (first, third, fourth):
+            data = self.client.post(self.url(lesson_id)).data
+        self.assertEqual((data['percentage'], data['status'], data['next_lesson']), (100, 'completed', None))
+        progress = TrackProgress.objects.get(enrollment=self.enrollment)
+        self.assertEqual(bytes(progress.completed_bits), b'\x0f')
+        self.assertEqual(self.client.get(self.url()).data['completed_lessons'], 4)
+
+    def test_deleted_lesson_bit_is_not_reused(self):
+        first, second = self.lessons[:2]
+        self.client.post(self.url(first))
+        self.client.post(self.url(second))
+        Lesson.objects.get(pk=second).delete()
+        new = Lesson.objects.create(
+            week=Lesson.objects.get(pk=first).week, title='New', content_type='Video', order=5
+        )
+        data = self.client.get(self.url()).data
+        self.assertEqual((data['completed_lessons'], data['total_lessons']), (1, 4))
+        self.assertEqual(data['next_lesson'], new.pk)
+
+    def test_lesson_moved_from_other_course_gets_fresh_bit(self):
+        first, second = self.lessons[:2]
+        self.client.post(self.url(first))
+        self.client.post(self.url(second))
+        week = Lesson.objects.get(pk=second).week
+        Lesson.objects.get(pk=second).delete()
+
+        other_course = build_course(self.instructor.instructor_profile, 'Other Course', lessons=2)
+        moved = Lesson.objects.get(week__module__course=other_course, bit_index=1)
+        moved.week = week
+        moved.save()
+
+        data = self.client.get(self.url()).data
+        self.assertEqual((data['completed_lessons'], data['total_lessons']), (1, 4))
+        # Stored percentage (50) layout badalne se pehle ka hai; summary bits se ginta hai
+        self.assertEqual(TrackProgress.objects.get(enrollment=self.enrollment).percentage, 50)
+        self.assertEqual(data['percentage'], 25)
+        self.assertNotEqual(Lesson.objects.get(pk=moved.pk).bit_index, 1)
+
+    def test_bits_assigned_on_write_and_layout_build_is_read_only(self):
+        from courses.models import Course
+        week = Lesson.objects.get(pk=self.lessons[0]).week
+        new = Lesson.objects.create(week=week, title='Extra', content_type='Text', order=9)
+        self.assertEqual(new.bit_index, 4)
+        self.assertEqual(Course.objects.get(pk=self.course.pk).lesson_bits_allocated, 5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(self.url()).data
+        self.assertEqual(data['total_lessons'], 5)
+        writes = [q['sql'] for q in ctx.captured_queries
+                  if q['sql'].startswith(('UPDATE', 'INSERT', 'DELETE')) or 'FOR UPDATE' in q['sql']]
+        self.assertEqual(writes, [])
+
+    def test_other_students_and_foreign_lessons(self):
+        other_course = build_course(self.instructor.instructor_profile, 'Other Course', lessons=1)
+        foreign = Lesson.objects.filter(week__module__course=other_course).first()
+        self.assertEqual(self.client.post(self.url(foreign.pk)).status_code, 404)
+        self.client.force_authenticate(make_user('intruder', role='Student'))
+        self.assertEqual(self.client.post(self.url(self.lessons[0])).status_code, 404)
+        self.assertEqual(self.client.get(self.url()).status_code, 404)
+
+
+@override_settings(HEARTBEAT_FLUSH_INTERVAL=3600)
+class HeartbeatIngestionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = make_user('instructor')
+        cls.course = build_course(cls.instructor.instructor_profile, 'Beat Course', lessons=2)
+        cls.lessons = list(
+            Lesson.objects.filter(week__module__course=cls.course).order_by('order').values_list('id', flat=True)
+        )
+        cls.students = [make_user(f'viewer{i}', role='Student') for i in range(3)]
+        cls.enrollments = [
+            EnrollmentCourse.objects.create(student=s.student_profile, course=cls.course) for s in cls.students
+        ]
+
+    def setUp(self):
+        from django.core.cache import cache
+        from .heartbeats import buffer
+        cache.clear()
+        self.buffer = buffer
+        self.addCleanup(buffer.flush)
+
+    def beat(self, student, *events):
+        client = APIClient()
+        client.force_authenticate(student)
+        return client.post('/api/enrollments/heartbeat/', {'events': list(events)}, format='json')
+
+    def test_heartbeats_are_coalesced_and_flushed_in_bulk(self):
+        first = self.lessons[0]
+        for position in (5, 10, 15):
+            for student, enrollment in zip(self.students, self.enrollments):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.beat(student, {'enrollment': enrollment.pk, 'lesson': first, 'position': position})
+                self.assertEqual(response.status_code, 202)
+                self.assertFalse([q for q in ctx.captured_queries if 'UPDATE "enrollments_trackprogress"' in q['sql']])
+
+        progress = TrackProgress.objects.get(enrollment=self.enrollments[0])
+        self.assertEqual(progress.last_position, 0)  # abhi buffer mein
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        for progress in TrackProgress.objects.filter(enrollment__in=self.enrollments):
+            self.assertEqual((progress.last_lesson_id, progress.last_position, progress.percentage), (first, 15, 0))
+
+    def test_completion_is_written_once_and_foreign_events_rejected(self):
+        from django.db.models.signals import post_save
+
+        saves = []
+        receiver = lambda sender, instance, **kwargs: saves.append(instance.percentage)
+        post_save.connect(receiver, sender=TrackProgress)
+        self.addCleanup(post_save.disconnect, receiver, sender=TrackProgress)
+
+        student, enrollment = self.students[0], self.enrollments[0]
+        event = {'enrollment': enrollment.pk, 'lesson': self.lessons[0], 'position': 300, 'completed': True}
+        response = self.beat(student, event, event, {'enrollment': self.enrollments[1].pk, 'lesson': self.lessons[0]})
+        self.assertEqual((response.data['accepted'], response.data['rejected']), (2, 1))
+        self.assertEqual(saves, [50])  # doosra completed event koi transition nahi
+
+        client = APIClient()
+        client.force_authenticate(student)
+        summary = client.get(f'/api/enrollments/progress/{enrollment.pk}/').data
+        self.assertEqual((summary['last_lesson'], summary['last_position']), (self.lessons[0], 300))
+        self.assertEqual(summary['next_lesson'], self.lessons[1])
+
+        # Purana PATCH bhi same percentage par post_save nahi chalata
+        self.assertEqual(client.patch(f'/api/enrollments/progress/{enrollment.pk}/', {'percentage': 50}).status_code, 200)
+        self.assertEqual(saves, [50])
+
+    def test_invalid_batches(self):
+        student = self.students[0]
+        self.assertEqual(self.beat(student).status_code, 400)
+        self.assertEqual(self.beat(student, {'enrollment': 'x', 'lesson': 1}).status_code, 400)
+        # Galat shape wala body (events ke bajaye list, events object) 400 hai, 500 nahi
+        client = APIClient()
+        client.force_authenticate(student)
+        event = {'enrollment': self.enrollments[0].pk, 'lesson': self.lessons[0]}
+        for body in ([event], {'events': event}, {'events': ['x']}):
+            self.assertEqual(client.post('/api/enrollments/heartbeat/', body, format='json').status_code, 400)
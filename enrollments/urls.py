@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import EnrollInCourseView, MyEnrolledCoursesView, ProcessPaymentView, UpdateProgressView
+from .views import EnrollInCourseView, MyEnrolledCoursesView, ProcessPaymentView, UpdateProgressView, LessonCompletionView, HeartbeatView
 
 urlpatterns = [
     # 1. Nayi enrollment ke liye
@@ -13,4 +13,8 @@ urlpatterns = [
     
     # 4. Progress update (0% to 100%)
     path('progress/<int:enrollment_id>/', UpdateProgressView.as_view(), name='update-progress'),
+    # 5. Lesson-wise completion (POST = done, DELETE = undo)
+    path('progress/<int:enrollment_id>/lessons/<int:lesson_id>/', LessonCompletionView.as_view(), name='lesson-completion'),
+    # 6. Player heartbeats (batched, write-behind)
+    path('heartbeat/', HeartbeatView.as_view(), name='progress-heartbeat'),
 ]
\ No newline at end of file
@@ -2,8 +2,12 @@ from django.utils import timezone
 from rest_framework import views, status, permissions, generics
 from rest_framework.response import Response
 from .models import EnrollmentCourse, TrackProgress, Payment
-from .serializers import EnrollmentSerializer
+from .serializers import EnrollmentSerializer, HeartbeatBatchSerializer
 from courses.models import Course
+from courses.curriculum import with_curriculum
+from .progress import course_layout, set_lesson_completed, summary
+from .heartbeats import buffer as heartbeat_buffer
+from django.conf import settings
 
 # 1. ENROLLMENT: Course mein dakhla lena
 class EnrollInCourseView(views.APIView):
@@ -46,6 +50,15 @@ class EnrollInCourseView(views.APIView):
 class UpdateProgressView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    def get(self, request, enrollment_id):
+        # Lessons ke bitset se: percentage, resume lesson aur module-wise completion
+        progress = TrackProgress.objects.filter(
+            enrollment_id=enrollment_id, enrollment__student__user=request.user
+        ).select_related('enrollment').first()
+        if progress is None:
+            return Response({"error": "Record not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(summary(progress, course_layout(progress.enrollment.course_id)))
+
     def patch(self, request, enrollment_id):
         try:
             # Ensure karna ke student sirf apni progress update kare
@@ -63,6 +76,79 @@ class UpdateProgressView(views.APIView):
         except TrackProgress.DoesNotExist:
             return Response({"error": "Record not found"}, status=status.HTTP_404_NOT_FOUND)
 
+class LessonCompletionView(views.APIView):
+    """Ek lesson complete (POST) ya wapas incomplete (DELETE) mark karna; percentage server khud nikalta hai."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, enrollment_id, lesson_id):
+        return self.mark(request, enrollment_id, lesson_id, completed=True)
+
+    def delete(self, request, enrollment_id, lesson_id):
+        return self.mark(request, enrollment_id, lesson_id, completed=False)
+
+    def mark(self, request, enrollment_id, lesson_id, completed):
+        row = TrackProgress.objects.filter(
+            enrollment_id=enrollment_id, enrollment__student__user=request.user
+        ).values_list('pk', 'enrollment__course_id').first()
+        if row is None:
+            return Response({"error": "Record not found"}, status=status.HTTP_404_NOT_FOUND)
+        progress_id, course_id = row
+        layout = course_layout(course_id)
+        if lesson_id not in layout['bits']:
+            return Response({"error": "Lesson is not part of this course."}, status=status.HTTP_404_NOT_FOUND)
+        progress = set_lesson_completed(progress_id, layout, lesson_id, completed)
+        return Response(summary(progress, layout))
+
+class HeartbeatView(views.APIView):
+    """
+    Player heartbeats ka batch: {"events": [{enrollment, lesson, position, completed}]}.
+    Positions buffer hokar thori dair baad bulk mein likhi jati hain (enrollments/heartbeats.py);
+    sirf naya complete hua lesson foran save hota hai.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = HeartbeatBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        events = serializer.validated_data['events']
+        if not events:
+            return Response({"error": "No events provided"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(events) > settings.HEARTBEAT_MAX_EVENTS:
+            return Response(
+                {"error": f"At most {settings.HEARTBEAT_MAX_EVENTS} events per batch."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Sirf apni enrollments, ek query mein
+        owned = {
+            enrollment_id: (progress_id, course_id)
+            for enrollment_id, progress_id, course_id in TrackProgress.objects.filter(
+                enrollment_id__in={event['enrollment'] for event in events},
+                enrollment__student__user=request.user,
+            ).values_list('enrollment_id', 'pk', 'enrollment__course_id')
+        }
+        layouts, accepted, completed = {}, 0, []
+        for event in events:
+            if event['enrollment'] not in owned:
+                continue
+            progress_id, course_id = owned[event['enrollment']]
+            if course_id not in layouts:
+                layouts[course_id] = course_layout(course_id)
+            layout = layouts[course_id]
+            if event['lesson'] not in layout['bits']:
+                continue
+            heartbeat_buffer.record(progress_id, event['lesson'], event['position'])
+            accepted += 1
+            if event['completed']:
+                progress = set_lesson_completed(progress_id, layout, event['lesson'])
+                completed.append({"enrollment": event['enrollment'], "lesson": event['lesson'],
+                                  "percentage": progress.percentage, "status": progress.status})
+        return Response(
+            {"accepted": accepted, "rejected": len(events) - accepted, "completed": completed},
+            status=status.HTTP_202_ACCEPTED
+        )
+
 # 3. PAYMENT: Paid courses ko activate karna
 class ProcessPaymentView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -102,7 +188,11 @@ class ProcessPaymentView(views.APIView):
 class MyEnrolledCoursesView(generics.ListAPIView):
     serializer_class = EnrollmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ('-enrolled_at', '-id')
 
     def get_queryset(self):
         # Dashboard par Danish ke filter shuda courses
-        return EnrollmentCourse.objects.filter(student=self.request.user.student_profile)
\ No newline at end of file
+        qs = EnrollmentCourse.objects.filter(
+            student=self.request.user.student_profile
+        ).select_related('course', 'progress', 'payment')
+        return with_curriculum(qs, prefix='course__')
\ No newline at end of file
@@ -1,3 +1,15 @@
 from django.contrib import admin
-from .models import Notification
-admin.site.register(Notification)
\ No newline at end of file
+from .models import ArchivedNotification, Notification, NotificationEvent
+admin.site.register(Notification)
+
+
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ('title', 'audience', 'status', 'delivered', 'created_at', 'processed_at')
+    list_filter = ('status', 'audience')
+
+
+@admin.register(ArchivedNotification)
+class ArchivedNotificationAdmin(admin.ModelAdmin):
+    list_display = ('title', 'user', 'notification_type', 'created_at', 'archived_at')
+    list_filter = ('notification_type',)
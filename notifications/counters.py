@@ -0,0 +1,63 @@
+"""
+Unread notification counter (header badge).
+
+Har user ka unread count cache mein rehta hai: pehli read DB se ek indexed COUNT
+(user, is_read, created_at) karti hai aur baad ki reads cache se. Count key ek
+generation ke saath hai; outbox delivery, mark-read, mark-all-read aur retention
+(yaani jab bhi unread rows badlein) rows commit hone ke baad generation barhate
+hain, count ko incr / decr nahi karte. Is tarah COUNT jo pehle hi nayi rows gin
+chuka ho us par dobara incr nahi hota, aur COUNT ke dauran badli rows wali
+ginti purani generation mein jati hai jo phir koi nahi parhta. UNREAD_TIMEOUT
+(30 minute) sirf bekar keys saaf karne ke liye hai, sahi ginti is par nahi tiki.
+"""
+import time
+
+from django.core.cache import cache
+
+from .models import Notification
+
+UNREAD_TIMEOUT = 60 * 30
+
+
+def generation_key(user_id):
+    return f'notifications:unread-gen:{user_id}'
+
+
+def generation(user_id):
+    gen = cache.get(generation_key(user_id))
+    if gen is None:
+        # Key evict ho gayi ho to naya (purani generations se alag) number
+        cache.add(generation_key(user_id), time.time_ns(), None)
+        gen = cache.get(generation_key(user_id))
+    return gen
+
+
+def unread_key(user_id, gen):
+    return f'notifications:unread:{user_id}:{gen}'
+
+
+def unread_count(user_id):
+    key = unread_key(user_id, generation(user_id))
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, UNREAD_TIMEOUT)
+    return count
+
+
+def invalidate(user_id):
+    try:
+        cache.incr(generation_key(user_id))
+    except ValueError:
+        cache.add(generation_key(user_id), time.time_ns(), None)
+
+
+def record_new(user_ids):
+    """Naye (unread) notifications commit ho chuke: in users ki ginti dobara."""
+    for user_id in set(user_ids):
+        invalidate(user_id)
+
+
+def record_read(user_id, count=1):
+    if count:
+        invalidate(user_id)
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from notifications.outbox import retry_stuck
+
+
+class Command(BaseCommand):
+    help = 'Outbox ke atke hue (stale processing / pending) aur failed notification events cursor se dobara deliver karta hai'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=5, help='Claim / heartbeat itne minute purana ho to worker mara hua samjha jaye (default 5)')
+
+    def handle(self, *args, **options):
+        count = retry_stuck(timezone.now() - timedelta(minutes=options['older_than']))
+        self.stdout.write(self.style.SUCCESS(f'Queued {count} notification events'))
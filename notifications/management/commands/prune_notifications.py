@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from notifications.retention import RETENTION_BATCH_SIZE, archive_read, collapse_duplicates
+
+
+class Command(BaseCommand):
+    help = 'Duplicate notifications collapse karta hai aur purani read notifications archive karta hai (cron se chalayein)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS,
+            help='Itne din se purani read notifications archive (default NOTIFICATION_RETENTION_DAYS)',
+        )
+        parser.add_argument('--batch-size', type=int, default=RETENTION_BATCH_SIZE)
+        parser.add_argument('--skip-collapse', action='store_true', help='Duplicates collapse na karein')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if not options['skip_collapse']:
+            groups, deleted = collapse_duplicates(batch_size=batch_size)
+            self.stdout.write(f'Collapsed {groups} duplicate groups ({deleted} notifications removed)')
+        archived = archive_read(timezone.now() - timedelta(days=options['days']), batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} read notifications'))
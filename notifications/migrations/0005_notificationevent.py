@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_notif_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('audience', models.CharField(choices=[('users', 'Specific users'), ('course', 'Students enrolled in a course')], default='users', max_length=20)),
+                ('user_ids', models.JSONField(blank=True, default=list)),
+                ('audience_id', models.PositiveBigIntegerField(blank=True, help_text='Course id for course audience', null=True)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('notification_type', models.CharField(choices=[('Update', 'Update'), ('Enrollment', 'Enrollment'), ('Alert', 'Alert'), ('Course_Creation', 'Course Creation')], default='Update', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('delivered', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='notif_event_status_idx')],
+            },
+        ),
+    ]
@@ -19,4 +19,65 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        # Inbox keyset pagination ke liye
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+            # Unread badge COUNT aur ?is_read= wala inbox
+            models.Index(fields=['user', 'is_read', '-created_at', '-id'], name='notif_user_unread_idx'),
+        ]
+
+class NotificationEvent(models.Model):
+    """
+    Outbox: ek event (title/message + audience) jo worker baad mein Notification rows
+    mein expand karta hai (notifications/outbox.py). Fan-out (e.g. poora course) ke
+    liye request mein sirf yeh ek row likhi jati hai.
+    """
+    AUDIENCE_CHOICES = [
+        ('users', 'Specific users'),
+        ('course', 'Students enrolled in a course'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    audience = models.CharField(max_length=20, choices=AUDIENCE_CHOICES, default='users')
+    user_ids = models.JSONField(default=list, blank=True)
+    audience_id = models.PositiveBigIntegerField(null=True, blank=True, help_text="Course id for course audience")
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    notification_type = models.CharField(max_length=20, choices=Notification.NOTIFICATION_TYPES, default='Update')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    delivered = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Worker ka claim / heartbeat (har batch par) aur aakhri deliver hua user id (resume cursor)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    cursor = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'], name='notif_event_status_idx')]
+
+    def __str__(self):
+        return f"{self.title} -> {self.audience} ({self.status})"
+
+
+class ArchivedNotification(models.Model):
+    """
+    Retention job (notifications/retention.py) purani read notifications yahan le aata
+    hai. Sirf ek index, is liye inbox table chhoti aur uske indexes tez rehte hain.
+    """
+    notification_id = models.PositiveBigIntegerField(help_text="Original Notification id")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications', db_index=False)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    notification_type = models.CharField(max_length=20, choices=Notification.NOTIFICATION_TYPES, default='Update')
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'created_at'], name='notif_archive_user_idx')]
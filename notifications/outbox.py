@@ -0,0 +1,164 @@
+"""
+Notification outbox.
+
+Signals / views `notify()` ya `notify_course()` call karte hain. Woh request ki
+transaction ke andar sirf ek NotificationEvent row likhte hain (trigger rollback
+ho to event bhi gaya), aur commit ke baad worker (core.tasks) event ko
+Notification rows mein `bulk_create` se expand karta hai. Is liye poore course ke
+students ko notify karna bhi request mein ek INSERT hai, per-user loop nahi.
+
+Likhe gaye rows `pubsub` broker par publish hote hain taake connected clients
+(SSE stream) ko poll kiye baghair mil jayein.
+
+Worker crash ho jaye to event `pending` / `processing` reh jata hai;
+`deliver_notifications` command stale claim wale aur failed events dobara
+chalata hai, aur delivery event ke cursor se resume hoti hai.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.tasks import run_in_background
+
+from . import counters
+from .models import Notification, NotificationEvent
+from .pubsub import get_broker
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_BATCH_SIZE = 1000
+
+
+def _user_id(user):
+    return getattr(user, 'pk', user)
+
+
+def enqueue(**fields):
+    event = NotificationEvent.objects.create(**fields)
+    run_in_background(deliver, event.pk)
+    return event
+
+
+def notify(users, title, message, notification_type='Update'):
+    """Ek ya zyada users (objects ya ids) ke liye notification event."""
+    if not isinstance(users, (list, tuple, set)):
+        users = [users]
+    user_ids = sorted({_user_id(user) for user in users if user is not None})
+    if not user_ids:
+        return None
+    return enqueue(
+        audience='users', user_ids=user_ids, title=title, message=message, notification_type=notification_type
+    )
+
+
+def notify_course(course_id, title, message, notification_type='Update'):
+    """Course ke tamam active / completed students ke liye ek event."""
+    return enqueue(
+        audience='course', audience_id=course_id, title=title, message=message, notification_type=notification_type
+    )
+
+
+class ClaimLost(Exception):
+    """Event kisi aur worker ne (stale claim ke baad) le liya."""
+
+
+def recipients(event):
+    """Event ke audience ke user ids, cursor ke baad se, barhte order mein."""
+    if event.audience == 'course':
+        from enrollments.models import EnrollmentCourse
+
+        return EnrollmentCourse.objects.filter(
+            course_id=event.audience_id, status__in=['active', 'completed'], student__user_id__gt=event.cursor
+        ).order_by('student__user_id').values_list('student__user_id', flat=True).iterator(chunk_size=DELIVERY_BATCH_SIZE)
+    return iter(sorted(user_id for user_id in event.user_ids if user_id > event.cursor))
+
+
+def deliver(event_id, batch_size=DELIVERY_BATCH_SIZE):
+    """
+    Worker: pending event claim karke uske Notification rows batches mein likhna.
+    Har batch apni transaction mein rows ke saath event ka cursor aur claimed_at
+    (heartbeat) likhta hai, is liye crash / retry ke baad delivery wahin se chalti
+    hai aur koi user dobara notification nahi pata.
+    """
+    now = timezone.now()
+    claimed = NotificationEvent.objects.filter(pk=event_id, status='pending').update(status='processing', claimed_at=now)
+    if not claimed:
+        return 0
+    event = NotificationEvent.objects.get(pk=event_id)
+    delivered = 0
+    try:
+        batch = []
+        for user_id in recipients(event):
+            batch.append(user_id)
+            if len(batch) >= batch_size:
+                delivered += write_batch(event, batch)
+                batch = []
+        if batch:
+            delivered += write_batch(event, batch)
+        event.status = 'done'
+    except ClaimLost:
+        logger.warning('Notification event %s was reclaimed by another worker', event_id)
+        return delivered
+    except Exception as exc:
+        logger.exception('Notification event %s could not be delivered', event_id)
+        event.status, event.error = 'failed', str(exc)
+    event.processed_at = timezone.now()
+    NotificationEvent.objects.filter(pk=event_id, claimed_at=event.claimed_at).update(
+        status=event.status, error=event.error, processed_at=event.processed_at
+    )
+    return delivered
+
+
+def write_batch(event, user_ids):
+    rows = [
+        Notification(
+            user_id=user_id, title=event.title, message=event.message,
+            notification_type=event.notification_type,
+        )
+        for user_id in user_ids
+    ]
+    heartbeat = timezone.now()
+    with transaction.atomic():
+        Notification.objects.bulk_create(rows)
+        # Claim abhi bhi hamara hai to hi batch commit; warna rollback
+        moved = NotificationEvent.objects.filter(pk=event.pk, claimed_at=event.claimed_at).update(
+            cursor=max(user_ids), delivered=F('delivered') + len(rows), claimed_at=heartbeat
+        )
+        if not moved:
+            raise ClaimLost(event.pk)
+    event.cursor, event.claimed_at = max(user_ids), heartbeat
+    event.delivered += len(rows)
+    counters.record_new(user_ids)
+    publish(rows)
+    return len(rows)
+
+
+def publish(notifications):
+    """Sirf un users ke liye serialize / publish jin ka stream khula hai (fan-out mein zyada tar nahi)."""
+    broker = get_broker()
+    for notification in notifications:
+        if notification.pk is not None and broker.has_subscribers(notification.user_id):
+            broker.publish(notification.user_id, NotificationSerializer(notification).data)
+
+
+def retry_stuck(stale_after):
+    """
+    Jin events ka worker mar gaya (processing, claimed_at / heartbeat `stale_after` se
+    purana), jo pool mein kho gaye (pending) ya failed hue, unhe dobara queue karna.
+    Delivery apne cursor se resume hoti hai.
+    """
+    stuck = NotificationEvent.objects.filter(
+        Q(status='processing', claimed_at__lt=stale_after)
+        | Q(status='pending', created_at__lt=stale_after)
+        | Q(status='failed')
+    )
+    ids = list(stuck.values_list('pk', flat=True))
+    # Dobara wahi filter: beech mein heartbeat dene wala zinda worker reset na ho.
+    # claimed_at saaf, taake purana worker laut aaye to uska agla batch rollback ho.
+    stuck.filter(pk__in=ids).update(status='pending', error='', claimed_at=None)
+    for event_id in ids:
+        run_in_background(deliver, event_id)
+    return len(ids)
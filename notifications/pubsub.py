@@ -0,0 +1,73 @@
+"""
+Notification pub/sub (server push).
+
+Outbox worker naye Notification rows `publish()` karta hai, aur SSE stream
+(notifications/stream.py) user ke liye `subscribe()` karke unhe client tak
+bhejta hai. Default broker in-process hai: sirf usi process ke subscribers tak
+pohanchta hai, jo single ASGI worker (ya dev) ke liye kaafi hai. Kai workers hon
+to `NOTIFICATION_BROKER` setting se Redis jaisa broker lagaya ja sakta hai; usay
+bas `publish`, `subscribe` / `unsubscribe` aur `has_subscribers` dene hain
+(jo broker yeh na jaane woh hamesha True de).
+"""
+import asyncio
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class InProcessBroker:
+    """asyncio queues per subscriber. `publish` kisi bhi thread (worker pool) se safe hai."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}  # user_id -> {(loop, queue)}
+
+    def subscribe(self, user_id):
+        """Current event loop ke liye queue; stream band ho to `unsubscribe` zaroor karein."""
+        subscription = (asyncio.get_running_loop(), asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+        with self.lock:
+            self.subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self.lock:
+            subscriptions = self.subscribers.get(user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[user_id]
+
+    def publish(self, user_id, payload):
+        with self.lock:
+            subscriptions = list(self.subscribers.get(user_id, ()))
+        for loop, queue in subscriptions:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, payload)
+            except RuntimeError:
+                pass  # loop band ho chuka (connection gaya)
+
+    @staticmethod
+    def _deliver(queue, payload):
+        # Slow client ki queue bhar jaye to purana event chhor do; client reconnect par
+        # Last-Event-ID se DB se baqi le leta hai
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+    def has_subscribers(self, user_id):
+        return user_id in self.subscribers
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(getattr(settings, 'NOTIFICATION_BROKER', 'notifications.pubsub.InProcessBroker'))()
+    return _broker
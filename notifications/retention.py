@@ -0,0 +1,95 @@
+"""
+Notification retention.
+
+`prune_notifications` command (cron, e.g. raat ko ek dafa) yeh do kaam karta hai:
+
+* `collapse_duplicates`: ek user ki bilkul ek jaisi notifications (title, message,
+  type) mein se sirf sab se nayi rehti hai. Hatayi gayi rows unread thin to
+  unread counter dobara gina jata hai.
+* `archive_read`: NOTIFICATION_RETENTION_DAYS se purani read notifications
+  ArchivedNotification mein copy karke inbox table se delete.
+
+Dono chhote batches mein kaam karte hain (har batch apni chhoti transaction),
+is liye table par lambe locks nahi lagte aur job beech mein ruk jaye to agli
+dafa wahin se chal parta hai.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from . import counters
+from .models import ArchivedNotification, Notification
+
+RETENTION_BATCH_SIZE = 1000
+RETENTION_USER_WINDOW = 200
+
+
+def collapse_duplicates(batch_size=RETENTION_BATCH_SIZE, users_per_window=RETENTION_USER_WINDOW):
+    """
+    Duplicate groups mein sab se nayi row ke ilawa baqi delete; (groups, deleted rows) return.
+
+    Poori table ka ek GROUP BY nahi: user_id par keyset windows (har window
+    `users_per_window` users), har window ka GROUP BY sirf unhi users ki rows dekhta hai.
+    """
+    groups, deleted, last_user = 0, 0, 0
+    while True:
+        users = list(
+            Notification.objects.filter(user_id__gt=last_user).order_by('user_id')
+            .values_list('user_id', flat=True).distinct()[:users_per_window]
+        )
+        if not users:
+            break
+        window = (
+            Notification.objects.filter(user_id__gt=last_user, user_id__lte=users[-1])
+            .values('user_id', 'title', 'message', 'notification_type')
+            .annotate(keep_id=Max('id'), copies=Count('id'))
+            .filter(copies__gt=1)
+            .order_by()
+        )
+        last_user = users[-1]
+        for group in window:
+            groups += 1
+            deleted += delete_duplicates(group, batch_size)
+    return groups, deleted
+
+
+def delete_duplicates(group, batch_size):
+    keep_id = group.pop('keep_id')
+    del group['copies']
+    duplicates = Notification.objects.filter(id__lt=keep_id, **group).order_by('id')
+    deleted = 0
+    while True:
+        batch = list(duplicates.values_list('id', 'is_read')[:batch_size])
+        if not batch:
+            return deleted
+        Notification.objects.filter(pk__in=[pk for pk, _ in batch]).delete()
+        deleted += len(batch)
+        counters.record_read(group['user_id'], sum(1 for _, is_read in batch if not is_read))
+
+
+def archive_read(older_than=None, batch_size=RETENTION_BATCH_SIZE):
+    """Purani read notifications archive mein; archive hui rows ki tadaad return."""
+    if older_than is None:
+        older_than = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    candidates = Notification.objects.filter(is_read=True, created_at__lt=older_than).order_by('id')
+    archived, last_id = 0, 0
+    while True:
+        # id par keyset: har batch pichhle batch ke baad se scan karta hai
+        rows = list(candidates.filter(id__gt=last_id)[:batch_size])
+        if not rows:
+            break
+        last_id = rows[-1].pk
+        with transaction.atomic():
+            ArchivedNotification.objects.bulk_create([
+                ArchivedNotification(
+                    notification_id=row.pk, user_id=row.user_id, title=row.title, message=row.message,
+                    notification_type=row.notification_type, created_at=row.created_at,
+                )
+                for row in rows
+            ])
+            Notification.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        archived += len(rows)
+    return archived
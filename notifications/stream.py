@@ -0,0 +1,134 @@
+"""
+Notifications ka Server-Sent Events stream.
+
+Client `GET /api/notifications/stream/` khula rakhta hai aur nayi notifications
+`event: notification` ki surat mein aati hain, is liye inbox poll karne ki zaroorat
+nahi. Auth wahi SimpleJWT access token hai (`Authorization: Bearer ...`). Browser
+ka EventSource headers nahi bhej sakta, aur access token query string mein daalna
+usay proxy / server logs mein likhwa deta hai; is liye client pehle
+`POST /api/notifications/stream/ticket/` (Bearer ke saath) se ek chhota-umar,
+ek-dafa chalne wala ticket leta hai aur `?ticket=...` bhejta hai.
+
+Reconnect par browser `Last-Event-ID` bhejta hai; us ke baad ki notifications DB
+se pehle bheji jati hain, phir live events. Django 4.2 stream ke beech client ka
+disconnect nahi pakarta, is liye har connection NOTIFICATION_STREAM_MAX_AGE ke
+baad server khud band karta hai aur EventSource `retry` ke baad reconnect kar leta
+hai; mara hua connection zyada der subscriber nahi rehta. Yeh view async hai aur sirf ASGI par
+chalta hai (core/asgi.py dekhein); WSGI par request
+aaye to 501, kyun ke WSGI worker poora response buffer karke thread rok leta.
+"""
+import asyncio
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .models import Notification
+from .pubsub import get_broker
+from .serializers import NotificationSerializer
+
+REPLAY_LIMIT = 100
+RETRY_MILLISECONDS = 5000
+
+
+def ticket_key(ticket):
+    return f'notifications:stream-ticket:{ticket}'
+
+
+def issue_ticket(user_id):
+    """EventSource ke liye ticket: NOTIFICATION_STREAM_TICKET_TTL seconds, sirf ek connection."""
+    ticket = secrets.token_urlsafe(32)
+    cache.set(ticket_key(ticket), user_id, settings.NOTIFICATION_STREAM_TICKET_TTL)
+    return ticket
+
+
+def redeem_ticket(ticket):
+    user_id = cache.get(ticket_key(ticket))
+    # delete sirf ek caller ke liye True: ticket dobara kaam nahi karta
+    if user_id is None or not cache.delete(ticket_key(ticket)):
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+
+def raw_token(request):
+    header = request.headers.get('Authorization', '')
+    parts = header.split()
+    if len(parts) == 2 and parts[0] in settings.SIMPLE_JWT.get('AUTH_HEADER_TYPES', ('Bearer',)):
+        return parts[1]
+    return None
+
+
+def authenticate(request):
+    token = raw_token(request)
+    if not token:
+        ticket = request.GET.get('ticket')
+        return redeem_ticket(ticket) if ticket else None
+    auth = JWTAuthentication()
+    try:
+        return auth.get_user(auth.get_validated_token(token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def missed_notifications(user_id, last_event_id):
+    rows = Notification.objects.filter(user_id=user_id, id__gt=last_event_id).order_by('id')[:REPLAY_LIMIT]
+    return NotificationSerializer(rows, many=True).data
+
+
+def format_event(payload):
+    return f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def event_stream(user_id, last_event_id):
+    broker = get_broker()
+    subscription = broker.subscribe(user_id)
+    queue = subscription[1]
+    keepalive = getattr(settings, 'NOTIFICATION_STREAM_KEEPALIVE', 15)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + getattr(settings, 'NOTIFICATION_STREAM_MAX_AGE', 300)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        # Subscribe ke baad replay, taake beech mein aayi notification na chhoote
+        if last_event_id is not None:
+            for payload in await sync_to_async(missed_notifications)(user_id, last_event_id):
+                last_event_id = payload['id']
+                yield format_event(payload)
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                payload = await asyncio.wait_for(queue.get(), min(keepalive, remaining))
+            except asyncio.TimeoutError:
+                if deadline > loop.time():
+                    # Proxies idle connection band na karein
+                    yield ': keepalive\n\n'
+                continue
+            if last_event_id is not None and payload['id'] <= last_event_id:
+                continue  # replay mein ja chuki
+            yield format_event(payload)
+    finally:
+        broker.unsubscribe(user_id, subscription)
+
+
+async def notification_stream(request):
+    """Logged-in user ki nayi notifications ka SSE stream"""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Notification stream requires the ASGI server'}, status=501)
+    user = await sync_to_async(authenticate)(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid'}, status=401)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    response = StreamingHttpResponse(event_stream(user.pk, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx buffering band
+    return response
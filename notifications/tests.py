@@ -1,3 +1,319 @@
-from django.test import TestCase
+import asyncio
+import json
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from courses.tests import make_user, build_course
+from enrollments.models import EnrollmentCourse
+from . import counters
+from .models import ArchivedNotification, Notification, NotificationEvent
+from .outbox import deliver, notify, retry_stuck, write_batch
+from .pubsub import get_broker
+from .retention import collapse_duplicates
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class NotificationOutboxTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = make_user('instructor')
+        cls.course = build_course(cls.instructor.instructor_profile, 'Outbox Course', lessons=1)
+        cls.students = [make_user(f'student{i}', role='Student') for i in range(5)]
+        for i, student in enumerate(cls.students):
+            EnrollmentCourse.objects.create(
+                student=student.student_profile, course=cls.course, status='pending' if i == 4 else 'active'
+            )
+
+    def test_event_is_written_in_transaction_and_delivered_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            notify(self.students[0], 'Hi', 'Hello there')
+        event = NotificationEvent.objects.get(title='Hi')
+        self.assertEqual((event.status, event.user_ids), ('pending', [self.students[0].pk]))
+        self.assertFalse(Notification.objects.filter(title='Hi').exists())
+
+        for callback in callbacks:
+            callback()
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.delivered), ('done', 1))
+        self.assertTrue(Notification.objects.filter(user=self.students[0], title='Hi').exists())
+        # Dobara deliver (retry) duplicate nahi banata
+        self.assertEqual(deliver(event.pk), 0)
+
+    def test_failed_and_stale_events_resume_from_cursor(self):
+        from unittest import mock
+        users = [s.pk for s in self.students]
+        with self.captureOnCommitCallbacks(execute=False):
+            event = notify(users, 'Resume', 'msg')
+
+        real_bulk_create = Notification.objects.bulk_create
+        calls = []
+        def crash_on_second_batch(rows, *args, **kwargs):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise RuntimeError('db gone')
+            return real_bulk_create(rows, *args, **kwargs)
+        with mock.patch.object(Notification.objects, 'bulk_create', side_effect=crash_on_second_batch), \
+                self.assertLogs('notifications.outbox', 'ERROR'):
+            deliver(event.pk, batch_size=2)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.delivered, event.cursor), ('failed', 2, sorted(users)[1]))
+
+        # Zinda worker (taza heartbeat) wala event dobara queue nahi hota
+        fresh = NotificationEvent.objects.create(
+            user_ids=users, title='Busy', message='msg', status='processing', claimed_at=timezone.now()
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(retry_stuck(timezone.now() - timedelta(minutes=5)), 1)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.delivered), ('done', 5))
+        self.assertEqual(
+            sorted(Notification.objects.filter(title='Resume').values_list('user_id', flat=True)), sorted(users)
+        )
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, 'processing')
+
+        # Worker mar gaya (purana claim): beech ke cursor se resume, pehle wale users ko dobara nahi
+        NotificationEvent.objects.filter(pk=fresh.pk).update(
+            claimed_at=timezone.now() - timedelta(minutes=10), cursor=sorted(users)[2]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            retry_stuck(timezone.now() - timedelta(minutes=5))
+        self.assertEqual(
+            sorted(Notification.objects.filter(title='Busy').values_list('user_id', flat=True)), sorted(users)[3:]
+        )
+
+    def test_course_announcement_fans_out_with_bulk_insert(self):
+        client = APIClient()
+        client.force_authenticate(self.instructor)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = client.post(
+                '/api/courses/my-workspace/announce/outbox-course/',
+                {'title': 'Live session', 'message': 'Friday 5pm'}, format='json'
+            )
+        self.assertEqual(response.status_code, 202)
+
+        with CaptureQueriesContext(connection) as ctx:
+            for callback in callbacks:
+                callback()
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "notifications_notification"')]
+        self.assertEqual(len(inserts), 1)
+        recipients = set(Notification.objects.filter(title='Live session').values_list('user_id', flat=True))
+        self.assertEqual(recipients, {s.pk for s in self.students[:4]})  # pending enrollment nahi
+
+    def test_announcement_requires_course_owner(self):
+        client = APIClient()
+        client.force_authenticate(make_user('other'))
+        response = client.post(
+            '/api/courses/my-workspace/announce/outbox-course/', {'title': 'x', 'message': 'y'}, format='json'
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(NotificationEvent.objects.filter(audience='course').exists())
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class UnreadCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('reader', role='Student')
+        cls.other = make_user('other', role='Student')
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def unread(self):
+        return self.client.get('/api/notifications/unread-count/').data['unread']
+
+    def send(self, count=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                notify(self.user, f'N{i}', 'msg')
+
+    def test_counter_tracks_inserts_and_reads(self):
+        self.send(3)
+        self.assertEqual(self.unread(), 3)  # pehli dafa DB COUNT
+        with self.assertNumQueries(0):
+            self.assertEqual(self.unread(), 3)
+
+        self.send(2)
+        self.assertEqual(self.unread(), 5)
+        first = Notification.objects.filter(user=self.user).first()
+        self.client.patch(f'/api/notifications/mark-read/{first.pk}/')
+        self.client.patch(f'/api/notifications/mark-read/{first.pk}/')  # dobara: koi farq nahi
+        self.assertEqual(self.unread(), 4)
+        unread = self.client.get('/api/notifications/?is_read=false').data
+        self.assertEqual(len(unread), 4)
+
+        self.client.post('/api/notifications/mark-all-read/')
+        self.assertEqual(self.unread(), 0)
+        self.send()
+        with self.assertNumQueries(1):  # delivery ne generation barhayi: ek COUNT
+            self.assertEqual(self.unread(), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.unread(), 1)
+
+    def test_count_that_already_includes_new_rows_is_not_incremented(self):
+        # Outbox ki bulk_create commit ho chuki, record_new abhi nahi chala; beech mein badge read
+        Notification.objects.bulk_create([Notification(user=self.user, title=f'R{i}', message='m') for i in range(2)])
+        self.assertEqual(self.unread(), 2)
+        counters.record_new([self.user.pk, self.user.pk])
+        self.assertEqual(self.unread(), 2)
+
+    def test_cannot_mark_other_users_notification(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notify(self.other, 'Private', 'msg')
+        notification = Notification.objects.get(user=self.other, title='Private')
+        response = self.client.patch(f'/api/notifications/mark-read/{notification.pk}/')
+        self.assertEqual(response.status_code, 404)
+        notification.refresh_from_db()
+        self.assertFalse(notification.is_read)
+
+
+class NotificationRetentionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('hoarder', role='Student')
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def add(self, title, is_read=False, days_old=0, message='msg'):
+        notification = Notification.objects.create(user=self.user, title=title, message=message, is_read=is_read)
+        if days_old:
+            Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(days=days_old))
+        return notification
+
+    def test_collapse_keeps_newest_copy_and_adjusts_unread_counter(self):
+        for is_read in (False, False, True):
+            self.add('Profile Updated', is_read=is_read)
+        newest = self.add('Profile Updated')
+        self.add('Profile Updated', message='different')
+        self.assertEqual(counters.unread_count(self.user.pk), 4)
+
+        self.assertEqual(collapse_duplicates(batch_size=2), (1, 3))
+        remaining = Notification.objects.filter(user=self.user, title='Profile Updated')
+        self.assertCountEqual(remaining.values_list('message', flat=True), ['msg', 'different'])
+        self.assertTrue(remaining.filter(pk=newest.pk).exists())
+        # Do unread copies gayin; counter naye generation par dobara gin kar sahi
+        self.assertEqual(counters.unread_count(self.user.pk), 2)
+
+    def test_collapse_walks_users_in_bounded_windows(self):
+        others = [make_user(f'hoarder{i}', role='Student') for i in range(3)]
+        for user in [self.user, *others]:
+            for _ in range(2):
+                Notification.objects.create(user=user, title='Dup', message='msg')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(collapse_duplicates(users_per_window=2), (4, 4))
+        grouped = [q['sql'] for q in ctx.captured_queries if 'GROUP BY' in q['sql']]
+        self.assertEqual(len(grouped), 2)
+        self.assertTrue(all('"user_id" <=' in sql for sql in grouped))
+        self.assertEqual(Notification.objects.filter(title='Dup').count(), 4)
+
+    def test_archives_only_old_read_notifications_in_batches(self):
+        old_read = [self.add(f'Old {i}', is_read=True, days_old=120) for i in range(5)]
+        self.add('Old unread', days_old=120)
+        self.add('Recent read', is_read=True, days_old=3)
+
+        out = StringIO()
+        call_command('prune_notifications', '--days=90', '--batch-size=2', stdout=out)
+        self.assertIn('Archived 5 read notifications', out.getvalue())
+        self.assertCountEqual(
+            Notification.objects.filter(user=self.user).values_list('title', flat=True), ['Old unread', 'Recent read']
+        )
+        archived = ArchivedNotification.objects.get(notification_id=old_read[0].pk)
+        self.assertEqual((archived.user_id, archived.title), (self.user.pk, 'Old 0'))
+        self.assertLess(archived.created_at, timezone.now() - timedelta(days=90))
+
+
+class NotificationStreamTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('listener', role='Student')
+        cls.token = str(AccessToken.for_user(cls.user))
+
+    async def open_stream(self, **headers):
+        response = await self.async_client.get(
+            '/api/notifications/stream/', headers={'Authorization': f'Bearer {self.token}', **headers}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        return stream
+
+    async def test_requires_valid_token(self):
+        response = await self.async_client.get('/api/notifications/stream/')
+        self.assertEqual(response.status_code, 401)
+        # Access token query string mein (logs mein likha jata) qubool nahi
+        response = await self.async_client.get(f'/api/notifications/stream/?token={self.token}')
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api/notifications/stream/?ticket=not-a-ticket')
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(NOTIFICATION_STREAM_MAX_AGE=0.1)
+    async def test_ticket_opens_one_stream(self):
+        response = await self.async_client.post(
+            '/api/notifications/stream/ticket/', headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 201)
+        url = f"/api/notifications/stream/?ticket={response.json()['ticket']}"
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue([chunk async for chunk in response.streaming_content])
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+
+    def test_wsgi_request_is_rejected(self):
+        response = self.client.get('/api/notifications/stream/', headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 501)
+
+    @override_settings(NOTIFICATION_STREAM_MAX_AGE=0.5)
+    async def test_new_notifications_are_pushed_to_connected_user(self):
+        stream = await self.open_stream()
+        broker = get_broker()
+        self.assertTrue(broker.has_subscribers(self.user.pk))
+
+        # Outbox worker thread se likhe rows
+        event = await NotificationEvent.objects.acreate(
+            title='Live', message='Pushed', notification_type='Alert', status='processing', claimed_at=timezone.now()
+        )
+        await sync_to_async(write_batch)(event, [self.user.pk])
+        chunk = (await asyncio.wait_for(anext(stream), 5)).decode()
+        notification = await Notification.objects.aget(user=self.user, title='Live')
+        self.assertIn(f'id: {notification.pk}\nevent: notification\n', chunk)
+        self.assertEqual(json.loads(chunk.split('data: ', 1)[1])['message'], 'Pushed')
+
+        # Max age ke baad stream khatam aur subscription saaf
+        self.assertEqual([chunk async for chunk in stream], [])
+        self.assertFalse(broker.has_subscribers(self.user.pk))
+
+    @override_settings(NOTIFICATION_STREAM_MAX_AGE=0.5)
+    async def test_reconnect_replays_missed_notifications(self):
+        first = await Notification.objects.acreate(user=self.user, title='Seen', message='1')
+        missed = await Notification.objects.acreate(user=self.user, title='Missed', message='2')
+        stream = await self.open_stream(**{'Last-Event-ID': str(first.pk)})
+        chunk = (await anext(stream)).decode()
+        self.assertTrue(chunk.startswith(f'id: {missed.pk}\n'))
+
+        # Replay ho chuki notification live publish mein dobara nahi aati
+        broker = get_broker()
+        broker.publish(self.user.pk, {'id': missed.pk, 'title': 'Missed'})
+        broker.publish(self.user.pk, {'id': missed.pk + 1, 'title': 'Newer'})
+        chunk = (await asyncio.wait_for(anext(stream), 5)).decode()
+        self.assertTrue(chunk.startswith(f'id: {missed.pk + 1}\n'))
+        self.assertEqual([chunk async for chunk in stream], [])
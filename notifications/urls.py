@@ -1,8 +1,14 @@
 from django.urls import path
-from .views import NotificationListView, NotificationMarkReadView, NotificationMarkAllReadView
+from .views import (
+    NotificationListView, NotificationMarkReadView, NotificationMarkAllReadView, StreamTicketView, UnreadCountView,
+)
+from .stream import notification_stream
 
 urlpatterns = [
     path('', NotificationListView.as_view(), name='notification-list'),
     path('mark-read/<int:pk>/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
+    path('unread-count/', UnreadCountView.as_view(), name='notification-unread-count'),
+    path('stream/', notification_stream, name='notification-stream'),
+    path('stream/ticket/', StreamTicketView.as_view(), name='notification-stream-ticket'),
     path('mark-all-read/', NotificationMarkAllReadView.as_view(), name='notification-mark-all-read'),
 ]
\ No newline at end of file
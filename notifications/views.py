@@ -1,6 +1,9 @@
+from django.conf import settings
 from rest_framework import generics, permissions
 from .models import Notification
 from .serializers import NotificationSerializer
+from . import counters
+from .stream import issue_ticket
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -9,19 +12,40 @@ class NotificationListView(generics.ListAPIView):
     """User ki apni notifications fetch karne ke liye"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NotificationSerializer
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        qs = Notification.objects.filter(user=self.request.user)
+        # ?is_read=false -> sirf unread (user, is_read, created_at) index se
+        is_read = self.request.query_params.get('is_read')
+        if is_read in ('true', 'false'):
+            qs = qs.filter(is_read=is_read == 'true')
+        return qs
 
 class NotificationMarkReadView(generics.UpdateAPIView):
     """Notification ko read mark karne ke liye"""
     permission_classes = [permissions.IsAuthenticated]
-    queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
 
-    def perform_update(self, serializer):
-        # Jab update ho toh is_read ko True kar dein
-        serializer.save(is_read=True)
+    def get_queryset(self):
+        # Sirf apni notifications
+        return Notification.objects.filter(user=self.request.user)
+
+    def update(self, request, *args, **kwargs):
+        notification = self.get_object()
+        # Sirf unread -> read transition par counter invalidate (do tabs se double click)
+        flipped = Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True)
+        counters.record_read(request.user.pk, flipped)
+        notification.is_read = True
+        return Response(self.get_serializer(notification).data)
+
+
+class UnreadCountView(APIView):
+    """Header badge: unread notifications ki tadaad (cached counter)"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response({'unread': counters.unread_count(request.user.pk)})
 
 
 class NotificationMarkAllReadView(APIView):
@@ -31,4 +55,16 @@ class NotificationMarkAllReadView(APIView):
     def post(self, request):
         qs = Notification.objects.filter(user=request.user, is_read=False)
         updated = qs.update(is_read=True)
-        return Response({'marked': updated}, status=status.HTTP_200_OK)
\ No newline at end of file
+        # Reset (0) nahi, invalidate: beech mein aayi nayi notification agli ginti mein rehti hai
+        counters.record_read(request.user.pk, updated)
+        return Response({'marked': updated}, status=status.HTTP_200_OK)
+
+class StreamTicketView(APIView):
+    """EventSource ke liye chhota-umar stream ticket (notifications/stream.py)"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return Response({
+            'ticket': issue_ticket(request.user.pk),
+            'expires_in': settings.NOTIFICATION_STREAM_TICKET_TTL,
+        }, status=status.HTTP_201_CREATED)
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 
+from core.tracking import TrackedFieldsMixin
+
 
 class StudentAddress(models.Model):
     profile = models.OneToOneField('StudentProfile', on_delete=models.CASCADE, related_name='address')
@@ -35,12 +37,19 @@ class StudentSocial(models.Model):
     twitter = models.URLField(max_length=500, blank=True)
 
 # --- MAIN STUDENT PROFILE (The Hub) ---
-class StudentProfile(models.Model):
+class StudentProfile(TrackedFieldsMixin, models.Model):
+    # User save par cascaded save / "Profile Updated" sirf inke badalne par (profiles/signals.py)
+    tracked_fields = (
+        'first_name', 'last_name', 'bio', 'profile_picture', 'phone_number', 'experience', 'public_profile',
+    )
+    managed_fields = ('profile_picture_variants',)
+
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='student_profile')
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
     bio = models.TextField(blank=True) # e.g. "Interested in Military Technology & AI"
     profile_picture = models.ImageField(upload_to='student_photos/', null=True, blank=True)
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)  # core/images.py
     phone_number = models.CharField(max_length=30, blank=True)
     experience = models.TextField(blank=True)
     public_profile = models.BooleanField(default=False, help_text='If true, profile is publicly viewable by username')
@@ -48,7 +57,14 @@ class StudentProfile(models.Model):
     def __str__(self):
         return f"Profile: {self.user.email}"
 
-class InstructorProfile(models.Model):
+class InstructorProfile(TrackedFieldsMixin, models.Model):
+    # Rating (reviews se) aur picture variants system fields hain, notification ke layak nahi
+    tracked_fields = (
+        'full_name', 'expertise', 'experience_years', 'bio', 'profile_picture', 'phone_number', 'linkedin',
+        'website', 'skills', 'public_profile', 'bank_name', 'bank_account_number', 'bank_iban', 'bank_swift',
+    )
+    managed_fields = ('profile_picture_variants',)
+
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='instructor_profile')
     full_name = models.CharField(max_length=200, blank=True)
     expertise = models.CharField(max_length=100, blank=True)
@@ -57,6 +73,7 @@ class InstructorProfile(models.Model):
     rating = models.DecimalField(max_digits=3, decimal_places=1, default=0.0)
     # Extra fields added for public profiles and contact
     profile_picture = models.ImageField(upload_to='instructor_photos/', null=True, blank=True)
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)  # core/images.py
     phone_number = models.CharField(max_length=30, blank=True)
     linkedin = models.URLField(max_length=500, blank=True)
     website = models.URLField(max_length=500, blank=True)
@@ -117,7 +134,9 @@ class InstructorAddress(models.Model):
     country = models.CharField(max_length=100, default='')
     zip_code = models.CharField(max_length=20, blank=True)
 
-class CompanyProfile(models.Model):
+class CompanyProfile(TrackedFieldsMixin, models.Model):
+    tracked_fields = ('company_name', 'industry', 'website_url', 'location', 'description')
+
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='company_profile')
     company_name = models.CharField(max_length=200, blank=True)
     industry = models.CharField(max_length=100, blank=True)
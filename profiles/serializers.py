@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.images import srcset
 from .models import (
     StudentProfile,
     InstructorProfile,
@@ -39,6 +40,7 @@ class StudentProfileSerializer(serializers.ModelSerializer):
     socials = StudentSocialSerializer(read_only=True)
     email = serializers.EmailField(source='user.email', read_only=True)
     username = serializers.ReadOnlyField(source='user.username')
+    profile_picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = StudentProfile
@@ -52,11 +54,15 @@ class StudentProfileSerializer(serializers.ModelSerializer):
             'experience',
             'public_profile',
             'profile_picture',
+            'profile_picture_srcset',
             'address',
             'education_history',
             'socials',
         ]
 
+    def get_profile_picture_srcset(self, obj):
+        return srcset(obj.profile_picture_variants)
+
 
 class InstructorProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source='user.email', read_only=True)
@@ -67,6 +73,7 @@ class InstructorProfileSerializer(serializers.ModelSerializer):
     certificates = serializers.SerializerMethodField()
     socials = serializers.SerializerMethodField()
     address = serializers.SerializerMethodField()
+    profile_picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = InstructorProfile
@@ -77,6 +84,7 @@ class InstructorProfileSerializer(serializers.ModelSerializer):
             'bio',
             'rating',
             'profile_picture',
+            'profile_picture_srcset',
             'phone_number',
             'linkedin',
             'website',
@@ -161,6 +169,9 @@ class InstructorProfileSerializer(serializers.ModelSerializer):
         except Exception:
             return {}
 
+    def get_profile_picture_srcset(self, obj):
+        return srcset(obj.profile_picture_variants)
+
 
 class CompanyProfileSerializer(serializers.ModelSerializer):
     class Meta:
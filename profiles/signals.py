@@ -2,7 +2,8 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .models import StudentProfile, InstructorProfile, CompanyProfile
-from notifications.models import Notification
+from notifications.outbox import notify
+from core.images import schedule_derivatives
 
 User = get_user_model()
 
@@ -16,26 +17,35 @@ def create_user_profile(sender, instance, created, **kwargs):
         elif instance.role == 'Company':
             CompanyProfile.objects.create(user=instance)
 
+PROFILE_ACCESSORS = {
+    'Student': 'student_profile',
+    'Instructor': 'instructor_profile',
+    'Company': 'company_profile',
+}
+
+
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    if instance.role == 'Student' and hasattr(instance, 'student_profile'):
-        instance.student_profile.save()
-    elif instance.role == 'Instructor' and hasattr(instance, 'instructor_profile'):
-        instance.instructor_profile.save()
-    elif instance.role == 'Company' and hasattr(instance, 'company_profile'):
-        instance.company_profile.save()
+    # Profile sirf tab save jab woh user object par load ho aur us ki fields asal mein badli hon;
+    # login (last_login) / OTP verify jaise User saves ab profile ki SELECT + UPDATE nahi karte
+    accessor = PROFILE_ACCESSORS.get(instance.role)
+    if accessor is None or not getattr(sender, accessor).related.is_cached(instance):
+        return
+    profile = getattr(instance, accessor, None)
+    if profile is not None and profile.changed_fields():
+        profile.save()
 
 
 @receiver(post_save, sender=StudentProfile)
 def notify_profile_updated(sender, instance, created, **kwargs):
-    # Don't notify on initial creation
-    if created:
+    # Don't notify on initial creation, ya jab koi dikhne wali field nahi badli
+    if created or not instance.changed_fields():
         return
 
     # Create a user-facing notification about profile update
     try:
-        Notification.objects.create(
-            user=instance.user,
+        notify(
+            instance.user_id,
             title="Profile Updated",
             message="Your profile was updated successfully.",
             notification_type="Update"
@@ -47,15 +57,24 @@ def notify_profile_updated(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=InstructorProfile)
 def notify_instructor_profile_updated(sender, instance, created, **kwargs):
-    if created:
+    if created or not instance.changed_fields():
         return
 
     try:
-        Notification.objects.create(
-            user=instance.user,
+        notify(
+            instance.user_id,
             title="Profile Updated",
             message="Your instructor profile was updated successfully.",
             notification_type="Update"
         )
     except Exception:
-        pass
\ No newline at end of file
+        pass
+
+
+# Profile picture ke resized WebP/JPEG copies (core/images.py)
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_save, sender=InstructorProfile)
+def build_profile_picture_derivatives(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_derivatives(instance, 'profile_picture', 'profile_picture_variants')
@@ -1,3 +1,65 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from courses.tests import make_user
+from notifications.models import NotificationEvent
+from users.models import OneTimePassword
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class ProfileChangeTrackingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = make_user('tracked', role='Student')
+        cls.instructor = make_user('tracked_instructor')
+
+    def profile_events(self, user):
+        return NotificationEvent.objects.filter(user_ids=[user.pk], title='Profile Updated').count()
+
+    def writes(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))]
+
+    def test_login_does_not_write_user_or_profile(self):
+        for user in (self.student, self.instructor):
+            with CaptureQueriesContext(connection) as ctx:
+                response = APIClient().post(
+                    '/api/auth/login/', {'email': user.email, 'password': 'testpassword'}, format='json'
+                )
+            self.assertEqual(response.status_code, 200)
+            writes = self.writes(ctx.captured_queries)
+            self.assertFalse([sql for sql in writes if 'users_user' in sql or 'profiles_' in sql], writes)
+            self.assertEqual(self.profile_events(user), 0)
+
+    def test_otp_verification_does_not_touch_loaded_profile(self):
+        user = type(self.student).objects.select_related('student_profile').get(pk=self.student.pk)
+        user.is_verified = False
+        user.save()
+        OneTimePassword.objects.create(user=user, otp_code='123456')
+        with CaptureQueriesContext(connection) as ctx:
+            response = APIClient().post(
+                '/api/auth/verify-otp/', {'email': user.email, 'otp_code': '123456'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([sql for sql in self.writes(ctx.captured_queries) if 'profiles_' in sql])
+        self.assertEqual(self.profile_events(user), 0)
+
+    def test_profile_notification_only_on_real_change(self):
+        client = APIClient()
+        client.force_authenticate(self.instructor)
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.patch('/api/profiles/me/', {'full_name': 'Dr. Tracked'}, format='json')
+            self.assertEqual(response.status_code, 200)
+        # Dusri PATCH mein value wahi thi: sirf ek notification
+        self.assertEqual(self.profile_events(self.instructor), 1)
+
+        # Profile user object par load ho aur badla ho to user save usay bhi save karta hai
+        user = type(self.instructor).objects.select_related('instructor_profile').get(pk=self.instructor.pk)
+        user.instructor_profile.expertise = 'Robotics'
+        user.save()
+        user.instructor_profile.refresh_from_db()
+        self.assertEqual(user.instructor_profile.expertise, 'Robotics')
+        self.assertEqual(self.profile_events(self.instructor), 2)
@@ -6,6 +6,7 @@ from .serializers import StudentProfileSerializer, InstructorProfileSerializer,
 from .models import StudentProfile, InstructorProfile, CompanyProfile
 from django.db import transaction
 from django.http import Http404
+from core.pagination import KeysetPagination
 from .models import InstructorProfile
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
@@ -92,10 +93,17 @@ class PublicStudentProfileView(APIView):
             return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
 class StudentListView(APIView):
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('id',)
 
     def get(self, request):
         # StudentProfile model se saara data uthayen
         students = StudentProfile.objects.all()
+        # Opt-in keyset pagination (?page_size= / ?cursor=)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(students, request, view=self)
+        if page is not None:
+            serializer = StudentProfileSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
         # StudentProfileSerializer use karein
         serializer = StudentProfileSerializer(students, many=True)
         return Response(serializer.data)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0002_alter_trainingprogram_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trainingprogram',
+            index=models.Index(fields=['-created_at', '-id'], name='training_created_id_idx'),
+        ),
+    ]
@@ -41,6 +41,7 @@ class TrainingProgram(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['-created_at', '-id'], name='training_created_id_idx')]
 
     def __str__(self):
         return f"{self.program_name} - {self.get_live_status_display()}"
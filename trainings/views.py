@@ -7,6 +7,8 @@ from .serializers import TrainingProgramSerializer, EnrollmentTrainingSerializer
 class TrainingProgramListCreateView(generics.ListCreateAPIView):
     queryset = TrainingProgram.objects.all()
     serializer_class = TrainingProgramSerializer
+    # scheduled_date nullable hai, is liye paginated clients ko (created_at, id) order milta hai
+    keyset_ordering = ('-created_at', '-id')
     
     def get_permissions(self):
         """Allow anyone to list, but only authenticated users can create"""